@@ -0,0 +1,10 @@
+"""Offline benchmarks of pycaching loading and parsing code.
+
+Benchmarks replay HTTP traffic recorded in test cassettes, so no network connection nor
+geocaching.com account is needed. Run them from the repository root::
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json  # compare against previous results
+
+See :code:`python -m benchmarks --help` for all options.
+"""
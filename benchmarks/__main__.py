@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""Run offline pycaching benchmarks and optionally compare them with a baseline."""
+
+import argparse
+import sys
+
+from benchmarks.runner import compare, get_benchmarks, load_results, run_benchmarks, save_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("patterns", nargs="*", help="run only benchmarks matching shell-style patterns")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="measured runs of each benchmark")
+    parser.add_argument("-w", "--warmup", type=int, default=2, help="runs before measuring")
+    parser.add_argument("-o", "--output", help="save results as JSON to this file")
+    parser.add_argument("-b", "--baseline", help="compare with results saved in this file")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1, help="relative change considered significant")
+    parser.add_argument(
+        "-m", "--metric", choices=("min", "median", "mean", "p95"), default="median", help="statistic to compare"
+    )
+    parser.add_argument("-l", "--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    benchmarks = get_benchmarks(args.patterns)
+    if args.list:
+        for bench in benchmarks:
+            print("{:40} {}".format(bench.name, bench.description))
+        return 0
+
+    def progress(name, stats):
+        throughput = "{:10.1f} items/s".format(stats["items_per_sec"]) if stats["items_per_sec"] else ""
+        print(
+            "{:40} {:10.3f} ms {:10.1f} runs/s {}".format(
+                name, stats["median"] * 1e3, stats["runs_per_sec"], throughput
+            )
+        )
+
+    results = run_benchmarks(benchmarks, repeat=args.repeat, warmup=args.warmup, progress=progress)
+    if args.output:
+        save_results(results, args.output)
+
+    if not args.baseline:
+        return 0
+
+    print()
+    regressions = 0
+    for c in compare(results, load_results(args.baseline), threshold=args.threshold, metric=args.metric):
+        ratio = "{:.2f}x".format(c.ratio) if c.ratio else "-"
+        print("{:40} {:>8} {}".format(c.name, ratio, c.status))
+        regressions += c.status == "regression"
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
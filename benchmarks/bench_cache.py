@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+from benchmarks.replay import replay_geocaching
+from benchmarks.runner import benchmark
+from pycaching import Cache
+
+
+@benchmark("cache.load")
+def cache_load():
+    """Load and parse a cache details page (including redirect)."""
+    geocaching = replay_geocaching("cache_explicit_load")
+
+    def run():
+        Cache(geocaching, "GC4808G").load()
+
+    return run
+
+
+@benchmark("cache.load_by_guid")
+def cache_load_by_guid():
+    """Load and parse a cache print page."""
+    geocaching = replay_geocaching("cache_guidload_normal")
+
+    def run():
+        Cache(geocaching, "GC2WXPN", guid="5f45114d-1d79-4fdb-93ae-8f49f1d27188").load_by_guid()
+
+    return run
+
+
+@benchmark("cache.load_quick")
+def cache_load_quick():
+    """Load cache details from the tile server JSON."""
+    geocaching = replay_geocaching("cache_quick_normal")
+
+    def run():
+        Cache(geocaching, "GC4808G").load_quick()
+
+    return run
+
+
+@benchmark("cache.load_logbook")
+def cache_load_logbook():
+    """Load two pages of logbook JSON and create logs."""
+    geocaching = replay_geocaching("cache_setup", "cache_logbook")
+    cache = Cache(geocaching, "GC1PAR2")
+    cache.load()  # get logbook token
+
+    def run():
+        return sum(1 for _ in cache.load_logbook(limit=200))
+
+    return run
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+from benchmarks.replay import replay_geocaching
+from benchmarks.runner import benchmark
+from pycaching.geo import Point, Tile, parse_coordinates
+
+# formats accepted by Point.from_string, see also test_geo.TestPoint.test_from_string
+coordinates = [
+    "N 49 45.123 E 013 22.123",
+    "S 49 45.123 W 013 22.123",
+    "s 49 45.123 w 013 22.123",
+    "N49 45.123 E013 22.123",
+    "49N 45.123 013E 22.123",
+    "49S 45.123 013W 22.123",
+    "N 49 45,123 E 013 22,123",
+    "N 49° 45.123 E 013° 22.123",
+    "N 49 45.123, E 013 22.123",
+    "N 44° 25.845 , W 72° 02.485",
+] * 10
+
+
+@benchmark("tile.load")
+def tile_load():
+    """Download a UTFGrid tile and decode it into blocks."""
+    # replay only the successful UTFGrid responses, so every run takes the same path
+    geocaching = replay_geocaching("geo_point_utfgrid", predicate=lambda i: i["response"]["status"]["code"] != 204)
+
+    def run():
+        tile = Tile(geocaching, 8800, 5574, 14)
+        tile.load()
+        return len(tile.blocks)
+
+    return run
+
+
+@benchmark("point.from_string")
+def point_from_string():
+    """Parse coordinates in degrees minutes format."""
+
+    def run():
+        for string in coordinates:
+            Point.from_string(string)
+        return len(coordinates)
+
+    return run
+
+
+@benchmark("coordinates.parse")
+def coordinates_parse():
+    """Parse coordinates in degrees minutes format in a batch, without creating points."""
+
+    def run():
+        parse_coordinates(coordinates)
+        return len(coordinates)
+
+    return run
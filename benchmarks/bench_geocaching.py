@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+from benchmarks.replay import replay_geocaching
+from benchmarks.runner import benchmark
+from pycaching import Point
+
+
+@benchmark("geocaching.advanced_search")
+def advanced_search():
+    """Search caches and create them from API records (single page of 200)."""
+    geocaching = replay_geocaching("advanced_search_caches_owned_by_hq")
+
+    def run():
+        return sum(1 for _ in geocaching.advanced_search({"hb": "Geocaching HQ"}))
+
+    return run
+
+
+@benchmark("geocaching.advanced_search.paging")
+def advanced_search_paging():
+    """Search caches using two pages of 50 results."""
+    geocaching = replay_geocaching("geocaching_search_pagination")
+    point = Point(49.733867, 13.397091)
+
+    def run():
+        return sum(1 for _ in geocaching.search(point, 100, per_query=50))
+
+    return run
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+from benchmarks.replay import replay_geocaching
+from benchmarks.runner import benchmark
+from pycaching import Trackable
+
+
+@benchmark("trackable.load")
+def trackable_load():
+    """Load and parse a trackable details page."""
+    geocaching = replay_geocaching("trackable_load_tid")
+
+    def run():
+        Trackable(geocaching, "TB1KEZ9").load()
+
+    return run
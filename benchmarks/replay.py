@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+from betamax.util import deserialize_response
+
+from pycaching import Geocaching
+
+cassette_dir = Path(__file__).resolve().parent.parent / "test" / "cassettes"
+
+
+def load_interactions(*cassettes, predicate=None):
+    """Return recorded HTTP interactions from given cassettes.
+
+    :param cassettes: Cassette names (file names without extension).
+    :param callable predicate: Optional filter receiving a serialized interaction.
+    """
+    interactions = []
+    for name in cassettes:
+        with open(str(cassette_dir / "{}.json".format(name)), encoding="utf-8") as f:
+            interactions.extend(json.load(f)["http_interactions"])
+    return [i for i in interactions if predicate is None or predicate(i)]
+
+
+class ReplayAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter serving recorded responses instead of making network requests.
+
+    Responses are matched by HTTP method and full URL. If more responses are recorded for the same
+    request, they are served in the recorded order and then again from the beginning, so a benchmark
+    can repeat the same loading many times.
+    """
+
+    def __init__(self, interactions):
+        super().__init__()
+        self._responses = defaultdict(list)  # format: { (method, url): [<serialized response>, ...] }
+        for interaction in interactions:
+            request = interaction["request"]
+            self._responses[request["method"], request["uri"]].append(interaction["response"])
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = request.method, request.url
+        responses = self._responses.get(key)
+        if not responses:
+            raise requests.exceptions.ConnectionError("No recorded response for {} {}".format(*key), request=request)
+
+        with self._lock:
+            position = self._positions[key]
+            self._positions[key] = (position + 1) % len(responses)
+
+        response = deserialize_response(responses[position])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def replay_geocaching(*cassettes, predicate=None):
+    """Return a logged in :class:`.Geocaching` object replaying given cassettes.
+
+    :param cassettes: Cassette names (file names without extension).
+    :param callable predicate: Optional filter of replayed interactions, see :func:`load_interactions`.
+    """
+    adapter = ReplayAdapter(load_interactions(*cassettes, predicate=predicate))
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    geocaching = Geocaching(session=session)
+    geocaching._logged_in = True  # cassettes are recorded with a logged in session
+    geocaching._logged_username = "USERNAMEPLACEHOLDER"
+    return geocaching
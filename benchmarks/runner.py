@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+
+Benchmark = namedtuple("Benchmark", "name setup description")
+"""Registered benchmark. Calling :code:`setup()` prepares it and returns the measured callable."""
+
+Comparison = namedtuple("Comparison", "name baseline current ratio status")
+"""Comparison of one benchmark result with a baseline.
+
+Status is one of :code:`"regression"`, :code:`"improvement"`, :code:`"unchanged"`, :code:`"new"`
+(missing in baseline) or :code:`"missing"` (missing in current results).
+"""
+
+_registry = OrderedDict()
+
+
+def benchmark(name):
+    """Decorator registering a benchmark.
+
+    Decorated function is called once to prepare the benchmark (eg. to create objects replaying
+    cassettes) and must return a callable doing one measured run. The callable can return a number
+    of processed items (caches, logs, points, ...) used to compute throughput.
+
+    :param str name: Unique benchmark name.
+    """
+
+    def decorator(setup):
+        assert name not in _registry, "Duplicate benchmark name: {}".format(name)
+        _registry[name] = Benchmark(name, setup, (setup.__doc__ or "").strip())
+        return setup
+
+    return decorator
+
+
+def get_benchmarks(patterns=None):
+    """Return registered benchmarks, optionally filtered by shell-style name patterns.
+
+    :param list patterns: Patterns like :code:`"cache.*"`. All benchmarks are returned if empty.
+    """
+    # importing the modules registers their benchmarks
+    from benchmarks import bench_cache, bench_geo, bench_geocaching, bench_trackable  # noqa: F401
+
+    return [b for b in _registry.values() if not patterns or any(fnmatch.fnmatch(b.name, p) for p in patterns)]
+
+
+def run_benchmark(bench, *, repeat=20, warmup=2):
+    """Run one benchmark and return its statistics.
+
+    :param .Benchmark bench: Benchmark to run.
+    :param int repeat: Number of measured runs.
+    :param int warmup: Number of runs before measuring.
+    :return: Dictionary with timings of one run in seconds and throughput.
+    :rtype: :class:`dict`
+    """
+    run = bench.setup()
+    items = None
+    for _ in range(warmup):
+        items = run()
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()  # collection pauses would add noise to short runs
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    timings.sort()
+    mean = statistics.mean(timings)
+    return OrderedDict(
+        [
+            ("runs", repeat),
+            ("items", items),
+            ("min", timings[0]),
+            ("max", timings[-1]),
+            ("mean", mean),
+            ("median", statistics.median(timings)),
+            ("stdev", statistics.stdev(timings) if repeat > 1 else 0.0),
+            ("p95", timings[min(repeat - 1, int(round(0.95 * (repeat - 1))))]),
+            ("runs_per_sec", 1 / mean),
+            ("items_per_sec", items / mean if items else None),
+        ]
+    )
+
+
+def run_benchmarks(benchmarks, *, repeat=20, warmup=2, progress=None):
+    """Run benchmarks and return machine-readable results.
+
+    :param benchmarks: Iterable of :class:`.Benchmark`.
+    :param int repeat: Number of measured runs of each benchmark.
+    :param int warmup: Number of runs before measuring.
+    :param callable progress: Optional callback called as :code:`progress(name, stats)` after each benchmark.
+    :rtype: :class:`dict`
+    """
+    import pycaching
+
+    results = OrderedDict()
+    for bench in benchmarks:
+        results[bench.name] = stats = run_benchmark(bench, repeat=repeat, warmup=warmup)
+        if progress:
+            progress(bench.name, stats)
+
+    return OrderedDict(
+        [
+            (
+                "meta",
+                OrderedDict(
+                    [
+                        ("created", datetime.now(timezone.utc).isoformat()),
+                        ("pycaching", getattr(pycaching, "__version__", None)),
+                        ("python", sys.version.split()[0]),
+                        ("implementation", platform.python_implementation()),
+                        ("platform", platform.platform()),
+                        ("repeat", repeat),
+                    ]
+                ),
+            ),
+            ("benchmarks", results),
+        ]
+    )
+
+
+def compare(results, baseline, *, threshold=0.1, metric="median"):
+    """Compare benchmark results with a baseline.
+
+    :param dict results: Current results as returned by :func:`run_benchmarks`.
+    :param dict baseline: Baseline results in the same format.
+    :param float threshold: Relative slowdown (or speedup) considered significant, eg. :code:`0.1` for 10 %.
+    :param str metric: Statistic to compare.
+    :return: List of :class:`.Comparison`, ordered by current results and then missing ones.
+    """
+    current, previous = results["benchmarks"], baseline["benchmarks"]
+    comparisons = []
+
+    for name, stats in current.items():
+        if name not in previous:
+            comparisons.append(Comparison(name, None, stats[metric], None, "new"))
+            continue
+        ratio = stats[metric] / previous[name][metric]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparisons.append(Comparison(name, previous[name][metric], stats[metric], ratio, status))
+
+    for name, stats in previous.items():
+        if name not in current:
+            comparisons.append(Comparison(name, stats[metric], None, None, "missing"))
+
+    return comparisons
+
+
+def load_results(path):
+    """Load results from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+
+def save_results(results, path):
+    """Save results to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
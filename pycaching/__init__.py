@@ -1,11 +1,34 @@
-from pycaching.cache import Cache  # NOQA
-from pycaching.geo import Point, Rectangle  # NOQA
-from pycaching.geocaching import Geocaching  # NOQA
-from pycaching.log import Log  # NOQA
-from pycaching.trackable import Trackable  # NOQA
+import importlib
 
 __version__ = "4.5.0"  # PEP 440
 
+# Public classes are imported on the first access (PEP 562), so importing the package doesn't
+# import heavy dependencies (requests, bs4, geopy) until they are really needed.
+_lazy_attributes = {
+    "Cache": "pycaching.cache",
+    "Point": "pycaching.geo",
+    "Rectangle": "pycaching.geo",
+    "Geocaching": "pycaching.geocaching",
+    "GeocachingPool": "pycaching.pool",
+    "Log": "pycaching.log",
+    "Trackable": "pycaching.trackable",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # next access won't call this function
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
 
 def login(username=None, password=None):
     """A shortcut for user login.
@@ -14,6 +37,8 @@ def login(username=None, password=None):
 
     :return: Created :class:`.Geocaching` instance.
     """
+    from pycaching.geocaching import Geocaching
+
     g = Geocaching()
     g.login(username, password)
     return g
@@ -26,6 +51,8 @@ def login_with_cookie(cookie, username=None, cookie_name="gspkauth"):
 
     :return: Created :class:`.Geocaching` instance.
     """
+    from pycaching.geocaching import Geocaching
+
     g = Geocaching()
     g.login_with_cookie(cookie=cookie, username=username, cookie_name=cookie_name)
     return g
@@ -2,22 +2,69 @@
 
 import datetime
 import enum
+import hashlib
 import logging
-import os
 import re
-
-from bs4.element import Script
+from collections import namedtuple
 
 from pycaching import errors
-from pycaching.geo import Point
+from pycaching.instrumentation import measure, measured
 from pycaching.log import Log
 from pycaching.log import Type as LogType
 from pycaching.trackable import Trackable
-from pycaching.util import deprecated, lazy_loaded, parse_date, rot13
+from pycaching.util import deprecated, lazy_loaded, parse_date
 
 # prefix _type() function to avoid collisions with cache type
 _type = type
 
+CacheChange = namedtuple("CacheChange", "wp old new changes")
+"""Difference of one cache between two snapshots, yielded by :meth:`.Cache.diff_snapshots`.
+
+Contains the GC code, the old and new :class:`.Cache` (:code:`None` if the cache was added or
+removed) and a :class:`dict` of changes as returned by :meth:`.Cache.diff`.
+"""
+
+_missing = object()
+
+
+def _comparable(value):
+    """Return a plain representation of a field value, suitable for comparing and hashing."""
+    from pycaching.geo import Coordinates, Point
+
+    if isinstance(value, (Point, Coordinates)):
+        return round(value.latitude, 6), round(value.longitude, 6)
+    if isinstance(value, Waypoint):
+        return value.identifier, value.type, _comparable(value._location), value.note
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return tuple(sorted(((_comparable(k), _comparable(v)) for k, v in value.items()), key=lambda i: str(i[0])))
+    return value
+
+
+def _to_plain(value):
+    """Return a field value converted to JSON compatible types, see :meth:`.Cache.to_dict`."""
+    from pycaching.geo import Coordinates, Point
+
+    if isinstance(value, (Point, Coordinates)):
+        return [value.latitude, value.longitude]
+    if isinstance(value, Waypoint):
+        return {
+            "id": value.identifier,
+            "type": value.type,
+            "location": _to_plain(value._location),
+            "note": value.note,
+        }
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {_to_plain(k): _to_plain(v) for k, v in value.items()}
+    return value
+
 
 class Cache(object):
     """Represents a geocache with its properties and methods for loading them.
@@ -33,6 +80,54 @@ class Cache(object):
     on geocaching.com.
     """
 
+    # properties settable by __init__ kwargs, also the fields handled by to_dict() and from_dict()
+    _known_kwargs = (
+        "name",
+        "type",
+        "location",
+        "original_location",
+        "status",
+        "found",
+        "size",
+        "difficulty",
+        "terrain",
+        "author",
+        "hidden",
+        "attributes",
+        "summary",
+        "description",
+        "description_html",
+        "hint",
+        "favorites",
+        "pm_only",
+        "url",
+        "waypoints",
+        "_logbook_token",
+        "_trackable_page_url",
+        "guid",
+        "visited",
+        "log_counts",
+    )
+
+    # attribute names of properties not stored as "_" + name
+    _storage_names = {
+        "url": "url",
+        "found": "_found_status",
+        "_logbook_token": "_Cache__logbook_token",
+        "_trackable_page_url": "_Cache__trackable_page_url",
+    }
+
+    # fields compared by fingerprint() and diff(), format: { group: (property, ...) }
+    _field_groups = {
+        "status": ("status", "pm_only"),
+        "location": ("location", "original_location"),
+        "details": ("name", "type", "size", "difficulty", "terrain", "author", "hidden"),
+        "description": ("summary", "description", "description_html", "hint"),
+        "attributes": ("attributes",),
+        "waypoints": ("waypoints",),
+        "logs": ("log_counts", "favorites"),
+    }
+
     # generated by util.get_possible_attributes()
     # TODO: smarter way of keeping attributes up to date
     _possible_attributes = {
@@ -129,6 +224,8 @@ class Cache(object):
     @classmethod
     def _from_api_record(cls, geocaching, record):
         """Create a cache instance from a JSON record returned by API."""
+        from pycaching.geo import Coordinates
+
         cache = Cache(
             geocaching,
             wp=record["code"],
@@ -155,7 +252,8 @@ class Cache(object):
 
         # NOTE: Basic Members have no access to postedCoordinates of Premium-only caches
         if "postedCoordinates" in record:
-            cache.location = Point(record["postedCoordinates"]["latitude"], record["postedCoordinates"]["longitude"])
+            coordinates = record["postedCoordinates"]
+            cache.location = Coordinates(coordinates["latitude"], coordinates["longitude"])
 
         return cache
 
@@ -172,35 +270,7 @@ class Cache(object):
         if wp is not None:
             self.wp = wp
 
-        known_kwargs = {
-            "name",
-            "type",
-            "location",
-            "original_location",
-            "status",
-            "found",
-            "size",
-            "difficulty",
-            "terrain",
-            "author",
-            "hidden",
-            "attributes",
-            "summary",
-            "description",
-            "description_html",
-            "hint",
-            "favorites",
-            "pm_only",
-            "url",
-            "waypoints",
-            "_logbook_token",
-            "_trackable_page_url",
-            "guid",
-            "visited",
-            "log_counts",
-        }
-
-        for name in known_kwargs:
+        for name in self._known_kwargs:
             if name in kwargs:
                 setattr(self, name, kwargs[name])
 
@@ -233,6 +303,8 @@ class Cache(object):
 
         :param .Block block: Source block
         """
+        from pycaching.geo import Point
+
         c = cls(block.tile.geocaching, block.cache_wp, name=block.cache_name)
         c.location = Point.from_block(block)
         return c
@@ -304,16 +376,23 @@ class Cache(object):
         """The cache location.
 
         :setter: Set a cache location. If :class:`str` is passed, then :meth:`.Point.from_string`
-            is used and its return value is stored as a location.
+            is used and its return value is stored as a location. :class:`.Coordinates` are stored
+            as is and converted to :class:`.Point` on first access.
         :type: :class:`.Point`
         """
+        from pycaching.geo import Coordinates
+
+        if isinstance(self._location, Coordinates):
+            self._location = self._location.to_point()
         return self._location
 
     @location.setter
     def location(self, location):
+        from pycaching.geo import Coordinates, Point
+
         if isinstance(location, str):
             location = Point.from_string(location)
-        elif not isinstance(location, Point):
+        elif not isinstance(location, (Point, Coordinates)):
             raise errors.ValueError("Passed object is not Point instance nor string containing coordinates.")
         self._location = location
 
@@ -324,16 +403,23 @@ class Cache(object):
 
         :setter: Set a cache original location. If :class:`str` is passed,
             then :meth:`.Point.from_string` is used and its return value is stored as a
-            location.
+            location. :class:`.Coordinates` are stored as is and converted to :class:`.Point` on
+            first access.
         :type: :class:`.Point`
         """
+        from pycaching.geo import Coordinates
+
+        if isinstance(self._original_location, Coordinates):
+            self._original_location = self._original_location.to_point()
         return self._original_location
 
     @original_location.setter
     def original_location(self, original_location):
+        from pycaching.geo import Coordinates, Point
+
         if isinstance(original_location, str):
             original_location = Point.from_string(original_location)
-        elif not isinstance(original_location, Point) and original_location is not None:
+        elif not isinstance(original_location, (Point, Coordinates)) and original_location is not None:
             raise errors.ValueError("Passed object is not Point instance nor string containing coordinates.")
         self._original_location = original_location
 
@@ -674,6 +760,7 @@ class Cache(object):
     def _trackable_page_url(self, trackable_page_url):
         self.__trackable_page_url = trackable_page_url
 
+    @measured("cache.load")
     def load(self):
         """Load all possible cache details.
 
@@ -685,6 +772,9 @@ class Cache(object):
         loading is PM only, please consider using :meth:`load_quick` as it will load the same
         details, but quicker.
 
+        Calling this method again revalidates already loaded details by a conditional request. If
+        the page has not changed since the last load, it is not parsed again.
+
         .. note::
            This method is called automatically when you access a property which isn't yet filled in
            (so-called "lazy loading"). You don't have to call it explicitly.
@@ -692,141 +782,60 @@ class Cache(object):
         :raise .PMOnlyException: If cache is PM only and current user is basic member.
         :raise .LoadError: If cache loading fails (probably because of not existing cache).
         """
-        try:
-            # pick url based on what info we have right now
-            if hasattr(self, "url"):
-                root = self.geocaching._request(self.url)
-            elif hasattr(self, "_wp"):
-                root = self.geocaching._request(self._urls["cache_details"], params={"wp": self._wp})
-            else:
-                raise errors.LoadError("Cache lacks info for loading")
-        except errors.Error as e:
-            # probably 404 during cache loading - cache does not exist
-            raise errors.LoadError("Error in loading cache") from e
-
-        # check for PM only caches if using free account
-        self.pm_only = root.find("section", "premium-upgrade-widget") is not None
-
-        cache_details = root.find(id="ctl00_divContentMain") if self.pm_only else root.find(id="cacheDetails")
-
-        # details also available for basic members for PM only caches -----------------------------
-
-        if self.pm_only:
-            self.wp = cache_details.find("li", "li__gccode").text.strip()
-
-            self.name = cache_details.find("h1").text.strip()
-
-            author = cache_details.find(id="ctl00_ContentBody_uxCacheBy").text
-            self.author = author[11:]  # 11 = len("A cache by ")
-
-            # parse cache detail list into a python list
-            details = cache_details.find("ul", "ul__hide-details").text.split("\n")
+        # imports are here to not slow down importing of this module (eg. just for the enums)
+        from pycaching.parsers import parse_cache_details
 
-            self.difficulty = float(details[2])
+        page, validators = self._fetch_details()
+        if page is not None:
+            with measure(self.geocaching, "cache.load.parse", self):
+                data = parse_cache_details(page)
+            self._apply_details(data, validators)
 
-            self.terrain = float(details[5])
+    def _fetch_details(self):
+        """Download the cache details page, see :meth:`load`.
 
-            self.size = Size.from_string(details[8])
+        :return: Tuple of the page (or :code:`None` if it has not changed since the last load) and its
+            :class:`.Validators`.
+        :raise .LoadError: If cache loading fails.
+        """
+        from pycaching.geocaching import NOT_MODIFIED, Validators
 
-            self.favorites = int(details[11])
-        else:
-            # parse from <title> - get first word
-            try:
-                self.wp = root.title.string.split(" ")[0]
-            except ValueError:
-                raise errors.LoadError()
-            self.name = cache_details.find(id="ctl00_ContentBody_CacheName").text
-
-            try:
-                self.author = cache_details("a")[1].text
-            except IndexError:
-                if "[DELETED_USER]" in cache_details.find("div", id="ctl00_ContentBody_mcd1").text:
-                    self.author = None
+        validators = getattr(self, "_validators", None) or Validators()
+        try:
+            # pick url based on what info we have right now
+            with measure(self.geocaching, "cache.load.fetch", self):
+                if hasattr(self, "url"):
+                    res, validators = self.geocaching._request(self.url, expect="raw", validators=validators)
+                elif hasattr(self, "_wp"):
+                    res, validators = self.geocaching._request(
+                        self._urls["cache_details"], params={"wp": self._wp}, expect="raw", validators=validators
+                    )
                 else:
-                    raise
-
-            D_and_T_img = root.find("div", "CacheStarLabels").find_all("img")
-            self.difficulty, self.terrain = [float(img.get("alt").split()[0]) for img in D_and_T_img]
+                    raise errors.LoadError("Cache lacks info for loading")
+        except errors.Error as e:
+            # probably 404 during cache loading - cache does not exist
+            raise errors.LoadError("Error in loading cache") from e
 
-            size = root.find("div", "CacheSize")
-            size = size.find("img").get("src")  # size img src
-            size = size.split("/")[-1].rsplit(".", 1)[0]  # filename w/o extension
-            self.size = Size.from_filename(size)
+        if res is NOT_MODIFIED:
+            logging.debug("Cache not modified: {}".format(self))
+            self._validators = validators
+            return None, validators
+        return res.text, validators
 
-        # use shared functionality as both cases use the same method
-        type = cache_details.select_one("svg.cache-icon use").get("xlink:href")  # "cache-types.svg#icon-3-disabled"
-        type = type.split("#")[-1].replace("_", "-").split("-")[1]  # "3"
-        self.type = Type.from_filename(type)
+    def _apply_details(self, data, validators):
+        """Fill in fields parsed from the cache details page, see :meth:`load`.
 
-        if self.pm_only:
+        :raise .PMOnlyException: If the page has only details available for basic members.
+        """
+        self._apply(data)
+        if data["pm_only"] and "status" not in data:
             raise errors.PMOnlyException()
 
-        # details not available for basic members for PM only caches
-        pm_only_warning = root.find("p", "Warning NoBottomSpacing")
-        self.pm_only = pm_only_warning and ("Premium Member Only" in pm_only_warning.text) or False
-
-        attributes_widget, inventory_widget, *_ = root.find_all("div")
-
-        hidden = cache_details.find("div", "minorCacheDetails").find_all("div")[1].text
-        self.hidden = parse_date(hidden.split(":")[-1])
-
-        self.location = Point.from_string(root.find(id="uxLatLon").text)
-
-        self.status = Status.from_cache_details(root)
-
-        log_image = root.find(id="ctl00_ContentBody_GeoNav_logTypeImage")
-        if log_image:
-            log_image_filename = log_image.get("src").split("/")[-1].rsplit(".", 1)[0]  # filename w/o extension
-            self._found_status = Log(type=LogType.from_filename(log_image_filename))
-        else:
-            self._found_status = None
-
-        attributes_raw = attributes_widget.find_all("img")
-        attributes_raw = [_.get("src").split("/")[-1].rsplit("-", 1) for _ in attributes_raw]
-
-        self.attributes = {
-            attribute_name: appendix.startswith("yes")
-            for attribute_name, appendix in attributes_raw
-            if not appendix.startswith("blank")
-        }
-
-        self.summary = root.find(id="ctl00_ContentBody_ShortDescription").text
-        raw_description = root.find(id="ctl00_ContentBody_LongDescription")
-        self.description = raw_description.text
-        self.description_html = str(raw_description)
-
-        self.hint = rot13(root.find(id="div_hint").get_text(separator="\n"))
-
-        favorites = root.find("span", "favorite-value")
-        if favorites:
-            self.favorites = int(favorites.text)
-        else:
-            self.favorites = 0
-
-        js_content = "\n".join(root.find_all(string=lambda i: isinstance(i, Script)))
-        self._logbook_token = re.findall("userToken\\s*=\\s*'([^']+)'", js_content)[0]
-        # find original location if any
-        if 'oldLatLng":' in js_content:
-            old_lat_long = js_content.split('oldLatLng":')[1].split("]")[0].split("[")[1]
-            self.original_location = Point(old_lat_long)
-        else:
-            self.original_location = None
-
-        # if there are some trackables
-        if len(inventory_widget.find_all("a")) >= 3:
-            trackable_page_url = inventory_widget.find(id="ctl00_ContentBody_uxTravelBugList_uxViewAllTrackableItems")
-            self._trackable_page_url = trackable_page_url.get("href")[3:]  # has "../" on start
-        else:
-            self._trackable_page_url = None
-
-        # Additional Waypoints
-        self.waypoints = Waypoint.from_html(root, "ctl00_ContentBody_Waypoints")
-
-        # Log counts
-        self.log_counts = Cache._get_log_counts_from_cache_details(root)
-
+        # remember the page only once it is fully parsed
+        self._validators = validators
         logging.debug("Cache loaded: {}".format(self))
 
+    @measured("cache.load_quick")
     def load_quick(self):
         """Load basic cache details.
 
@@ -839,7 +848,8 @@ class Cache(object):
 
         :raise .LoadError: If cache loading fails (probably because of not existing cache).
         """
-        res = self.geocaching._request(self._urls["tiles_server"], params={"i": self.wp}, expect="json")
+        with measure(self.geocaching, "cache.load_quick.fetch", self):
+            res = self.geocaching._request(self._urls["tiles_server"], params={"i": self.wp}, expect="json")
 
         if res["status"] == "failed" or len(res["data"]) != 1:
             msg = res["msg"] if "msg" in res else "Unknown error (probably not existing cache)"
@@ -867,6 +877,7 @@ class Cache(object):
 
         logging.debug("Cache loaded: {}".format(self))
 
+    @measured("cache.load_by_guid")
     def load_by_guid(self):
         """Load cache details using the GUID to request and parse the caches
         'print-page'. Loading as many properties as possible except the
@@ -879,150 +890,16 @@ class Cache(object):
 
         :raise .PMOnlyException: If the PM only warning is shown on the page
         """
+        from pycaching.parsers import parse_print_page
+
         # If GUID has not yet been set, load it using the "tiles_server"
         # utilizing `load_quick()`
         if not self.guid:
             self.load_quick()
 
-        res = self.geocaching._request(self._urls["print_page"], params={"guid": self.guid})
-        if res.find("p", "Warning") is not None:
-            raise errors.PMOnlyException()
-        content = res.find(id="Content")
-
-        self.name = content.find("h2").text
-
-        self.location = Point.from_string(content.find(class_="LatLong").text.strip())
-
-        type_img = os.path.basename(content.find("img").get("src"))
-        self.type = Type.from_filename(os.path.splitext(type_img)[0])
-
-        size_img = content.find("img", src=re.compile(r"\/icons\/container\/"))
-        self.size = Size.from_string(size_img.get("alt").split(": ")[1])
-
-        diff_terr = content.find(class_="DiffTerr").find_all("img")
-        assert len(diff_terr) == 2
-        self.difficulty = float(diff_terr[0]["alt"].split()[0])
-        self.terrain = float(diff_terr[1]["alt"].split()[0])
-
-        self.author = content.find(class_="Meta").text.partition(":")[2].strip()
-        self.hidden = content.find(class_="HalfRight AlignRight").p.text.strip().partition(":")[2].strip()
-
-        attr_img = content.find(class_="sortables").find_all("img")
-        attributes_raw = [
-            os.path.basename(_.get("src")).rsplit("-", 1)
-            for _ in attr_img
-            if _.get("src") and _.get("src").startswith("/images/attributes/")
-        ]
-        self.attributes = {
-            name: appendix.startswith("yes") for name, appendix in attributes_raw if not appendix.startswith("blank")
-        }
-
-        self.summary = content.find("h2", string="Short Description").find_next("div").text
-
-        raw_description = content.find("h2", string="Long Description").find_next("div")
-        self.description = raw_description.text
-        self.description_html = str(raw_description)
-
-        hint = content.find(id="uxEncryptedHint")
-        self.hint = hint.get_text(separator="\n") if hint else None
-
-        fav_text = content.find(class_="Third AlignRight").p.contents[2]
-        try:
-            self.favorites = int(fav_text)
-        except ValueError:  # element not present when 0 favorites
-            self.favorites = 0
-
-        self.waypoints = Waypoint.from_html(content, "Waypoints")
-
-        self.log_counts = Cache._get_log_counts_from_print_page(res)
-        self.wp = res.find(class_="HalfRight").find("h1").text.strip()
-
-    @staticmethod
-    def _get_log_counts_from_cache_details(soup):
-        """Return a dictionary of all log counts found in the page
-        representation, based on the cache details page.
-
-        :param bs4.BeautifulSoup soup: Parsed html document of the cache details page.
-        """
-        lbl_find_counts = soup.find("span", {"id": "ctl00_ContentBody_lblFindCounts"})
-        log_totals = lbl_find_counts.find("ul")
-
-        # Text gives numbers separated by a lot of spaces, splitting retrieves the numbers.
-        # The values might contain thousand separators, which we have to remove before converting
-        # them to real numbers.
-        values = log_totals.text.split()
-        values = [int(value.replace(",", "").replace(".", "")) for value in values]
-
-        # Retrieve the list of image sources.
-        images = log_totals.find_all("img")
-        types = []
-        for image in images:
-            type = image["src"]  # "../images/logtypes/2.png"
-            type = type.split("/")[-1].split(".")[0]  # "2"
-            type = LogType.from_filename(type)
-            types.append(type)
-
-        # Prevent possible wrong assignments when the list sizes differ for some unknown reason.
-        if not len(values) == len(types):
-            raise errors.ValueError(
-                "Different list sizes getting log counts: {} types and {} counts.".format(len(types), len(values))
-            )
-
-        # Finally create the mapping.
-        log_counts = dict(zip(types, values))
-
-        return log_counts
-
-    @staticmethod
-    def _get_log_counts_from_print_page(soup):
-        """Return a dictionary of all log counts found in the page
-        representation, based on the print page.
-
-        :param bs4.BeautifulSoup soup: Parsed html document of the cache print page.
-        """
-        # The print page does not use any IDs, so we use some more complicated approach here and
-        # search for the paragraph containing the log type images.
-        p_meta = soup.find_all("p", "Meta")
-        element = None
-        for entry in p_meta:
-            if "images/logtypes" in str(entry):
-                element = entry
-                break
-
-        if not element:
-            raise errors.ValueError("Log counts could not be found.")
-
-        # Text gives numbers and verbose descriptions of the current values as well as an
-        # introductory text. So we have to perform number checks for each element and only keep
-        # the numbers.
-        # The values might contain thousand separators, which we have to remove before converting
-        # them to real numbers.
-        words = element.text.split()
-        values = []
-        for word in words:
-            word = word.replace(",", "").replace(".", "")
-            if word and word.isdigit():
-                values.append(int(word))
-
-        # Retrieve the list of image sources.
-        images = element.find_all("img")
-        types = []
-        for image in images:
-            type = image["src"]  # "../images/logtypes/2.png"
-            type = type.split("/")[-1].split(".")[0]  # "2"
-            type = LogType.from_filename(type)
-            types.append(type)
-
-        # Prevent possible wrong assignments when the list sizes differ for some unknown reason.
-        if not len(values) == len(types):
-            raise errors.ValueError(
-                "Different list sizes getting log counts: {} types and {} counts.".format(len(types), len(values))
-            )
-
-        # Finally create the mapping.
-        log_counts = dict(zip(types, values))
-
-        return log_counts
+        with measure(self.geocaching, "cache.load_by_guid.fetch", self):
+            res = self.geocaching._request(self._urls["print_page"], params={"guid": self.guid})
+        self._apply(parse_print_page(res))
 
     def _logbook_get_page(self, page=0, per_page=25):
         """Load one page from logbook.
@@ -1131,16 +1008,10 @@ class Cache(object):
         :return: Tuple of data nescessary to log the cache.
         :rtype: :class:`tuple` of (:class:`set`:, :class:`dict`, class:`str`)
         """
-        log_page = self.geocaching._request(self._get_log_page_url())
-
-        # find all valid log types for the cache
-        valid_types = {o["value"] for o in log_page.find("select", attrs={"name": "LogTypeId"}).find_all("option")}
+        from pycaching.parsers import parse_log_page
 
-        # find all static data fields needed for log
-        hidden_inputs = log_page.find_all("input", type=["hidden", "submit"])
-        hidden_inputs = {i["name"]: i.get("value", "") for i in hidden_inputs}
-
-        return valid_types, hidden_inputs
+        data = parse_log_page(self.geocaching._request(self._get_log_page_url()))
+        return set(data["valid_types"]), data["hidden_inputs"]
 
     def post_log(self, log):
         """Post a log for this cache.
@@ -1164,6 +1035,221 @@ class Cache(object):
 
         self.found_status = log
 
+    def _get_loaded(self, name):
+        """Return a value of a field if it is loaded, :code:`_missing` otherwise. Never loads."""
+        return vars(self).get(self._storage_names.get(name, "_" + name), _missing)
+
+    def to_dict(self, loaded_only=True):
+        """Return cache fields as a dictionary of plain values, suitable for JSON or msgpack.
+
+        Locations are stored as :code:`[latitude, longitude]`, enums by their values, dates in ISO
+        format and waypoints as dictionaries. Use :meth:`from_dict` to create the cache again.
+
+        :param bool loaded_only: If :code:`True`, only already loaded fields are included and lazy
+            loading is never triggered. Otherwise missing fields are loaded first.
+        :rtype: :class:`dict`
+        """
+        data = {}
+        if "_wp" in vars(self):
+            data["wp"] = self._wp
+
+        for name in self._known_kwargs:
+            value = self._get_loaded(name)
+            if value is _missing:
+                if loaded_only:
+                    continue
+                try:
+                    getattr(self, name)  # trigger lazy loading
+                except AttributeError:
+                    continue  # field which cannot be loaded, eg. visited
+                value = self._get_loaded(name)
+
+            if name == "found":
+                value = self.found
+            data[name] = _to_plain(value)
+        return data
+
+    @classmethod
+    def from_dict(cls, geocaching, data):
+        """Return a new :class:`.Cache` created from a dictionary returned by :meth:`to_dict`.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance, used for loading
+            missing cache data.
+        :param dict data: Cache fields.
+        """
+        return cls(geocaching, data.get("wp"), **cls._decode(data))
+
+    @classmethod
+    def _decode(cls, data):
+        """Return property values from plain values, see :meth:`from_dict`."""
+        from pycaching.geo import Coordinates
+
+        kwargs = {}
+        for name, value in data.items():
+            if name not in cls._known_kwargs:
+                continue
+            if value is None:
+                pass
+            elif name in ("location", "original_location"):
+                value = Coordinates(*value)
+            elif name in ("hidden", "visited"):
+                value = datetime.date.fromisoformat(value)
+            elif name == "type":
+                value = Type(value)
+            elif name == "size":
+                value = Size(value)
+            elif name == "status":
+                value = Status(value)
+            elif name == "log_counts":
+                value = {LogType(log_type): count for log_type, count in value.items()}
+            elif name == "waypoints":
+                value = {identifier: Waypoint._from_dict(waypoint) for identifier, waypoint in value.items()}
+            kwargs[name] = value
+        return kwargs
+
+    def _apply(self, data):
+        """Set fields from a dictionary of plain values, see :meth:`from_dict`."""
+        if data.get("wp"):
+            self.wp = data["wp"]
+        for name, value in self._decode(data).items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def dump_many(caches, file, *, format="jsonl", loaded_only=True):
+        """Write caches to a binary file, one record at a time.
+
+        :param caches: Iterable of caches to write.
+        :param file: File object opened for writing in binary mode.
+        :param str format: Either :code:`jsonl` (one JSON object per line) or :code:`msgpack`, which
+            is more compact and faster, but requires `msgpack <https://pypi.org/project/msgpack/>`_.
+        :param bool loaded_only: Passed to :meth:`to_dict`.
+        :return: Number of written caches.
+        :rtype: :class:`int`
+        """
+        if format == "jsonl":
+            import json
+
+            def write(data):
+                file.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+
+        elif format == "msgpack":
+            # imports are here to not require msgpack for other parts of program
+            import msgpack
+
+            packer = msgpack.Packer()
+
+            def write(data):
+                file.write(packer.pack(data))
+
+        else:
+            raise errors.ValueError("Unknown format '{}'.".format(format))
+
+        count = 0
+        for cache in caches:
+            write(cache.to_dict(loaded_only=loaded_only))
+            count += 1
+        return count
+
+    @classmethod
+    def read_many(cls, geocaching, file, *, format="jsonl"):
+        """Read caches written by :meth:`dump_many`, one record at a time.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance for the caches.
+        :param file: File object opened for reading in binary mode.
+        :param str format: Either :code:`jsonl` or :code:`msgpack`.
+        :return: Generator of :class:`.Cache` instances.
+        """
+        if format == "jsonl":
+            import json
+
+            records = (json.loads(line) for line in file if line.strip())
+        elif format == "msgpack":
+            import msgpack
+
+            records = msgpack.Unpacker(file, raw=False)
+        else:
+            raise errors.ValueError("Unknown format '{}'.".format(format))
+
+        for data in records:
+            yield cls.from_dict(geocaching, data)
+
+    def fingerprint(self):
+        """Return hashes of loaded fields, one for each group of related fields.
+
+        The groups are :code:`status`, :code:`location`, :code:`details`, :code:`description`,
+        :code:`attributes`, :code:`waypoints` and :code:`logs` (log counts and favorites). Groups
+        without any loaded field are left out. The hashes are stable between runs, so they can be
+        stored and compared with a later snapshot to find out which groups have changed.
+
+        Accessing the fields doesn't trigger lazy loading.
+
+        :return: Dictionary of :code:`{ group: hexdigest }`.
+        :rtype: :class:`dict`
+        """
+        fingerprint = {}
+        for group, names in self._field_groups.items():
+            values = [self._get_loaded(name) for name in names]
+            if all(value is _missing for value in values):
+                continue
+            values = tuple(
+                None if value is _missing else (name, _comparable(value)) for name, value in zip(names, values)
+            )
+            fingerprint[group] = hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+        return fingerprint
+
+    def diff(self, other, *, fingerprints=None):
+        """Return fields which differ between this cache and another snapshot of it.
+
+        Only fields loaded in both instances are compared, so this doesn't trigger lazy loading.
+        Groups of fields with equal :meth:`fingerprint` are skipped without comparing the values.
+
+        :param .Cache other: Newer snapshot of the same cache.
+        :param tuple fingerprints: Already computed fingerprints of both caches, to avoid computing
+            them again.
+        :return: Dictionary of :code:`{ property name: (old value, new value) }`.
+        :rtype: :class:`dict`
+        """
+        old_fingerprint, new_fingerprint = fingerprints or (self.fingerprint(), other.fingerprint())
+        changes = {}
+        for group, names in self._field_groups.items():
+            if group not in old_fingerprint or old_fingerprint.get(group) == new_fingerprint.get(group):
+                continue
+            for name in names:
+                old, new = self._get_loaded(name), other._get_loaded(name)
+                if old is _missing or new is _missing or _comparable(old) == _comparable(new):
+                    continue
+                changes[name] = getattr(self, name), getattr(other, name)
+        return changes
+
+    @staticmethod
+    def diff_snapshots(old, new):
+        """Compare two snapshots of a collection of caches and yield the differences.
+
+        Caches are matched by their GC code. Unchanged caches are recognized by their
+        :meth:`fingerprint` and skipped.
+
+        :param old: Iterable of caches from the older snapshot.
+        :param new: Iterable of caches from the newer snapshot.
+        :return: Generator of :class:`.CacheChange` for changed, added (:code:`old` is
+            :code:`None`) and removed (:code:`new` is :code:`None`) caches.
+        """
+        old = {cache.wp: cache for cache in old}
+        for new_cache in new:
+            old_cache = old.pop(new_cache.wp, None)
+            if old_cache is None:
+                yield CacheChange(new_cache.wp, None, new_cache, {})
+                continue
+
+            fingerprints = old_cache.fingerprint(), new_cache.fingerprint()
+            if fingerprints[0] == fingerprints[1]:
+                continue
+            changes = old_cache.diff(new_cache, fingerprints=fingerprints)
+            if changes:
+                yield CacheChange(new_cache.wp, old_cache, new_cache, changes)
+
+        for old_cache in old.values():
+            yield CacheChange(old_cache.wp, old_cache, None, {})
+
 
 class Waypoint(object):
     """Waypoint represents a waypoint related to the cache. This may be a
@@ -1190,23 +1276,17 @@ class Waypoint(object):
             waypoints table
         :param str table_id: html id of the waypoints table
         """
-        waypoints_dict = {}
-        waypoints_table = soup.find("table", id=table_id)
-        if waypoints_table:
-            waypoints_table = waypoints_table.find_all("tr")
-            for r1, r2 in zip(waypoints_table[1::2], waypoints_table[2::2]):
-                columns = r1.find_all("td") + r2.find_all("td")
-                identifier = columns[3].text.strip()
-                type = columns[1].find("img").get("title")
-                location_string = columns[5].text.strip()
-                try:
-                    loc = Point(location_string)
-                except ValueError:
-                    loc = None
-                    logging.debug("No valid location format in waypoint {}: {}".format(identifier, location_string))
-                note = columns[8].text.strip()
-                waypoints_dict[identifier] = cls(identifier, type, loc, note)
-        return waypoints_dict
+        from pycaching.parsers import parse_waypoints
+
+        return {identifier: cls._from_dict(data) for identifier, data in parse_waypoints(soup, table_id).items()}
+
+    @classmethod
+    def _from_dict(cls, data):
+        """Return a waypoint from a dictionary created by :meth:`.Cache.to_dict`."""
+        from pycaching.geo import Coordinates
+
+        location = data.get("location")
+        return cls(data.get("id"), data.get("type"), Coordinates(*location) if location else None, data.get("note"))
 
     def __str__(self):
         return self.identifier
@@ -1239,15 +1319,24 @@ class Waypoint(object):
     def location(self):
         """The waypoint location.
 
+        :setter: Set a waypoint location. If :class:`str` is passed, then :meth:`.Point.from_string`
+            is used and its return value is stored as a location. :class:`.Coordinates` are stored
+            as is and converted to :class:`.Point` on first access.
         :type: :class:`.Point`
         """
+        from pycaching.geo import Coordinates
+
+        if isinstance(self._location, Coordinates):
+            self._location = self._location.to_point()
         return self._location
 
     @location.setter
     def location(self, location):
+        from pycaching.geo import Coordinates, Point
+
         if isinstance(location, str):
             location = Point.from_string(location)
-        elif not isinstance(location, Point):
+        elif not isinstance(location, (Point, Coordinates)):
             raise errors.ValueError("Passed object is not Point instance nor string containing coordinates.")
         self._location = location
 
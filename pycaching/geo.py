@@ -1,17 +1,21 @@
+import collections.abc
 import itertools
 import logging
 import math
 import re
-import weakref
-from collections import namedtuple
+import threading
+import time
+from array import array
+from collections import OrderedDict, defaultdict, namedtuple
 from statistics import mean
 
 import geopy
 import geopy.distance
 import geopy.format
 
-from pycaching.errors import BadBlockError, Error, GeocodeError
+from pycaching.errors import BadBlockError, Error
 from pycaching.errors import ValueError as PycachingValueError
+from pycaching.instrumentation import measure, measured
 from pycaching.util import lazy_loaded
 
 
@@ -20,6 +24,209 @@ def to_decimal(deg, min):
     return round(deg + min / 60, 5)
 
 
+# the common format, eg. "N 49° 44.123 E 013° 22.456"
+_coordinates_fast = re.compile(
+    r"\s*([NS])\s*(\d{1,2})(?:°\s*|\s+)(\d{1,2}[.,]\d+)\s*,?\s*([EW])\s*(\d{1,3})(?:°\s*|\s+)(\d{1,2}[.,]\d+)\s*$",
+    re.IGNORECASE,
+)
+# the same numbers in various malformed formats, after removing hemisphere letters
+_coordinates_loose = re.compile(r"\s*(-?\s*\d+)\D+(\d+[\.,]\d+)\D+(-?\s*\d+)\D+(\d+[\.,]\d+)")
+
+
+def _parse_coordinates(string):
+    """Return latitude and longitude parsed from coordinates in degrees minutes format.
+
+    See :meth:`.Point.from_string` for supported formats.
+
+    :return: Tuple of floats or :code:`None` if the string is not in degrees minutes format.
+    """
+    m = _coordinates_fast.match(string)
+    if m:
+        lat_hemisphere, lat_deg, lat_min, lon_hemisphere, lon_deg, lon_min = m.groups()
+        lat_deg, lat_min = float(lat_deg), float(lat_min.replace(",", "."))
+        lon_deg, lon_min = float(lon_deg), float(lon_min.replace(",", "."))
+        if lat_hemisphere in "Ss":
+            lat_deg, lat_min = -lat_deg, -lat_min
+        if lon_hemisphere in "Ww":
+            lon_deg, lon_min = -lon_deg, -lon_min
+        return to_decimal(lat_deg, lat_min), to_decimal(lon_deg, lon_min)
+
+    # Convert to uppercase to simplify hemisphere comparisons
+    string = string.upper()
+    coords = string.replace("N", " ").replace("S", " ").replace("E", " ").replace("W", " ").replace("+", " ")
+
+    m = _coordinates_loose.match(coords)
+    if not m:
+        return None
+
+    latDeg, latMin, lonDeg, lonMin = [float(part.replace(" ", "").replace(",", ".")) for part in m.groups()]
+
+    if "S" in string:
+        latDeg *= -1
+        latMin *= -1
+    if "W" in string:
+        lonDeg *= -1
+        lonMin *= -1
+
+    return to_decimal(latDeg, latMin), to_decimal(lonDeg, lonMin)
+
+
+def parse_coordinates(strings, *, invalid=None):
+    """Parse many coordinates at once without creating :class:`.Point` objects.
+
+    Accepts the same formats as :meth:`.Point.from_string`.
+
+    :param strings: An iterable of coordinate strings.
+    :param float invalid: Value used for both latitude and longitude of strings which cannot be
+        parsed (eg. :code:`math.nan`). If :code:`None`, an error is raised instead.
+    :return: Tuple of latitudes and longitudes.
+    :rtype: :class:`tuple` of two :class:`array.array`
+    :raise .ValueError: If some string cannot be parsed and :code:`invalid` is not set.
+    """
+    lats, lons = array("d"), array("d")
+    for string in strings:
+        coordinates = _parse_coordinates(string)
+        if coordinates is None:
+            try:
+                point = geopy.Point.from_string(string.upper())
+                coordinates = point.latitude, point.longitude
+            except ValueError as e:
+                if invalid is None:
+                    raise PycachingValueError("Cannot parse coordinates '{}'.".format(string)) from e
+                coordinates = invalid, invalid
+        lats.append(coordinates[0])
+        lons.append(coordinates[1])
+    return lats, lons
+
+
+def route_length(route):
+    """Return a great-circle length of a route in meters.
+
+    :param route: Flat sequence of coordinates in form :code:`[lat1, lon1, lat2, lon2, ...]`, as
+        returned by :meth:`.Trackable.route`.
+    :rtype: :class:`float`
+    """
+    lats = [math.radians(lat) for lat in route[0::2]]
+    lons = [math.radians(lon) for lon in route[1::2]]
+    if len(lats) < 2:
+        return 0.0
+
+    # haversine formula for each pair of consecutive points, cosines are computed once per point
+    cos_lats = [math.cos(lat) for lat in lats]
+    total = 0.0
+    for lat1, lat2, lon1, lon2, cos1, cos2 in zip(lats, lats[1:], lons, lons[1:], cos_lats, cos_lats[1:]):
+        a = math.sin((lat2 - lat1) / 2) ** 2 + cos1 * cos2 * math.sin((lon2 - lon1) / 2) ** 2
+        total += math.asin(min(1.0, math.sqrt(a)))
+
+    return 2 * geopy.distance.EARTH_RADIUS * 1e3 * total
+
+
+_max_latitude = 85.0511287798  # limit of Web Mercator projection
+
+
+def _to_tile_space(lats, lons, zoom):
+    """Project coordinates to fractional map tile coordinates (Web Mercator) at given zoom level.
+
+    Latitudes are clamped to the range covered by the projection.
+    """
+    n = 2.0**zoom
+    log, tan, cos, radians, pi = math.log, math.tan, math.cos, math.radians, math.pi
+    xs = array("d", [(lon + 180.0) / 360.0 * n for lon in lons])
+    rads = [radians(min(max(lat, -_max_latitude), _max_latitude)) for lat in lats]
+    ys = array("d", [(1.0 - log(tan(rad) + (1 / cos(rad))) / pi) / 2.0 * n for rad in rads])
+    return xs, ys
+
+
+def points_to_tiles(lats, lons, zoom):
+    """Return map tile coordinates of many points at once.
+
+    .. seealso:: http://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
+
+    :param lats: Sequence of latitudes.
+    :param lons: Sequence of longitudes of the same length.
+    :param int zoom: Zoom level of the tiles.
+    :return: Tuple of tile X and Y coordinates, clamped to valid tiles.
+    :rtype: :class:`tuple` of two :class:`array.array`
+    """
+    last = 2**zoom - 1
+    xs, ys = _to_tile_space(lats, lons, zoom)
+    return (
+        array("l", [min(max(int(x), 0), last) for x in xs]),
+        array("l", [min(max(int(y), 0), last) for y in ys]),
+    )
+
+
+def tiles_to_points(xs, ys, zoom):
+    """Return coordinates of NW corners of many map tiles at once.
+
+    Fractional tile coordinates can be used for points inside the tiles.
+
+    .. seealso:: http://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
+
+    :param xs: Sequence of tile X coordinates.
+    :param ys: Sequence of tile Y coordinates of the same length.
+    :param int zoom: Zoom level of the tiles.
+    :return: Tuple of latitudes and longitudes.
+    :rtype: :class:`tuple` of two :class:`array.array`
+    """
+    n = 2.0**zoom
+    atan, sinh, degrees, pi = math.atan, math.sinh, math.degrees, math.pi
+    lats = array("d", [degrees(atan(sinh(pi * (1 - 2 * y / n)))) for y in ys])
+    lons = array("d", [x / n * 360.0 - 180.0 for x in xs])
+    return lats, lons
+
+
+def _merge_ranges(ranges):
+    """Merge overlapping or adjacent integer ranges given as inclusive :code:`(start, end)` pairs."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _polygon_tile_rows(xs, ys, zoom):
+    """Return column ranges of tiles intersecting a polygon, given by vertices in tile space.
+
+    :return: Dictionary :code:`{row: [[first_column, last_column], ...]}`.
+    """
+    last = 2**zoom - 1
+    vertices = list(zip(xs, ys))
+    edges = list(zip(vertices, vertices[1:] + vertices[:1]))
+    rows = defaultdict(list)
+
+    def add(row, xa, xb):
+        if xa > xb:
+            xa, xb = xb, xa
+        rows[row].append((min(max(math.floor(xa), 0), last), min(max(math.floor(xb), 0), last)))
+
+    # tiles touched by edges: clip each edge to every tile row it passes
+    for (x1, y1), (x2, y2) in edges:
+        if y1 > y2:
+            (x1, y1), (x2, y2) = (x2, y2), (x1, y1)
+        for row in range(max(math.floor(y1), 0), min(math.floor(y2), last) + 1):
+            if y1 == y2:
+                add(row, x1, x2)
+                continue
+            slope = (x2 - x1) / (y2 - y1)
+            add(row, x1 + slope * (max(y1, row) - y1), x1 + slope * (min(y2, row + 1) - y1))
+
+    # tiles inside: fill between edge crossings of each row center line (even-odd rule)
+    for row in range(max(math.floor(min(ys)), 0), min(math.floor(max(ys)), last) + 1):
+        center = row + 0.5
+        crossings = sorted(
+            x1 + (x2 - x1) * (center - y1) / (y2 - y1)
+            for (x1, y1), (x2, y2) in edges
+            if (y1 <= center) != (y2 <= center)
+        )
+        for xa, xb in zip(crossings[0::2], crossings[1::2]):
+            add(row, xa, xb)
+
+    return {row: _merge_ranges(ranges) for row, ranges in rows.items()}
+
+
 class Point(geopy.Point):
     """A point on earth defined by its latitude, longitude and possibly more attributes.
 
@@ -32,21 +239,31 @@ class Point(geopy.Point):
         self.precision = precision
         return self
 
+    @classmethod
+    def _unchecked(cls, latitude, longitude, precision=None):
+        """Return a new :class:`.Point` skipping geopy argument parsing and normalization.
+
+        Use only for coordinates known to be valid, eg. computed or received from the API.
+        """
+        self = object.__new__(cls)
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.altitude = 0.0
+        self.precision = precision
+        return self
+
     @classmethod
     def from_location(cls, geocaching, location):
         """Return a :class:`.Point` instance from geocoded location.
 
+        The results are cached, see :meth:`.Geocaching.geocode`.
+
         :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance, used to do
             a geocoding request.
         :param str location: Location to geocode.
         :raise .GeocodeError: If location cannot be geocoded (not found).
         """
-        res = geocaching._request("api/geocode", params={"q": location}, expect="json")
-
-        if res["status"] != "success":
-            raise GeocodeError(res["msg"])
-
-        return cls(float(res["data"]["lat"]), float(res["data"]["lng"]))
+        return cls(*geocaching._geocode(location))
 
     @classmethod
     def from_string(cls, string):
@@ -61,30 +278,13 @@ class Point(geopy.Point):
         :raise .ValueError: If string cannot be parsed as coordinates.
         """
 
-        # Convert to uppercase to simplify hemisphere comparisons
-        string = string.upper()
-        coords = string.replace("N", " ").replace("S", " ").replace("E", " ").replace("W", " ").replace("+", " ")
-
-        try:
-            m = re.match(r"\s*(-?\s*\d+)\D+(\d+[\.,]\d+)\D+(-?\s*\d+)\D+(\d+[\.,]\d+)", coords)
-
-            latDeg, latMin, lonDeg, lonMin = [float(part.replace(" ", "").replace(",", ".")) for part in m.groups()]
-
-            if "S" in string:
-                latDeg *= -1
-                latMin *= -1
-            if "W" in string:
-                lonDeg *= -1
-                lonMin *= -1
-
-            return cls(to_decimal(latDeg, latMin), to_decimal(lonDeg, lonMin))
-
-        except AttributeError:
-            pass
+        coordinates = _parse_coordinates(string)
+        if coordinates:
+            return cls(*coordinates)
 
         # fallback
         try:
-            return super(cls, cls).from_string(string)
+            return super(cls, cls).from_string(string.upper())
         except ValueError as e:
             # wrap possible error to pycaching.errors.ValueError
             raise PycachingValueError() from e
@@ -113,11 +313,8 @@ class Point(geopy.Point):
         else:
             dx, dy = 0, 0
 
-        n = 2.0**tile.z
-        lon_deg = (tile.x + dx) / n * 360.0 - 180.0
-        lat_rad = math.atan(math.sinh(math.pi * (1 - 2 * (tile.y + dy) / n)))
-        lat_deg = math.degrees(lat_rad)
-        p = cls(lat_deg, lon_deg)
+        lats, lons = tiles_to_points((tile.x + dx,), (tile.y + dy,), tile.z)
+        p = cls._unchecked(lats[0], lons[0])
         p.precision = tile.precision(p)
         return p
 
@@ -129,13 +326,8 @@ class Point(geopy.Point):
         :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance (passed to tile).
         :param int zoom: Zoom level of newly created tile.
         """
-        lat_deg = self.latitude
-        lon_deg = self.longitude
-        lat_rad = math.radians(lat_deg)
-        n = 2.0**zoom
-        x = int((lon_deg + 180.0) / 360.0 * n)
-        y = int((1.0 - math.log(math.tan(lat_rad) + (1 / math.cos(lat_rad))) / math.pi) / 2.0 * n)
-        return Tile(geocaching, x, y, zoom)
+        xs, ys = points_to_tiles((self.latitude,), (self.longitude,), zoom)
+        return Tile(geocaching, xs[0], ys[0], zoom)
 
     def __format__(self, format_spec):
         return "{:{}}".format(str(self), format_spec)
@@ -146,14 +338,85 @@ class Point(geopy.Point):
         :return: Human-readable location.
         :rtype: :class:`str`
         """
-        hemisphere_lat = self.latitude >= 0 and "N" or "S"
-        hemisphere_lon = self.longitude >= 0 and "E" or "W"
+        return _format_gc(self.latitude, self.longitude)
+
+
+class Coordinates(object):
+    """Lightweight pair of latitude and longitude.
+
+    Creating a :class:`.Point` is relatively expensive, because of geopy argument parsing and
+    normalization. This class is used to store locations of many objects (eg. caches from a search)
+    and converted to a :class:`.Point` only when needed. It compares equal to a :class:`.Point` with
+    the same coordinates and can be passed to geopy functions.
+    """
+
+    # this class can have a lot of instances so use __slots__
+    __slots__ = "latitude", "longitude", "precision"
+
+    def __init__(self, latitude, longitude, precision=None):
+        """Create coordinates.
+
+        No validation is done, neither now nor on conversion to a :class:`.Point`, so use this only
+        for valid coordinates (eg. parsed from a page or received from the API).
+
+        :param float latitude: Latitude in decimal degrees.
+        :param float longitude: Longitude in decimal degrees.
+        :param float precision: Optional precision in meters.
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.precision = precision
+
+    @classmethod
+    def from_string(cls, string):
+        """Return new :class:`.Coordinates` parsed from a string, see :meth:`.Point.from_string`.
+
+        :param str string: Coordinates to parse.
+        :raise .ValueError: If string cannot be parsed as coordinates.
+        """
+        coordinates = _parse_coordinates(string)
+        if coordinates:
+            return cls(*coordinates)
+        point = Point.from_string(string)
+        return cls(point.latitude, point.longitude)
+
+    def to_point(self):
+        """Return a :class:`.Point` with the same coordinates and precision.
+
+        The coordinates are not normalized or validated again, so the conversion is cheap.
+        """
+        return Point._unchecked(self.latitude, self.longitude, self.precision)
+
+    def format_gc(self):
+        """Return a location in a typical Geocaching format, see :meth:`.Point.format_gc`."""
+        return _format_gc(self.latitude, self.longitude)
 
-        fmt = "%(degrees)d%(deg)s %(minutes).3f"
-        lat = geopy.format.format_degrees(abs(self.latitude), fmt, geopy.format.UNICODE_SYMBOLS)
-        lon = geopy.format.format_degrees(abs(self.longitude), fmt, geopy.format.UNICODE_SYMBOLS)
+    def __iter__(self):
+        """Iterate over latitude, longitude and altitude, like :class:`geopy.Point`."""
+        return iter((self.latitude, self.longitude, 0.0))
 
-        return "{} {}, {} {}".format(hemisphere_lat, lat, hemisphere_lon, lon)
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Iterable):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return "Coordinates({}, {})".format(self.latitude, self.longitude)
+
+    def __str__(self):
+        return self.format_gc()
+
+
+def _format_gc(latitude, longitude):
+    """Return a location in a typical Geocaching format."""
+    hemisphere_lat = latitude >= 0 and "N" or "S"
+    hemisphere_lon = longitude >= 0 and "E" or "W"
+
+    fmt = "%(degrees)d%(deg)s %(minutes).3f"
+    lat = geopy.format.format_degrees(abs(latitude), fmt, geopy.format.UNICODE_SYMBOLS)
+    lon = geopy.format.format_degrees(abs(longitude), fmt, geopy.format.UNICODE_SYMBOLS)
+
+    return "{} {}, {} {}".format(hemisphere_lat, lat, hemisphere_lon, lon)
 
 
 class Area:
@@ -185,12 +448,14 @@ class Polygon(Area):
         y = mean([p.longitude for p in self.points])
         return Point(x, y)
 
-    def to_tiles(self, gc, zoom=None):
+    def to_tiles(self, gc, zoom=None, *, exact=False):
         """Return list of tiles covering this area.
 
         :param .Geocaching gc: Reference to :class:`.Geocaching` instance (passed to tiles).
         :param int zoom: Desired zoom level. If :code:`None`, the `zoom` is computed so that tile
             width is smallest possible, but greater than area width.
+        :param bool exact: Whether to return only the tiles intersecting the area (see
+            :meth:`tile_cover`) instead of all tiles in its bounding box.
         """
         corners = self.bounding_box.corners
 
@@ -199,6 +464,11 @@ class Polygon(Area):
             d_lon = corners[1].longitude - corners[0].longitude
             zoom = math.floor(math.log2(360 / d_lon))
 
+        if exact:
+            for x, y, z in self.tile_cover(zoom):
+                yield Tile(gc, x, y, z)
+            return
+
         # get corner tiles
         nw_tile = corners[0].to_tile(gc, zoom)
         se_tile = corners[1].to_tile(gc, zoom)
@@ -213,6 +483,42 @@ class Polygon(Area):
         for x, y in itertools.product(range(x1, x2 + 1), range(y1, y2 + 1)):
             yield Tile(gc, x, y, zoom)
 
+    def tile_cover(self, zooms):
+        """Return coordinates of map tiles intersecting this area.
+
+        Only the tiles crossed by the area edges or lying inside the area are returned, not all tiles
+        in its bounding box. The edges are considered straight lines on the map (in Web Mercator
+        projection).
+
+        :param zooms: Zoom level or an iterable of zoom levels.
+        :return: A generator of :code:`(x, y, z)` tuples, ordered by zoom level, row and column.
+        """
+        if isinstance(zooms, int):
+            zooms = [zooms]
+
+        lats = [p.latitude for p in self.points]
+        lons = [p.longitude for p in self.points]
+        for zoom in zooms:
+            rows = _polygon_tile_rows(*_to_tile_space(lats, lons, zoom), zoom)
+            for y in sorted(rows):
+                for first, last in rows[y]:
+                    for x in range(first, last + 1):
+                        yield x, y, zoom
+
+    def load_tiles(self, gc, zoom=None, *, exact=False, workers=None):
+        """Load tiles covering this area concurrently.
+
+        The downloads are planned by :attr:`.Geocaching.tile_scheduler`, see
+        :meth:`.TileScheduler.load_tiles`.
+
+        :param .Geocaching gc: Reference to :class:`.Geocaching` instance (passed to tiles).
+        :param int zoom: Desired zoom level, see :meth:`to_tiles`.
+        :param bool exact: Whether to load only the tiles intersecting the area, see :meth:`to_tiles`.
+        :param int workers: Number of worker threads. Defaults to the scheduler setting.
+        :return: A generator of :class:`.TileLoadResult`.
+        """
+        return gc.tile_scheduler.load_tiles(self.to_tiles(gc, zoom, exact=exact), workers=workers)
+
 
 class Rectangle(Polygon):
     """Upright rectangle.
@@ -297,53 +603,18 @@ class Tile(object):
         """Return loaded :class:`.Block`s for this tile."""
         return self._blocks.values()
 
-    def _download_utfgrid(self, *, get_png=False):
+    def _download_utfgrid(self, *, get_png=None):
         """Load UTFGrid tile from geocaching.com.
 
-        It appears to be mandatory to first download map tile (.png file) and only then UTFGrid.
-        However, this is not enforced all the time. There is probably some time limit from previous
-        loading of the same tile and also a general traffic regulator involved. Try first to
-        download grid and if it does not work, get .png and then try it again.
+        The download is planned by :attr:`.Geocaching.tile_scheduler`, see :meth:`.TileScheduler.fetch`.
 
-        :param bool get_png: Whether to download .png first.
-        :return: JSON with raw tile data.
+        :param bool get_png: Whether to download .png first. If :code:`None`, the scheduler decides.
+        :return: JSON with raw tile data or :code:`None` if the tile is empty.
         :rtype: :class:`dict`
         """
-        # TODO: It might be useful to store time when tile is last downloaded and act based on that.
-        # Logging some statistics (time when tile is loaded + received status code + content length
-        # + time spent on request) might help in algorithm design and evaluating if additional
-        # traffic from .png loading is tolerable and if this should be done all the time.
-        # Requesting for UTFgrid and waiting for 204 response takes also its time.
-
-        logging.debug("Downloading UTFGrid for {}".format(self))
-
-        params = {"x": self.x, "y": self.y, "z": self.z}
-
-        if get_png:
-            logging.debug("Getting .png file")
-            self.geocaching._request(self._urls["tile"], params=params, expect="raw")
-
-        logging.debug("Getting UTFGrid")
-        res = self.geocaching._request(self._urls["grid"], params=params, expect="raw")
-
-        if res.status_code == 204:
-            if get_png:
-                logging.debug("There is really no content! Returning 0 caches.")
-                return
-            logging.debug("Cannot load UTFgrid: no content. Trying to load .png tile first")
-            return self._download_utfgrid(get_png=True)
-
-        if res.status_code == 200:
-            try:
-                return res.json()
-            except ValueError as e:
-                # this happened during testing, don't know why
-                if get_png:
-                    raise Error("Cannot load UTFgrid.") from e
-                else:
-                    logging.debug("JSON parsing failed, trying .png first")
-                    return self._download_utfgrid(get_png=True)
+        return self.geocaching.tile_scheduler.fetch(self, get_png=get_png)
 
+    @measured("tile.load")
     def load(self):
         """Load :class:`.Block`s for this tile.
 
@@ -359,40 +630,30 @@ class Tile(object):
         the cache is not cut out from edges.
         """
 
-        utfgrid = self._download_utfgrid()
+        with measure(self.geocaching, "tile.load.fetch", self):
+            utfgrid = self._download_utfgrid()
 
         if not utfgrid:
             self._blocks = {}
             logging.debug("No block loaded to {}".format(self))
             return
 
-        size = len(utfgrid["grid"])
-        assert len(utfgrid["grid"][1]) == size, "UTFGrid is not square"
-        if size != self.size:
-            logging.warning("UTFGrid has unexpected size.")
-            self.size = size
-
-        self._blocks = {}  # format: { waypoint: <Block> }
+        # imports are here to avoid circular import of the parsers
+        from pycaching.parsers import parse_utfgrid
 
-        # for all non-empty in coords
-        for coordinate_key in utfgrid["data"]:
-            cache_list = utfgrid["data"][coordinate_key]
-            x, y = (int(i) for i in coordinate_key.strip(" ()").split(","))
-            point = UTFGridPoint(x, y)
-
-            # store all caches for this coords to dictionary
-            for cache in cache_list:
-                waypoint, name = cache["i"], cache["n"]
-
-                # if block doesn't exist yet, store it to dict
-                if waypoint not in self._blocks:
-                    self._blocks[waypoint] = Block(self, waypoint, name)
+        utfgrid = parse_utfgrid(utfgrid)
+        if utfgrid["size"] != self.size:
+            logging.warning("UTFGrid has unexpected size.")
+            self.size = utfgrid["size"]
 
-                # extend block points
-                self._blocks[waypoint].add(point)
+        # format: { waypoint: <Block> }
+        self._blocks = {
+            waypoint: Block._from_arrays(self, waypoint, name, xs, ys)
+            for waypoint, (name, xs, ys) in utfgrid["caches"].items()
+        }
 
         # try to determine grid coordinate block size
-        Block.determine_block_size()
+        Block.determine_block_size(self._blocks.values())
 
         logging.debug("Loaded {} blocks to {}".format(len(self._blocks), self))
 
@@ -418,6 +679,194 @@ class Tile(object):
         return "<object Tile, id {}, coords ({}, {}, {})>".format(id(self), self.x, self.y, self.z)
 
 
+_utfgrid_key_number = re.compile(r"-?\d+")
+
+
+def _decode_utfgrid_data(data):
+    """Group points of UTFGrid :code:`data` by the caches placed on them.
+
+    All coordinate keys are parsed at once and the points are collected to compact arrays.
+
+    :param dict data: Mapping of :code:`"(x, y)"` keys to lists of :code:`{"i": waypoint, "n": name}`.
+    :return: Dictionary :code:`{waypoint: (name, xs, ys)}`, where :code:`xs` and :code:`ys` are
+        :class:`array.array` of point coordinates.
+    :raise .Error: If the keys cannot be parsed.
+    """
+    numbers = _utfgrid_key_number.findall(" ".join(data))
+    if len(numbers) != 2 * len(data):
+        raise Error("Cannot parse UTFGrid coordinate keys.")
+    coordinates = array("i", map(int, numbers))
+
+    caches = {}  # format: { waypoint: (name, xs, ys) }
+    for x, y, cache_list in zip(coordinates[0::2], coordinates[1::2], data.values()):
+        for cache in cache_list:
+            entry = caches.get(cache["i"])
+            if entry is None:
+                entry = caches[cache["i"]] = cache["n"], array("i"), array("i")
+            xs, ys = entry[1], entry[2]
+            if xs and xs[-1] == x and ys[-1] == y:
+                continue  # the same cache listed twice for one point
+            xs.append(x)
+            ys.append(y)
+    return caches
+
+
+TileLoadResult = namedtuple("TileLoadResult", "tile error")
+"""Outcome of loading one tile by :meth:`.TileScheduler.load_tiles`.
+
+Contains the :class:`.Tile` and an exception which interrupted its loading (or :code:`None`).
+"""
+
+
+class TileScheduler(object):
+    """Planner of UTFGrid tile downloads.
+
+    It appears to be mandatory to first download map tile (.png file) and only then UTFGrid.
+    However, this is not enforced all the time. There is probably some time limit from previous
+    loading of the same tile and also a general traffic regulator involved.
+
+    The scheduler remembers when each tile was last downloaded and whether it needed the .png file,
+    so the extra round trip is done only when it is expected to be necessary:
+
+    * A tile downloaded in last :attr:`primer_ttl` seconds is requested without the .png file.
+    * A tile which needed the .png file last time gets it before the UTFGrid right away, instead of
+      waiting for a "204 No Content" response first.
+    * An unknown tile gets the .png file first if most of the tiles needed it so far.
+
+    If the guess is wrong and UTFGrid is not served, the .png file is downloaded and the request is
+    repeated. The scheduler is thread-safe and usually accessed by :attr:`.Geocaching.tile_scheduler`.
+
+    The memory usage is bounded: download times are forgotten after :attr:`primer_ttl` and only
+    :attr:`max_tiles` least recently used tiles are remembered to need the .png file or not.
+    """
+
+    def __init__(self, geocaching, *, primer_ttl=600, workers=8, max_tiles=10000):
+        """Create a scheduler.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance, used for downloading.
+        :param float primer_ttl: Number of seconds after a successful download of a tile, during which
+            the .png file is considered not necessary for it.
+        :param int workers: Default number of worker threads used by :meth:`load_tiles`.
+        :param int max_tiles: Maximum number of tiles remembered to need the .png file or not.
+        """
+        self.geocaching = geocaching
+        self.primer_ttl = primer_ttl
+        self.workers = workers
+        self.max_tiles = max_tiles
+        self._lock = threading.Lock()
+        self._last_fetch = OrderedDict()  # format: { (x, y, z): time.monotonic() value }, oldest first
+        self._needs_png = OrderedDict()  # format: { (x, y, z): bool }, least recently used first
+        self._png_count = 0  # number of tiles in self._needs_png which need the .png file
+
+    def needs_png(self, tile):
+        """Return whether the .png file should be downloaded before UTFGrid of a tile.
+
+        :param .Tile tile: Map tile.
+        :rtype: :class:`bool`
+        """
+        key = tile.x, tile.y, tile.z
+        with self._lock:
+            last_fetch = self._last_fetch.get(key)
+            if last_fetch is not None and time.monotonic() - last_fetch < self.primer_ttl:
+                return False
+            if key in self._needs_png:
+                self._needs_png.move_to_end(key)
+                return self._needs_png[key]
+            return self._png_count > len(self._needs_png) - self._png_count
+
+    def _remember(self, tile, needs_png=None):
+        key = tile.x, tile.y, tile.z
+        now = time.monotonic()
+        with self._lock:
+            # download times are ordered, so the expired ones are at the beginning
+            while self._last_fetch and now - next(iter(self._last_fetch.values())) >= self.primer_ttl:
+                self._last_fetch.popitem(last=False)
+            self._last_fetch.pop(key, None)
+            self._last_fetch[key] = now
+
+            if needs_png is not None:
+                self._png_count += needs_png - self._needs_png.pop(key, False)
+                self._needs_png[key] = needs_png
+                while len(self._needs_png) > self.max_tiles:
+                    self._png_count -= self._needs_png.popitem(last=False)[1]
+
+    def _download_png(self, tile):
+        logging.debug("Getting .png file for {}".format(tile))
+        params = {"x": tile.x, "y": tile.y, "z": tile.z}
+        self.geocaching._request(Tile._urls["tile"], params=params, expect="raw")
+
+    def _download_grid(self, tile):
+        """Return UTFGrid JSON, :code:`None` for "204 No Content" response.
+
+        :raise ValueError: If the response is not a valid JSON.
+        """
+        logging.debug("Getting UTFGrid for {}".format(tile))
+        params = {"x": tile.x, "y": tile.y, "z": tile.z}
+        res = self.geocaching._request(Tile._urls["grid"], params=params, expect="raw")
+        if res.status_code == 204:
+            return None
+        return res.json()
+
+    def fetch(self, tile, *, get_png=None):
+        """Download UTFGrid of a tile.
+
+        :param .Tile tile: Map tile.
+        :param bool get_png: Whether to download .png first. If :code:`None`, use :meth:`needs_png`.
+        :return: JSON with raw tile data or :code:`None` if the tile is empty.
+        :rtype: :class:`dict`
+        """
+        if get_png is None:
+            get_png = self.needs_png(tile)
+
+        if get_png:
+            self._download_png(tile)
+        else:
+            try:
+                utfgrid = self._download_grid(tile)
+            except ValueError:
+                # this happened during testing, don't know why
+                logging.debug("JSON parsing failed, trying .png first")
+                utfgrid = None
+            else:
+                if utfgrid is None:
+                    logging.debug("Cannot load UTFgrid: no content. Trying to load .png tile first")
+
+            if utfgrid is not None:
+                self._remember(tile, needs_png=False)
+                return utfgrid
+
+            self._remember(tile, needs_png=True)
+            self._download_png(tile)
+
+        try:
+            utfgrid = self._download_grid(tile)
+        except ValueError as e:
+            raise Error("Cannot load UTFgrid.") from e
+
+        if utfgrid is None:
+            logging.debug("There is really no content! Returning 0 caches.")
+        self._remember(tile)
+        return utfgrid
+
+    def load_tiles(self, tiles, *, workers=None):
+        """Load many tiles concurrently.
+
+        Tiles with the same coordinates are loaded only once. A failure of one tile doesn't interrupt
+        the others - it is reported in the result instead.
+
+        :param tiles: An iterable of :class:`.Tile` objects, eg. from :meth:`.Polygon.to_tiles`.
+        :param int workers: Number of worker threads. Defaults to :attr:`workers`.
+        :return: A generator of :class:`.TileLoadResult` in the same order as :code:`tiles`.
+        """
+        unique = {}
+        for tile in tiles:
+            unique.setdefault((tile.x, tile.y, tile.z), tile)
+
+        results = self.geocaching._load_concurrently(unique.values(), Tile.load, workers=workers or self.workers)
+        for tile, _, error in results:
+            yield TileLoadResult(tile, error)
+
+
 UTFGridPoint = namedtuple("UTFGridPoint", "x y")
 """Point inside a :class:`.Tile`.
 
@@ -426,23 +875,27 @@ Represents Xth row and Yth column in UTFGrid tile from NW corner.
 
 
 class Block(object):
-    """Container for grouped :class:`.UTFGridPoint`s inside a tile."""
+    """Container for grouped :class:`.UTFGridPoint`s inside a tile.
 
-    # this class can have a lot of instances so use __slots__
-    __slots__ = "tile", "cache_wp", "cache_name", "_points", "_xlim", "_ylim", "__weakref__"
+    The points are stored as compact arrays of their coordinates, because the blocks are created
+    in bulk for every loaded tile.
+    """
 
-    instances = []
+    # this class can have a lot of instances so use __slots__
+    __slots__ = "tile", "cache_wp", "cache_name", "_xs", "_ys", "_xlim", "_ylim"
 
     # Assume that block points form a N*N matrix in the UTFGrid, or a part of it.
     # If N cannot be determined automatically, use this fallback value.
     size = 3
 
+    # running statistic of all blocks passed to determine_block_size()
+    _size_count = 0
+    _size_total = 0.0
+    _size_lock = threading.Lock()
+
     def __init__(self, tile=None, wp=None, name=None):
         """Initialize an empty :class:`.Block`.
 
-        Also add the new instance to class-level list of all instances, used for computing the
-        block size.
-
         :param .Tile tile: Base map tile.
         :param str wp: Waypoint of :class:`.Cache` represented by this block.
         :param str wp: Human readable name of :class:`.Cache` represented by this block.
@@ -451,35 +904,65 @@ class Block(object):
         self.cache_wp = wp
         self.cache_name = name
         self.points = []  # will trigger setting of other initial values
-        self.__class__.instances.append(weakref.ref(self))
 
     @classmethod
-    def determine_block_size(cls):
-        """Update the class-level block size from the data of all instances."""
+    def _from_arrays(cls, tile, wp, name, xs, ys):
+        """Return a new :class:`.Block` with given point coordinates.
+
+        :param array.array xs: X coordinates of unique points.
+        :param array.array ys: Y coordinates of the same points.
+        """
+        block = cls(tile, wp, name)
+        block._xs, block._ys = xs, ys
+        block._xlim = min(xs), max(xs)
+        block._ylim = min(ys), max(ys)
+        return block
+
+    @classmethod
+    def determine_block_size(cls, blocks=()):
+        """Update the class-level block size with the data of new blocks and return it.
 
-        # remove invalid instances
-        cls.instances = list(filter(lambda i: i(), cls.instances))
+        The size is estimated as a running average of all blocks passed to this method so far, so
+        each call costs only as much as the number of passed blocks. It is thread-safe.
 
-        if len(cls.instances) < 20:
-            logging.warning("Trying to determine block size with small number of blocks.")
+        :param blocks: An iterable of newly loaded :class:`.Block` objects, eg. from one tile. When
+            omitted (as in older versions, which took no arguments), the current estimate is returned
+            without changes.
+        :rtype: :class:`int`
+        """
+        sizes = [math.sqrt(len(block._xs)) for block in blocks]
+        if not sizes:
+            return cls.size
+
+        with cls._size_lock:
+            cls._size_count += len(sizes)
+            cls._size_total += sum(sizes)
+            count, avg_block_size = cls._size_count, round(cls._size_total / cls._size_count)
+
+            if count < 20:
+                logging.warning("Trying to determine block size with small number of blocks.")
 
-        avg_block_size = round(mean((math.sqrt(len(i().points)) for i in cls.instances)))
-        if cls.size != avg_block_size:
-            logging.warning("UTFGrid coordinate block has unexpected size.")
-            cls.size = avg_block_size
+            if cls.size != avg_block_size:
+                logging.warning("UTFGrid coordinate block has unexpected size.")
+                cls.size = avg_block_size
+            return cls.size
 
     @property
     def points(self):
         """Individual points in grid block.
 
+        The points are stored as arrays of coordinates, so an immutable snapshot is returned. Use
+        :meth:`add` or :meth:`update` to modify the block.
+
         :setter: Set new points and internally update X, Y limits.
-        :type: :class:`set`
+        :type: :class:`frozenset`
         """
-        return self._points
+        return frozenset(map(UTFGridPoint, self._xs, self._ys))
 
     @points.setter
     def points(self, values):
-        self._points = set()
+        self._xs = array("i")
+        self._ys = array("i")
         self._xlim = float("inf"), float("-inf")
         self._ylim = float("inf"), float("-inf")
         self.update(values)
@@ -489,17 +972,23 @@ class Block(object):
 
         :param .UTFGridPoint point: Point to add.
         """
-        point = UTFGridPoint(*point)
-        self._points.add(point)
-        self._update_limits(point)
+        self.update((point,))
 
     def update(self, points):
-        """Union poins in current block with given points.
+        """Union points in current block with given points.
 
-        :param list point: List of :class:`.UTFGridPoint`s to union with existing block points.
+        :param points: Iterable of :class:`.UTFGridPoint`s to union with existing block points.
         """
-        for point in set(points):
-            self.add(point)
+        # a set of present points is built once per call, so adding N points costs O(N)
+        present = set(zip(self._xs, self._ys))
+        for point in points:
+            point = UTFGridPoint(*point)
+            if point in present:
+                continue
+            present.add(point)
+            self._xs.append(point.x)
+            self._ys.append(point.y)
+            self._update_limits(point)
 
     def _update_limits(self, point):
         """Update limits used for determining block middle point.
@@ -530,11 +1019,14 @@ class Block(object):
         :raise .BadBlockError: If block is not entirely filled with points or larger than expeced.
         """
 
-        # check for missing points in rectangle
-        for x in range(self._xlim[0], self._xlim[1] + 1):
-            for y in range(self._ylim[0], self._ylim[1] + 1):
-                if UTFGridPoint(x, y) not in self.points:
-                    raise BadBlockError("Block is not entirely filled (some points are missing).")
+        if not self._xs:
+            raise BadBlockError("Block is empty.")
+
+        # the points are unique, so the rectangle is filled if their count equals to its area
+        width = self._xlim[1] - self._xlim[0] + 1
+        height = self._ylim[1] - self._ylim[0] + 1
+        if len(self._xs) != width * height:
+            raise BadBlockError("Block is not entirely filled (some points are missing).")
 
         # check block size in both axes
         for lim in [self._xlim, self._ylim]:
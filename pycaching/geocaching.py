@@ -2,25 +2,38 @@
 
 import datetime
 import enum
+import hashlib
 import json
 import logging
 import re
 import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from os import path
 from typing import Generator, Optional, Union
 from urllib.parse import urljoin
 
-import bs4
 import requests
-from bs4.element import Script  # Direct import as `bs4.Script` requires version >= 4.9.1.
 
 from pycaching.cache import Cache
-from pycaching.errors import Error, LoginFailedException, NotLoggedInException, PMOnlyException, TooManyRequestsError
-from pycaching.geo import Point, Rectangle
+from pycaching.errors import (
+    Error,
+    GeocodeError,
+    LoginFailedException,
+    NotLoggedInException,
+    PMOnlyException,
+    TooManyRequestsError,
+)
+from pycaching.geo import Point, Rectangle, TileScheduler
+from pycaching.geocode import GeocodeCache
+from pycaching.instrumentation import RequestEvent, emit, measure
 from pycaching.log import Log
 from pycaching.log import Type as LogType
+from pycaching.retry import RetryPolicy
 from pycaching.trackable import Trackable
-from pycaching.util import deprecated
+from pycaching.util import deprecated, process_pool, synchronized
 
 
 class SortOrder(enum.Enum):
@@ -39,11 +52,61 @@ class SortOrder(enum.Enum):
     terrain = "terrain"
 
 
+TrackableLoadResult = namedtuple("TrackableLoadResult", "tid trackable kml error")
+"""Outcome of loading one trackable by :meth:`.Geocaching.load_trackables`.
+
+Contains the requested trackable ID, loaded :class:`.Trackable` (or :code:`None`), its KML route
+(if requested and loaded) and an exception which interrupted the loading (or :code:`None`).
+"""
+
+CacheLoadResult = namedtuple("CacheLoadResult", "cache error")
+"""Outcome of loading one cache by :meth:`.Geocaching.load_caches`.
+
+Contains the :class:`.Cache` and an exception which interrupted its loading (or :code:`None`).
+"""
+
+Validators = namedtuple("Validators", "etag last_modified content_hash", defaults=(None, None, None))
+"""Validators of a previously loaded page, used for conditional requests by :meth:`.Geocaching._request`.
+
+Contains values of :code:`ETag` and :code:`Last-Modified` response headers and a SHA-1 hash of the
+response body. Any of them can be :code:`None`.
+"""
+
+
+class _NotModified(object):
+    def __repr__(self):
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = _NotModified()
+"""Returned by a conditional :meth:`.Geocaching._request` if the page has not changed."""
+
+GeocodeResult = namedtuple("GeocodeResult", "location point error")
+"""Outcome of geocoding one location by :meth:`.Geocaching.geocode_many`.
+
+Contains the location, a :class:`.Point` (or :code:`None`) and an exception raised by geocoding
+(or :code:`None`).
+"""
+
+MyLogRecord = namedtuple("MyLogRecord", "wp type visited name")
+"""One row of the logged-in user's logs, as returned by :meth:`.Geocaching.my_log_records`.
+
+Contains the cache waypoint, :class:`.log.Type` of the log (or :code:`None` if unknown), the log date
+and the cache name.
+"""
+
+
 class Geocaching(object):
     """Provides some basic methods for communicating with geocaching.com website.
 
     Provides methods to login and search. There are also some shortcut methods in this class to make
     working with pycaching more convinient.
+
+    One logged in instance can be shared by multiple threads (eg. workers of a
+    :class:`concurrent.futures.ThreadPoolExecutor`) loading caches, searching and using the other
+    methods concurrently. Logging in and out is serialized, so concurrent calls of :meth:`login`
+    log in only once. However, objects created by this instance (:class:`.Cache`,
+    :class:`.Trackable`, ...) are not thread-safe, so don't load one object from multiple threads.
     """
 
     _baseurl = "https://www.geocaching.com"
@@ -55,13 +118,106 @@ class Geocaching(object):
         "api_search": "api/proxy/web/search/v2",
     }
     _credentials_file = ".gc_credentials"
-
-    def __init__(self, *, session=None):
+    # hosts which get their own connection pool
+    _pooled_hosts = (
+        "https://www.geocaching.com",
+        "https://tiles01.geocaching.com",
+        "http://tiles01.geocaching.com",
+    )
+
+    def __init__(
+        self,
+        *,
+        session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        max_retries=0,
+        timeout=30,
+        retry_policy=None,
+        instrumentation=(),
+        geocode_cache=None,
+    ):
+        """Initialize a Geocaching instance.
+
+        The connection pool options are used only for a session created by this instance, a passed
+        :code:`session` is used as is. Each host from :attr:`_pooled_hosts` gets its own pool, so
+        :code:`pool_maxsize` is effectively a per-host limit of open connections.
+
+        :param requests.Session session: Session to use instead of creating a new one.
+        :param int pool_connections: Number of connection pools to cache per host adapter.
+        :param int pool_maxsize: Maximum number of connections to keep open per host. Set it at least
+            to the number of worker threads sharing this instance.
+        :param bool pool_block: Whether to block and wait for a free connection if the pool is full
+            (instead of opening a new connection which is discarded afterwards).
+        :param max_retries: Connection level retries, either :class:`int` or :class:`urllib3.util.Retry`.
+        :param timeout: Default request timeout in seconds, either :class:`float` or :code:`(connect,
+            read)` tuple. Use :code:`None` to wait forever.
+        :param .RetryPolicy retry_policy: Policy for retrying transient request failures. If not set,
+            a default :class:`.RetryPolicy` is used. Use :code:`RetryPolicy(total=0)` to disable retries.
+        :param instrumentation: An iterable of :class:`.Instrumentation` objects receiving timing events.
+        :param .GeocodeCache geocode_cache: Cache of :meth:`geocode` results. If not set, a default
+            in-memory :class:`.GeocodeCache` is used. Use :code:`GeocodeCache(maxsize=0)` to disable caching.
+        """
         self._logged_in = False
         self._logged_username = None
-        self._session = session or requests.Session()
+        self._login_lock = threading.RLock()  # guards login state and the session cookies
+        self._pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "max_retries": max_retries,
+        }
+        self._timeout = timeout
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._geocode_cache = geocode_cache or GeocodeCache()
+        self._session = session or self.create_session()
+        self._inflight_requests = {}  # format: { URL: <Future> }
+        self._inflight_requests_lock = threading.Lock()
+        self._instrumentation = list(instrumentation)
+        self._tile_scheduler = None
+        self._tile_scheduler_lock = threading.Lock()
+
+    def add_instrumentation(self, instrumentation):
+        """Register an object receiving request and processing timing events.
+
+        :param .Instrumentation instrumentation: Object to register.
+        """
+        self._instrumentation.append(instrumentation)
 
-    def _request(self, url, *, expect="soup", method="GET", login_check=True, **kwargs):
+    @property
+    def tile_scheduler(self):
+        """Planner of UTFGrid tile downloads shared by all tiles of this instance, created on first use.
+
+        :type: :class:`.TileScheduler`
+        """
+        with self._tile_scheduler_lock:
+            if self._tile_scheduler is None:
+                self._tile_scheduler = TileScheduler(self)
+            return self._tile_scheduler
+
+    def _emit(self, method, *args):
+        """Pass an event to all registered instrumentation objects."""
+        emit(self._instrumentation, method, *args)
+
+    def create_session(self):
+        """Return a new session configured with connection pools of this instance.
+
+        Sessions are not guaranteed to be thread-safe. Use this method to create a separate session
+        for each worker of a process pool or similar. Cookies (and therefore a login) of the current
+        session are copied to the new one.
+
+        :rtype: :class:`requests.Session`
+        """
+        session = requests.Session()
+        for prefix in self._pooled_hosts:
+            session.mount(prefix, requests.adapters.HTTPAdapter(**self._pool_options))
+        if hasattr(self, "_session"):
+            session.headers.update(self._session.headers)
+            session.cookies.update(self._session.cookies)
+        return session
+
+    def _request(self, url, *, expect="soup", method="GET", login_check=True, validators=None, **kwargs):
         """
         Do a HTTP request and return a response based on expect param.
 
@@ -69,6 +225,12 @@ class Geocaching(object):
         :param str method: HTTP method to use.
         :param str expect: Expected type of data (either :code:`soup`, :code:`json` or :code:`raw`).
         :param bool login_check: Whether to check if user is logged in or not.
+        :param .Validators validators: Validators of a previously loaded version of the page. If set,
+            the request is conditional (using :code:`If-None-Match` and :code:`If-Modified-Since`
+            headers) and a tuple :code:`(result, validators)` is returned. The result is
+            :data:`.NOT_MODIFIED` if the server answers "304 Not Modified" or the response body has
+            the same hash as before, so it is not parsed. The returned validators describe the
+            received page.
         :param kwargs: Passed to `requests.request
             <http://docs.python-requests.org/en/latest/api/#requests.request>`_ as is.
         """
@@ -77,27 +239,152 @@ class Geocaching(object):
             raise NotLoggedInException("Login is needed.")
 
         url = url if "//" in url else urljoin(self._baseurl, url)
+        timeout = kwargs.pop("timeout", self._timeout)
+
+        if validators is not None and (validators.etag or validators.last_modified):
+            # the headers also disable coalescing, as the requests are not identical anymore
+            headers = kwargs["headers"] = dict(kwargs.get("headers") or {})
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
 
         try:
-            res = self._session.request(method, url, **kwargs)
+            if method == "GET" and set(kwargs) <= {"params"}:
+                res = self._coalesced_get(url, kwargs.get("params"), timeout=timeout)
+            else:
+                res = self._send(method, url, timeout=timeout, **kwargs)
             res.raise_for_status()
 
+            if validators is not None:
+                if res.status_code == 304:
+                    logging.debug("Not modified: {}".format(url))
+                    # the response may carry updated validators
+                    return NOT_MODIFIED, validators._replace(
+                        etag=res.headers.get("ETag") or validators.etag,
+                        last_modified=res.headers.get("Last-Modified") or validators.last_modified,
+                    )
+
+                received = Validators(
+                    res.headers.get("ETag"), res.headers.get("Last-Modified"), hashlib.sha1(res.content).hexdigest()
+                )
+                if received.content_hash == validators.content_hash:
+                    logging.debug("Not modified (same content): {}".format(url))
+                    return NOT_MODIFIED, received
+
             # return bs4.BeautifulSoup, JSON dict or raw requests.Response
-            if expect == "soup":
-                return bs4.BeautifulSoup(res.text, "html.parser")
-            elif expect == "json":
-                return res.json()
-            elif expect == "raw":
-                return res
+            result = None
+            with measure(self, "parse.{}".format(expect), url):
+                if expect == "soup":
+                    from bs4 import BeautifulSoup  # imported here to keep importing of pycaching fast
+
+                    result = BeautifulSoup(res.text, "html.parser")
+                elif expect == "json":
+                    result = res.json()
+                elif expect == "raw":
+                    result = res
+
+            return result if validators is None else (result, received)
 
         except requests.exceptions.RequestException as e:
-            if e.response.status_code == 429:  # Handle rate limiting errors
-                raise TooManyRequestsError(
-                    url, rate_limit_reset=int(e.response.headers.get("x-rate-limit-reset", "0"))
-                ) from e
+            # there is no response at all in case of connection errors
+            if e.response is not None and e.response.status_code == 429:  # Handle rate limiting errors
+                rate_limit_reset = int(e.response.headers.get("x-rate-limit-reset", "0"))
+                self._emit("on_rate_limit", url, rate_limit_reset)
+                raise TooManyRequestsError(url, rate_limit_reset=rate_limit_reset) from e
 
             raise Error("Cannot load page: {}".format(url)) from e
 
+    def _send(self, method, url, **kwargs):
+        """Send a HTTP request, retrying transient failures according to the retry policy.
+
+        :param str method: HTTP method to use.
+        :param str url: Request target.
+        :param kwargs: Passed to `requests.request
+            <http://docs.python-requests.org/en/latest/api/#requests.request>`_ as is.
+        :return: Raw :class:`requests.Response` (possibly with an error status code).
+        """
+        attempt = 0
+        while True:
+            error = res = None
+            start = time.perf_counter()
+            try:
+                res = self._session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = e
+
+            attempt += 1
+            if self._instrumentation:
+                self._report_request(method, url, attempt, start, res, error, kwargs.get("stream", False))
+
+            delay = self._retry_policy.get_delay(method, url, attempt, error=error, response=res)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return res
+
+            self._retry_policy.notify(url, attempt, delay, error or res)
+            self._emit("on_retry", url, attempt, delay, error or res)
+            if res is not None:
+                # release the connection back to the pool, a streamed body would hold it otherwise
+                res.close()
+            self._retry_policy.sleep(delay)
+
+    def _report_request(self, method, url, attempt, start, res, error, stream):
+        """Emit a :class:`.RequestEvent` describing one finished request attempt."""
+        total_time = time.perf_counter() - start
+        if res is None:
+            event = RequestEvent(method, url, attempt, None, total_time, total_time, None, error)
+        else:
+            if stream:
+                # don't consume the streamed body
+                response_bytes = res.headers.get("Content-Length")
+                response_bytes = int(response_bytes) if response_bytes else None
+            else:
+                response_bytes = len(res.content)
+            time_to_headers = min(res.elapsed.total_seconds(), total_time)
+            event = RequestEvent(
+                method, url, attempt, res.status_code, time_to_headers, total_time, response_bytes, error
+            )
+        self._emit("on_request", event)
+
+    def _coalesced_get(self, url, params=None, *, timeout=None):
+        """Do a GET request, sharing one network call among all identical requests in flight.
+
+        If another thread is already requesting the same URL, wait for its response instead of doing
+        a new request. The response is shared, so it must be treated as read-only.
+
+        :param str url: Request target.
+        :param params: Passed to `requests.request
+            <http://docs.python-requests.org/en/latest/api/#requests.request>`_ as is.
+        :param timeout: Request timeout, passed to `requests.request` as is.
+        :return: Raw :class:`requests.Response`.
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+
+        with self._inflight_requests_lock:
+            future = self._inflight_requests.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight_requests[key] = Future()
+
+        if not is_leader:
+            logging.debug("Waiting for an identical request in flight: {}".format(key))
+            return future.result()
+
+        try:
+            res = self._send("GET", url, params=params, timeout=timeout)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self._inflight_requests_lock:
+                del self._inflight_requests[key]
+
+    @synchronized("_login_lock")
     def login(self, username=None, password=None):
         """Log in the user for this instance of Geocaching.
 
@@ -161,6 +448,7 @@ class Geocaching(object):
 
             raise LoginFailedException("Cannot login to the site (probably wrong username or password).")
 
+    @synchronized("_login_lock")
     def login_with_cookie(self, cookie, username=None, cookie_name="gspkauth"):
         """Log in by importing a Geocaching session cookie.
 
@@ -208,6 +496,49 @@ class Geocaching(object):
         :raise .KeyError: If "password" and "password_cmd" where found at the
             same time.
         """
+        cred = self._read_credentials_file()
+        if isinstance(cred, dict):
+            if username is None:
+                credentials = cred
+            else:
+                if "username" in cred and cred["username"] == username:
+                    credentials = cred
+                else:
+                    raise KeyError("User {} requested but not found in credential.".format(username))
+        elif isinstance(cred, list):
+            if username is None and len(cred) > 0:
+                credentials = cred[0]
+            else:
+                for c in cred:
+                    if "username" in c and c["username"] == username:
+                        credentials = c
+                        break
+                else:
+                    raise KeyError("User {} requested but not found in credentials.".format(username))
+        else:
+            raise KeyError("Credential data type is unexpected {}".format(type(cred)))
+
+        return self._parse_credentials(credentials)
+
+    def _load_all_credentials(self):
+        """Load all credentials from file.
+
+        :return: List of tuples of username and password loaded from file.
+        :raise .FileNotFoundError: If credentials file cannot be found.
+        :raise .KeyError: If some credentials are invalid, see :meth:`_load_credentials`.
+        """
+        cred = self._read_credentials_file()
+        if isinstance(cred, dict):
+            cred = [cred]
+        elif not isinstance(cred, list):
+            raise KeyError("Credential data type is unexpected {}".format(type(cred)))
+        return [self._parse_credentials(c) for c in cred]
+
+    def _read_credentials_file(self):
+        """Find credentials file in either current directory or user's home directory and load it as a JSON.
+
+        :raise .FileNotFoundError: If credentials file cannot be found.
+        """
         credentials_file = self._credentials_file
 
         # find the location of a file
@@ -222,38 +553,25 @@ class Geocaching(object):
 
         # load contents
         with open(credentials_file, "r") as f:
-            cred = json.load(f)
-            if isinstance(cred, dict):
-                if username is None:
-                    credentials = cred
-                else:
-                    if "username" in cred and cred["username"] == username:
-                        credentials = cred
-                    else:
-                        raise KeyError("User {} requested but not found in credential.".format(username))
-            elif isinstance(cred, list):
-                if username is None and len(cred) > 0:
-                    credentials = cred[0]
-                else:
-                    for c in cred:
-                        if "username" in c and c["username"] == username:
-                            credentials = c
-                            break
-                    else:
-                        raise KeyError("User {} requested but not found in credentials.".format(username))
-            else:
-                raise KeyError("Credential data type is unexpected {}".format(type(cred)))
-
-            if "password" in credentials and "password_cmd" in credentials:
-                raise KeyError('Ambiguous keys. Choose either "password" or "password_cmd".')
-            elif "password" in credentials:
-                return credentials["username"], credentials["password"]
-            elif "password_cmd" in credentials:
-                stdout = subprocess.check_output(credentials["password_cmd"], shell=True)
-                return credentials["username"], stdout.decode("utf-8").strip()
-            else:
-                raise KeyError("No password was key found. " 'Use either "password" or "password_cmd".')
+            return json.load(f)
+
+    @staticmethod
+    def _parse_credentials(credentials):
+        """Return username and password from one credentials record.
+
+        :param dict credentials: Record with "username" and either "password" or "password_cmd".
+        """
+        if "password" in credentials and "password_cmd" in credentials:
+            raise KeyError('Ambiguous keys. Choose either "password" or "password_cmd".')
+        elif "password" in credentials:
+            return credentials["username"], credentials["password"]
+        elif "password_cmd" in credentials:
+            stdout = subprocess.check_output(credentials["password_cmd"], shell=True)
+            return credentials["username"], stdout.decode("utf-8").strip()
+        else:
+            raise KeyError("No password was key found. " 'Use either "password" or "password_cmd".')
 
+    @synchronized("_login_lock")
     def logout(self):
         """Log out the user for this instance."""
         logging.info("Logging out.")
@@ -271,6 +589,8 @@ class Geocaching(object):
         login_page = login_page or self._request(self._urls["login_page"], login_check=False)
         assert hasattr(login_page, "find_all") and callable(login_page.find_all)
 
+        from bs4.element import Script  # Direct import as `bs4.Script` requires version >= 4.9.1.
+
         logging.debug("Checking for already logged user.")
         js_content = "\n".join(login_page.find_all(string=lambda i: isinstance(i, Script)))
         m = re.search(r'"username"\s*:\s*"([^"]+)"', js_content)
@@ -446,10 +766,58 @@ class Geocaching(object):
     def geocode(self, location):
         """Return a :class:`.Point` object from geocoded location.
 
+        The results (including failures) are cached by the :class:`.GeocodeCache` of this instance.
+
         :param str location: Location to geocode.
+        :raise .GeocodeError: If location cannot be geocoded (not found).
         """
         return Point.from_location(self, location)
 
+    def _geocode(self, location):
+        """Return latitude and longitude of a geocoded location, using the geocode cache.
+
+        :param str location: Location to geocode.
+        :raise .GeocodeError: If location cannot be geocoded (not found).
+        """
+        result = self._geocode_cache.get(location)
+        if result is None:
+            res = self._request("api/geocode", params={"q": location}, expect="json")
+            if res["status"] == "success":
+                result = float(res["data"]["lat"]), float(res["data"]["lng"]), None
+            else:
+                result = None, None, res["msg"]
+            self._geocode_cache.set(location, *result[:2], error=result[2])
+
+        latitude, longitude, error = result
+        if error is not None:
+            raise GeocodeError(error)
+        return latitude, longitude
+
+    def geocode_many(self, locations, *, workers=8):
+        """Geocode many locations concurrently.
+
+        Each unique location (after normalization by :meth:`.GeocodeCache.normalize`) is geocoded
+        only once.
+
+        :param locations: An iterable of locations to geocode.
+        :param int workers: Number of worker threads.
+        :return: A list of :class:`.GeocodeResult` in the same order as :code:`locations`.
+        """
+        locations = list(locations)
+        unique = {}  # format: { normalized location: location }
+        for location in locations:
+            unique.setdefault(self._geocode_cache.normalize(location), location)
+
+        results = {}  # format: { normalized location: (coordinates, error) }
+        for location, coordinates, error in self._load_concurrently(unique.values(), self._geocode, workers=workers):
+            results[self._geocode_cache.normalize(location)] = coordinates, error
+
+        geocoded = []
+        for location in locations:
+            coordinates, error = results[self._geocode_cache.normalize(location)]
+            geocoded.append(GeocodeResult(location, Point(*coordinates) if coordinates else None, error))
+        return geocoded
+
     def get_cache(self, wp=None, guid=None):
         """Return a :class:`.Cache` object by its waypoint or GUID.
 
@@ -472,6 +840,53 @@ class Geocaching(object):
         """
         return Trackable(self, tid)
 
+    def load_trackables(self, tids, *, workers=8, kml=False):
+        """Load many trackables concurrently.
+
+        Trackable details (and optionally their KML routes) are loaded using a pool of worker threads.
+        A failure of one trackable doesn't interrupt the others - it is reported in the result instead.
+
+        :param tids: An iterable of trackable IDs.
+        :param int workers: Number of worker threads.
+        :param bool kml: Whether to load also the KML route of each trackable.
+        :return: A generator of :class:`.TrackableLoadResult` in the same order as :code:`tids`.
+        """
+
+        def load(tid):
+            trackable = self.get_trackable(tid)
+            trackable.load()
+            return trackable, trackable.get_KML() if kml else None
+
+        for tid, result, error in self._load_concurrently(tids, load, workers=workers):
+            trackable, kml_data = result or (None, None)
+            yield TrackableLoadResult(tid, trackable, kml_data, error)
+
+    def _load_concurrently(self, items, load, *, workers):
+        """Call :code:`load` for each item using a pool of worker threads.
+
+        :param items: An iterable of items to be passed to :code:`load`.
+        :param callable load: A function doing the loading.
+        :param int workers: Number of worker threads.
+        :return: A generator of :code:`(item, result, error)` tuples in the same order as :code:`items`.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(load, item) for item in items]
+            try:
+                for item, future in zip(items, futures):
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:  # report any failure per item, don't interrupt the others
+                        logging.debug("Loading of {} failed: {!r}".format(item, e))
+                        yield item, None, e
+            finally:
+                # don't wait for the rest if the consumer stopped iterating
+                for future in futures:
+                    future.cancel()
+
     def post_log(self, wp, text, type=LogType.found_it, date=None):
         """Post a log for cache.
 
@@ -507,6 +922,26 @@ class Geocaching(object):
     def my_logs(self, log_type=None, limit=float("inf")):
         """Get an iterable of the logged-in user's logs.
 
+        Yield :class:`.Cache` objects with the name and :attr:`~.Cache.visited` date already filled in
+        from the logs table. Other properties are lazy loaded as usual - use :meth:`load_caches` to
+        load them for many caches at once.
+
+        :param log_type: The log type to search for. Use a :class:`~.log.Type` value.
+            If set to ``None``, all logs will be returned (default: ``None``).
+        :param limit: The maximum number of results to return (default: infinity).
+        """
+        for record in self.my_log_records(log_type, limit):
+            if record.name is None:  # leave the name to be lazy loaded
+                yield Cache(self, record.wp, visited=record.visited)
+            else:
+                yield Cache(self, record.wp, name=record.name, visited=record.visited)
+
+    def my_log_records(self, log_type=None, limit=float("inf")):
+        """Get an iterable of the logged-in user's log records.
+
+        Walk through all pages of the logs table and yield :class:`.MyLogRecord` parsed from the table
+        itself, without loading any cache details.
+
         :param log_type: The log type to search for. Use a :class:`~.log.Type` value.
             If set to ``None``, all logs will be returned (default: ``None``).
         :param limit: The maximum number of results to return (default: infinity).
@@ -517,28 +952,65 @@ class Geocaching(object):
             if isinstance(log_type, LogType):
                 log_type = log_type.value
             url += "?lt={lt}".format(lt=log_type)
-        cache_table = self._request(url).find(class_="Table")
-        if cache_table is None:  # no logs on the account
-            return
-        cache_table = cache_table.tbody
+
+        from pycaching.parsers import parse_my_logs
 
         yielded = 0
-        for row in cache_table.find_all("tr"):
-            if yielded >= limit:
-                break
+        page_number = 1
+        page = self._request(url)
+        while True:
+            data = parse_my_logs(page, page_number)
+            for record in data["records"]:
+                if yielded >= limit:
+                    return
+                type = LogType(record["type"]) if record["type"] is not None else None
+                yield MyLogRecord(record["wp"], type, datetime.date.fromisoformat(record["visited"]), record["name"])
+                yielded += 1
+
+            # ASP.NET pager - the next page is loaded by posting the page form back
+            if data["next_page"] is None:
+                return
+            hidden_inputs = data["hidden_inputs"]
+            hidden_inputs["__EVENTTARGET"], hidden_inputs["__EVENTARGUMENT"] = data["next_page"]
+            page = self._request(url, method="POST", data=hidden_inputs)
+            page_number += 1
+
+    def load_caches(self, caches, *, workers=8, processes=None):
+        """Load details of many caches concurrently.
+
+        Call :meth:`.Cache.load` for each cache using a pool of worker threads. A failure of one cache
+        doesn't interrupt the others - it is reported in the result instead.
+
+        Parsing of the pages is CPU heavy and worker threads can't do it in parallel. If
+        :code:`processes` is set, the threads only download the pages and the parsing is done by
+        :func:`.parsers.parse_cache_details` in a pool of processes, so all CPU cores can be used. The
+        parsed details are then filled in the caches in this process.
+
+        :param caches: An iterable of :class:`.Cache` objects, eg. from :meth:`my_logs`.
+        :param int workers: Number of worker threads.
+        :param int processes: Number of processes parsing the pages, or :code:`None` to parse them
+            in the worker threads.
+        :return: A generator of :class:`.CacheLoadResult` in the same order as :code:`caches`.
+        """
+        if not processes:
+            for cache, _, error in self._load_concurrently(caches, Cache.load, workers=workers):
+                yield CacheLoadResult(cache, error)
+            return
 
-            link = row.find(class_="ImageLink")["href"]
+        from pycaching.parsers import parse_cache_details
 
-            # This line extracts a GC code from the cache URL
-            # Example: https://www.geocaching.com/geocache/GC12345 -> GC12345
-            wp = link.split("/")[4]
+        with process_pool(processes) as pool:
 
-            current_cache = self.get_cache(wp)
-            date = row.find_all("td")[2].text.strip()
-            current_cache.visited = date
+            def load(cache):
+                with measure(self, "cache.load", cache):
+                    page, validators = cache._fetch_details()
+                    if page is not None:
+                        with measure(self, "cache.load.parse", cache):
+                            data = pool.submit(parse_cache_details, page).result()
+                        cache._apply_details(data, validators)
 
-            yield current_cache
-            yielded += 1
+            for cache, _, error in self._load_concurrently(caches, load, workers=workers):
+                yield CacheLoadResult(cache, error)
 
     def my_finds(self, limit=float("inf")):
         """Get an iterable of the logged-in user's finds.
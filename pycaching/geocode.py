@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class GeocodeCache(object):
+    """Memoizing cache of geocoding results used by :meth:`.Geocaching.geocode`.
+
+    Queries are normalized (whitespace collapsed, case folded), so :code:`"Prague"` and
+    :code:`" prague "` share one entry. Failed lookups are cached too, for a shorter time. Only the
+    coordinates are stored, so each lookup returns a fresh :class:`.Point`.
+
+    Recently used results are kept in memory. Optionally, all results are also stored in a persistent
+    backend, which can be any mapping of strings to tuples, eg. a :mod:`shelve`::
+
+        cache = GeocodeCache(backend=shelve.open("geocode.db"))
+        geocaching = Geocaching(geocode_cache=cache)
+
+    The cache is thread-safe, the backend is accessed under its lock.
+    """
+
+    def __init__(self, maxsize=1024, *, ttl=7 * 24 * 3600, negative_ttl=3600, backend=None):
+        """Create a geocode cache.
+
+        :param int maxsize: Maximum number of results kept in memory. Use :code:`0` together with no
+            :code:`backend` to disable caching.
+        :param float ttl: Number of seconds to keep successful results.
+        :param float negative_ttl: Number of seconds to keep failed lookups.
+        :param backend: Persistent mapping storing the results in addition to memory.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # format: { query: (latitude, longitude, error, expires_at) }
+
+    @staticmethod
+    def normalize(query):
+        """Return a normalized form of a query used as a cache key.
+
+        :param str query: Geocoded location.
+        """
+        return " ".join(query.split()).casefold()
+
+    def get(self, query):
+        """Return a cached result for a query or :code:`None` if it is not cached.
+
+        :param str query: Geocoded location.
+        :return: Tuple of :code:`(latitude, longitude, error)`, where :code:`error` is the message of
+            a failed lookup (and the coordinates are :code:`None`) or :code:`None` for a success.
+        """
+        key = self.normalize(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.backend is not None:
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._remember(key, entry)
+
+            if entry is None:
+                return None
+            if entry[3] <= now:
+                self._forget(key)
+                return None
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            return entry[:3]
+
+    def set(self, query, latitude=None, longitude=None, *, error=None):
+        """Store a result of a query.
+
+        :param str query: Geocoded location.
+        :param float latitude: Latitude of the location.
+        :param float longitude: Longitude of the location.
+        :param str error: Message of a failed lookup, instead of the coordinates.
+        """
+        key = self.normalize(query)
+        expires_at = time.time() + (self.negative_ttl if error is not None else self.ttl)
+        entry = latitude, longitude, error, expires_at
+        with self._lock:
+            self._remember(key, entry)
+            if self.backend is not None:
+                self.backend[key] = entry
+
+    def clear(self):
+        """Forget all results kept in memory and in the backend."""
+        with self._lock:
+            self._entries.clear()
+            if self.backend is not None:
+                self.backend.clear()
+
+    def _remember(self, key, entry):
+        if not self.maxsize:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _forget(self, key):
+        self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.pop(key, None)
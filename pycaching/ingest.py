@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+
+"""Parse archives of stored cache details pages at scale.
+
+Pages are read from directories, single files (:code:`.html` or :code:`.html.gz`), tarballs and
+WARC files (optionally gzipped), parsed by :func:`.parsers.parse_cache_details` in a pool of
+processes and written as JSON lines or to a SQLite database. Documents are streamed through a
+bounded window, so memory usage doesn't depend on the archive size.
+
+Usage::
+
+    python -m pycaching.ingest pages/ crawl.warc.gz -o caches.jsonl
+    python -m pycaching.ingest pages.tar.gz -o caches.sqlite --processes 16
+
+Each output record is a dictionary of cache fields (see :meth:`.Cache.to_dict`) with an
+additional :code:`source` key naming the document. Use :meth:`.Cache.from_dict` to create caches
+from them.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tarfile
+from collections import namedtuple
+
+from pycaching import errors
+from pycaching.util import process_pool
+
+IngestStats = namedtuple("IngestStats", "parsed failed")
+"""Result of :func:`ingest` - numbers of parsed and failed documents."""
+
+_html_suffixes = (".html", ".htm", ".html.gz", ".htm.gz")
+_tar_suffixes = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_warc_suffixes = (".warc", ".warc.gz")
+_suffixes = _html_suffixes + _tar_suffixes + _warc_suffixes
+
+
+def _read_headers(file):
+    """Read header lines up to an empty line and return them as a dictionary with lowercase names."""
+    headers = {}
+    for line in iter(file.readline, b""):
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("utf-8", "replace").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _dechunk(body):
+    """Decode HTTP chunked transfer encoding."""
+    chunks, position = [], 0
+    while True:
+        line_end = body.index(b"\r\n", position)
+        size = int(body[position:line_end].split(b";")[0], 16)
+        if size == 0:
+            return b"".join(chunks)
+        start, end = line_end + 2, line_end + 2 + size
+        chunks.append(body[start:end])
+        position = end + 2
+
+
+class _LineReader(object):
+    """Minimal file-like object returning lines from a list, used by :func:`_read_headers`."""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    def readline(self):
+        return next(self._lines, b"")
+
+
+def _describe(error):
+    """Return a short description of an exception for failure reports."""
+    return "{}: {}".format(type(error).__name__, error)
+
+
+def _iter_warc(file, name):
+    """Yield :code:`(target URI, body, error)` of HTML responses stored in a WARC file object.
+
+    A record which can't be decoded is reported by its error, the following records are still read.
+    """
+    while True:
+        line = file.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue  # records are separated by empty lines
+        if not line.startswith(b"WARC/"):
+            raise errors.Error("Invalid WARC record in {}.".format(name))
+
+        headers = _read_headers(file)
+        block = file.read(int(headers.get("content-length", 0)))
+        if headers.get("warc-type") != "response":
+            continue
+
+        http_head, _, body = block.partition(b"\r\n\r\n")
+        http_headers = _read_headers(_LineReader(http_head.split(b"\r\n")[1:]))
+        if "html" not in http_headers.get("content-type", "html"):
+            continue
+        uri = headers.get("warc-target-uri", name)
+        try:
+            if http_headers.get("transfer-encoding", "").lower() == "chunked":
+                body = _dechunk(body)
+            if http_headers.get("content-encoding", "").lower() == "gzip":
+                body = gzip.decompress(body)
+        except Exception as e:  # a corrupt record, the next one starts at a known offset anyway
+            yield uri, None, _describe(e)
+            continue
+        yield uri, body, None
+
+
+def _iter_tar(tar, path):
+    """Yield :code:`(name, document, error)` of HTML files stored in a tarball."""
+    for member in tar:
+        if member.isfile() and member.name.lower().endswith(_html_suffixes):
+            name = "{}/{}".format(path, member.name)
+            try:
+                document = tar.extractfile(member).read()
+                if member.name.lower().endswith(".gz"):
+                    document = gzip.decompress(document)
+            except Exception as e:  # eg. a truncated member, reading of the tarball then fails as a whole
+                yield name, None, _describe(e)
+                continue
+            yield name, document, None
+
+
+def _iter_file(path):
+    """Yield :code:`(name, document, error)` from one file according to its type.
+
+    A file which can't be read (eg. a truncated archive) is reported as a single failure after
+    the documents read from it so far.
+    """
+    lower = path.lower()
+    try:
+        if lower.endswith(_warc_suffixes):
+            with gzip.open(path, "rb") if lower.endswith(".gz") else open(path, "rb") as file:
+                yield from _iter_warc(file, path)
+        elif lower.endswith(_tar_suffixes):
+            # streaming mode - members are read sequentially, without seeking
+            with tarfile.open(path, "r|*") as tar:
+                yield from _iter_tar(tar, path)
+        else:
+            with gzip.open(path, "rb") if lower.endswith(".gz") else open(path, "rb") as file:
+                yield path, file.read(), None
+    except Exception as e:  # report any failure per file, don't interrupt the others
+        yield path, None, _describe(e)
+
+
+def _check_path(path):
+    """Check that a path is a directory or a file of a supported type.
+
+    :raise .ValueError: If it is not.
+    """
+    if not os.path.exists(path):
+        raise errors.ValueError("No such file or directory: {}".format(path))
+    if not os.path.isdir(path) and not path.lower().endswith(_suffixes):
+        raise errors.ValueError("Unsupported file type: {}".format(path))
+
+
+def iter_documents(paths):
+    """Yield stored pages from files and directories, one at a time.
+
+    Directories are searched recursively for supported files, other files are skipped. Documents
+    which can't be read (eg. a corrupt gzip file or WARC record) are yielded with an error instead
+    of interrupting the iteration.
+
+    :param paths: Iterable of paths to directories, HTML files (:code:`.html`, :code:`.html.gz`),
+        tarballs (:code:`.tar`, :code:`.tar.gz`, ...) or WARC files (:code:`.warc`, :code:`.warc.gz`).
+    :return: Generator of :code:`(name, document, error)` tuples, where document is :class:`bytes`
+        (or :code:`None`) and error is a description of a reading failure (or :code:`None`).
+    :raise .ValueError: If a file type is not supported or a path doesn't exist.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            _check_path(path)
+            yield from _iter_file(path)
+            continue
+        for directory, subdirectories, filenames in os.walk(path):
+            subdirectories.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(_suffixes):
+                    yield from _iter_file(os.path.join(directory, filename))
+
+
+def _parse(name, document):
+    """Parse one document, return :code:`(name, data, error)`. Runs in worker processes."""
+    from pycaching.parsers import parse_cache_details
+
+    try:
+        return name, parse_cache_details(document), None
+    except Exception as e:  # report any failure per document, don't interrupt the others
+        return name, None, _describe(e)
+
+
+def parse_documents(documents, *, processes=None, window=None):
+    """Parse cache details pages using a pool of processes.
+
+    At most :code:`window` documents are being parsed at once, so the documents can be a lazy
+    generator of any length.
+
+    :param documents: Iterable of :code:`(name, document, error)` tuples, eg. from
+        :func:`iter_documents`. Documents with an error are passed through without parsing.
+    :param int processes: Number of processes, defaults to the number of CPUs. Use :code:`0` to
+        parse in this process.
+    :param int window: Maximum number of documents in flight, defaults to :code:`4 * processes`.
+    :return: Generator of :code:`(name, data, error)` tuples in the same order as documents, where
+        data is the dictionary of cache fields (or :code:`None`) and error is a description of
+        a reading or parsing failure (or :code:`None`).
+    """
+    if processes == 0:
+        for name, document, error in documents:
+            yield (name, None, error) if error is not None else _parse(name, document)
+        return
+
+    processes = processes or os.cpu_count() or 1
+    window = window or 4 * processes
+    with process_pool(processes) as pool:
+        pending = collections.deque()
+        for name, document, error in documents:
+            if error is not None:
+                future = concurrent.futures.Future()
+                future.set_result((name, None, error))
+            else:
+                future = pool.submit(_parse, name, document)
+            pending.append(future)
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+@contextlib.contextmanager
+def _open_output(output, format, *, batch_size=1000):
+    """Yield a function writing one record to the output.
+
+    Records are written as they come, so an interrupted ingestion keeps the records written so far
+    (SQLite rows are committed in batches of :code:`batch_size`).
+    """
+    if format == "jsonl":
+        with open(output, "w", encoding="utf-8") as file:
+
+            def write(record):
+                file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                file.write("\n")
+
+            yield write
+
+    elif format == "sqlite":
+        connection = sqlite3.connect(output)
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS caches (wp TEXT PRIMARY KEY, source TEXT, data TEXT NOT NULL)"
+            )
+            written = 0
+
+            def write(record):
+                nonlocal written
+                connection.execute(
+                    "INSERT OR REPLACE INTO caches (wp, source, data) VALUES (?, ?, ?)",
+                    (record.get("wp"), record["source"], json.dumps(record, ensure_ascii=False)),
+                )
+                written += 1
+                if written % batch_size == 0:
+                    connection.commit()
+
+            try:
+                yield write
+            finally:
+                connection.commit()  # keep the work done so far also if the ingestion is interrupted
+        finally:
+            connection.close()
+
+    else:
+        raise errors.ValueError("Unknown output format '{}'.".format(format))
+
+
+def _guess_format(output):
+    return "sqlite" if output.lower().endswith((".sqlite", ".sqlite3", ".db")) else "jsonl"
+
+
+def ingest(paths, output, *, format=None, processes=None):
+    """Parse stored cache details pages and write the cache fields to a file.
+
+    Failures of single documents are logged and counted, they don't interrupt the ingestion. All
+    paths are checked before the ingestion starts. If it is interrupted anyway, the output contains
+    the records written so far.
+
+    :param paths: Iterable of paths, see :func:`iter_documents`.
+    :param str output: Path of the output file.
+    :param str format: Either :code:`jsonl` (one JSON object per line) or :code:`sqlite` (table
+        :code:`caches` with columns :code:`wp`, :code:`source` and JSON :code:`data`; one row per
+        cache). Guessed from the output file extension by default.
+    :param int processes: Number of parsing processes, see :func:`parse_documents`.
+    :rtype: :class:`.IngestStats`
+    :raise .ValueError: If a path doesn't exist or a file type is not supported.
+    """
+    paths = list(paths)
+    for path in paths:
+        _check_path(path)
+
+    parsed = failed = 0
+    with _open_output(output, format or _guess_format(output)) as write:
+        for name, data, error in parse_documents(iter_documents(paths), processes=processes):
+            if error is not None:
+                logging.warning("Cannot ingest {}: {}".format(name, error))
+                failed += 1
+                continue
+            data["source"] = name
+            write(data)
+            parsed += 1
+    return IngestStats(parsed, failed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pycaching.ingest",
+        description="Parse stored cache details pages into JSON lines or SQLite.",
+        epilog="Exits with status 1 if some documents failed to be parsed.",
+    )
+    parser.add_argument("paths", nargs="+", help="directories, HTML files, tarballs or WARC files")
+    parser.add_argument("-o", "--output", required=True, help="output file")
+    parser.add_argument("-f", "--format", choices=("jsonl", "sqlite"), help="output format (default: by extension)")
+    parser.add_argument("-p", "--processes", type=int, help="parsing processes (default: number of CPUs)")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = ingest(args.paths, args.output, format=args.format, processes=args.processes)
+    except errors.ValueError as e:
+        parser.error(str(e))
+    print("Parsed {} documents, {} failed.".format(stats.parsed, stats.failed), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+import contextlib
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict, namedtuple
+from urllib.parse import urlparse
+
+RequestEvent = namedtuple(
+    "RequestEvent", "method url attempt status_code time_to_headers total_time response_bytes error"
+)
+"""One HTTP request attempt (retries are reported as separate events).
+
+Times are in seconds. :code:`time_to_headers` covers name resolution, connecting, sending the
+request and waiting for response headers. The rest of :code:`total_time` is spent by downloading
+the response body. For streamed responses, the body is not downloaded yet, so :code:`total_time`
+equals :code:`time_to_headers` and :code:`response_bytes` is taken from the :code:`Content-Length`
+header (or :code:`None`). If the request failed without a response, :code:`status_code` is
+:code:`None` and :code:`error` contains the exception.
+"""
+
+StageEvent = namedtuple("StageEvent", "name elapsed target")
+"""One finished processing stage.
+
+Contains the stage name, time spent in seconds and the processed target (URL or the loaded object).
+
+Stages are named :code:`"parse.<expect>"` for parsing of responses (eg. :code:`"parse.soup"`) and
+after loading methods for the other ones (eg. :code:`"cache.load"`). Fetching inside a loading method
+is reported as a nested stage with :code:`".fetch"` suffix (eg. :code:`"cache.load.fetch"`), so the time
+spent by extracting fields from the parsed page is the difference of these two.
+"""
+
+
+class Instrumentation(object):
+    """Base class for receiving timing and traffic events from :class:`.Geocaching`.
+
+    Override the methods you are interested in and register an instance using
+    :meth:`.Geocaching.add_instrumentation`. The methods can be called from multiple threads at once.
+    Exceptions raised by them are logged and ignored.
+    """
+
+    def on_request(self, event):
+        """Called after each HTTP request attempt.
+
+        :param .RequestEvent event: Request details.
+        """
+
+    def on_stage(self, event):
+        """Called after each finished processing stage.
+
+        :param .StageEvent event: Stage details.
+        """
+
+    def on_retry(self, url, attempt, delay, cause):
+        """Called before a failed request is retried.
+
+        :param str url: Request target.
+        :param int attempt: Number of the upcoming retry, starting with 1.
+        :param float delay: Seconds to wait before the retry.
+        :param cause: Exception or :class:`requests.Response` which caused the retry.
+        """
+
+    def on_rate_limit(self, url, rate_limit_reset):
+        """Called when a request is rejected by rate limiting (HTTP 429).
+
+        :param str url: Request target.
+        :param int rate_limit_reset: Seconds until the rate limit is reset.
+        """
+
+
+@contextlib.contextmanager
+def measure(geocaching, name, target=None):
+    """Measure time spent in a block of code and report it as a :class:`.StageEvent`.
+
+    Does nothing if no instrumentation is registered on the :code:`geocaching` object.
+
+    :param .Geocaching geocaching: Object with registered instrumentation.
+    :param str name: Stage name.
+    :param target: Processed target.
+    """
+    if not getattr(geocaching, "_instrumentation", None):
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        geocaching._emit("on_stage", StageEvent(name, time.perf_counter() - start, target))
+
+
+def measured(name):
+    """Decorator measuring time spent in a method of an object having a :code:`geocaching` attribute.
+
+    :param str name: Stage name.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with measure(self.geocaching, name, self):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsCollector(Instrumentation):
+    """In-memory aggregation of instrumentation events.
+
+    Useful for ad-hoc profiling and for testing. Use :meth:`snapshot` to read the collected metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all collected metrics."""
+        with self._lock:
+            self._counters = defaultdict(int)
+            self._timings = defaultdict(lambda: [0, 0.0])  # format: { key: [count, sum] }
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._counters[key] += value
+
+    def _time(self, key, elapsed):
+        with self._lock:
+            timing = self._timings[key]
+            timing[0] += 1
+            timing[1] += elapsed
+
+    def on_request(self, event):
+        host = urlparse(event.url).netloc
+        self._count(("requests", host, event.status_code))
+        self._time(("request_time_to_headers", host), event.time_to_headers)
+        self._time(("request_total_time", host), event.total_time)
+        if event.response_bytes:
+            self._count(("response_bytes", host), event.response_bytes)
+
+    def on_stage(self, event):
+        self._time(("stage", event.name), event.elapsed)
+
+    def on_retry(self, url, attempt, delay, cause):
+        self._count(("retries", urlparse(url).netloc))
+
+    def on_rate_limit(self, url, rate_limit_reset):
+        self._count(("rate_limited", urlparse(url).netloc))
+
+    def snapshot(self):
+        """Return collected metrics.
+
+        :return: A dictionary with :code:`"counters"` mapping keys (tuples like
+            :code:`("requests", host, status_code)`) to values and :code:`"timings"` mapping keys
+            (like :code:`("stage", name)`) to :code:`(count, total seconds)` tuples.
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timings": {key: tuple(value) for key, value in self._timings.items()},
+            }
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """Export instrumentation events as Prometheus metrics.
+
+    Requires `prometheus_client <https://pypi.org/project/prometheus-client/>`_ package.
+    """
+
+    def __init__(self, registry=None, *, namespace="pycaching"):
+        """Create the metrics.
+
+        :param registry: A :code:`prometheus_client.CollectorRegistry` to register the metrics in.
+            Defaults to the global registry.
+        :param str namespace: Prefix of metric names.
+        """
+        # imports are here to not require prometheus_client for other parts of program
+        import prometheus_client
+
+        kwargs = {"namespace": namespace}
+        if registry is not None:
+            kwargs["registry"] = registry
+
+        self.requests = prometheus_client.Counter(
+            "requests", "HTTP request attempts.", ["host", "method", "status"], **kwargs
+        )
+        self.request_time_to_headers = prometheus_client.Histogram(
+            "request_time_to_headers_seconds", "Time until response headers were received.", ["host"], **kwargs
+        )
+        self.request_total_time = prometheus_client.Histogram(
+            "request_total_seconds", "Total request time including body download.", ["host"], **kwargs
+        )
+        self.response_bytes = prometheus_client.Counter(
+            "response_bytes", "Downloaded response body bytes.", ["host"], **kwargs
+        )
+        self.stage_time = prometheus_client.Histogram(
+            "stage_seconds", "Time spent in processing stages.", ["stage"], **kwargs
+        )
+        self.retries = prometheus_client.Counter("retries", "Retried requests.", ["host"], **kwargs)
+        self.rate_limited = prometheus_client.Counter(
+            "rate_limited", "Requests rejected by rate limiting.", ["host"], **kwargs
+        )
+
+    def on_request(self, event):
+        host = urlparse(event.url).netloc
+        status = str(event.status_code) if event.status_code is not None else "error"
+        self.requests.labels(host=host, method=event.method, status=status).inc()
+        self.request_time_to_headers.labels(host=host).observe(event.time_to_headers)
+        self.request_total_time.labels(host=host).observe(event.total_time)
+        if event.response_bytes:
+            self.response_bytes.labels(host=host).inc(event.response_bytes)
+
+    def on_stage(self, event):
+        self.stage_time.labels(stage=event.name).observe(event.elapsed)
+
+    def on_retry(self, url, attempt, delay, cause):
+        self.retries.labels(host=urlparse(url).netloc).inc()
+
+    def on_rate_limit(self, url, rate_limit_reset):
+        self.rate_limited.labels(host=urlparse(url).netloc).inc()
+
+
+def emit(listeners, method, *args):
+    """Call given method of all listeners, logging and ignoring their errors.
+
+    :param listeners: An iterable of :class:`.Instrumentation` objects.
+    :param str method: Name of the method to call.
+    """
+    for listener in listeners:
+        try:
+            getattr(listener, method)(*args)
+        except Exception:
+            logging.exception("Instrumentation {!r} failed in {}".format(listener, method))
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+
+"""Pure functions parsing geocaching.com pages into plain data.
+
+The parsers don't do any I/O and don't need a :class:`.Geocaching` instance. They take a page as
+:class:`str` or :class:`bytes` (or already parsed :class:`bs4.BeautifulSoup`) and return plain
+Python types, so they can run in other processes (see :meth:`.Geocaching.load_caches`) and their
+results can be stored as JSON.
+
+The returned cache fields use the same format as :meth:`.Cache.to_dict` and can be applied to a
+cache by :meth:`.Cache.from_dict`.
+"""
+
+import json
+import logging
+import os
+import re
+
+from bs4 import BeautifulSoup
+from bs4.element import Script, Tag
+
+from pycaching import errors
+from pycaching.cache import Size, Status, Type
+from pycaching.geo import Point, _decode_utfgrid_data, _parse_coordinates
+from pycaching.log import Type as LogType
+from pycaching.util import parse_date, rot13
+
+
+def _soup(document):
+    """Return a parsed document, unless it is parsed already."""
+    if isinstance(document, Tag):
+        return document
+    return BeautifulSoup(document, "html.parser")
+
+
+def _parse_location(string):
+    """Return :code:`[latitude, longitude]` parsed from coordinates, see :meth:`.Point.from_string`.
+
+    :raise .ValueError: If string cannot be parsed as coordinates.
+    """
+    coordinates = _parse_coordinates(string)
+    if coordinates is None:
+        point = Point.from_string(string)
+        coordinates = point.latitude, point.longitude
+    return list(coordinates)
+
+
+def parse_waypoints(document, table_id):
+    """Return additional waypoints from a waypoints table.
+
+    :param document: Page containing the table.
+    :param str table_id: HTML id of the table.
+    :return: Dictionary of :code:`{ identifier: { "id", "type", "location", "note" } }`, where
+        location is :code:`None` if it is not valid.
+    :rtype: :class:`dict`
+    """
+    waypoints = {}
+    table = _soup(document).find("table", id=table_id)
+    if table:
+        rows = table.find_all("tr")
+        for r1, r2 in zip(rows[1::2], rows[2::2]):
+            columns = r1.find_all("td") + r2.find_all("td")
+            identifier = columns[3].text.strip()
+            location_string = columns[5].text.strip()
+            try:
+                location = _parse_location(location_string)
+            except errors.ValueError:
+                location = None
+                logging.debug("No valid location format in waypoint {}: {}".format(identifier, location_string))
+            waypoints[identifier] = {
+                "id": identifier,
+                "type": columns[1].find("img").get("title"),
+                "location": location,
+                "note": columns[8].text.strip(),
+            }
+    return waypoints
+
+
+def _parse_log_types(element):
+    """Return log type values of images in the element."""
+    types = []
+    for image in element.find_all("img"):
+        type = image["src"]  # "../images/logtypes/2.png"
+        type = type.split("/")[-1].split(".")[0]  # "2"
+        types.append(LogType.from_filename(type).value)
+    return types
+
+
+def _zip_log_counts(types, values):
+    # Prevent possible wrong assignments when the list sizes differ for some unknown reason.
+    if not len(values) == len(types):
+        raise errors.ValueError(
+            "Different list sizes getting log counts: {} types and {} counts.".format(len(types), len(values))
+        )
+    return dict(zip(types, values))
+
+
+def parse_log_counts(document):
+    """Return log counts from a cache details page.
+
+    :param document: Cache details page.
+    :return: Dictionary of :code:`{ log type value: count }`.
+    :rtype: :class:`dict`
+    """
+    log_totals = _soup(document).find("span", {"id": "ctl00_ContentBody_lblFindCounts"}).find("ul")
+
+    # Text gives numbers separated by a lot of spaces, splitting retrieves the numbers.
+    # The values might contain thousand separators, which we have to remove before converting
+    # them to real numbers.
+    values = [int(value.replace(",", "").replace(".", "")) for value in log_totals.text.split()]
+    return _zip_log_counts(_parse_log_types(log_totals), values)
+
+
+def _parse_print_page_log_counts(root):
+    """Return log counts from a cache print page."""
+    # The print page does not use any IDs, so we use some more complicated approach here and
+    # search for the paragraph containing the log type images.
+    element = None
+    for entry in root.find_all("p", "Meta"):
+        if "images/logtypes" in str(entry):
+            element = entry
+            break
+
+    if not element:
+        raise errors.ValueError("Log counts could not be found.")
+
+    # Text gives numbers and verbose descriptions of the current values as well as an
+    # introductory text. So we have to perform number checks for each element and only keep
+    # the numbers.
+    # The values might contain thousand separators, which we have to remove before converting
+    # them to real numbers.
+    values = []
+    for word in element.text.split():
+        word = word.replace(",", "").replace(".", "")
+        if word and word.isdigit():
+            values.append(int(word))
+    return _zip_log_counts(_parse_log_types(element), values)
+
+
+def parse_cache_details(document):
+    """Return cache fields from a cache details page, as used by :meth:`.Cache.load`.
+
+    For PM only caches viewed by basic members, only the details available to them are returned
+    (:code:`wp`, :code:`name`, :code:`author`, :code:`difficulty`, :code:`terrain`, :code:`size`,
+    :code:`favorites` and :code:`type`) and :code:`pm_only` is :code:`True`.
+
+    :param document: Cache details page.
+    :raise .LoadError: If the page is not a cache details page.
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    data = {}
+
+    # check for PM only caches if using free account
+    restricted = root.find("section", "premium-upgrade-widget") is not None
+    data["pm_only"] = restricted
+
+    cache_details = root.find(id="ctl00_divContentMain") if restricted else root.find(id="cacheDetails")
+
+    # details also available for basic members for PM only caches -----------------------------
+
+    if restricted:
+        data["wp"] = cache_details.find("li", "li__gccode").text.strip()
+
+        data["name"] = cache_details.find("h1").text.strip()
+
+        author = cache_details.find(id="ctl00_ContentBody_uxCacheBy").text
+        data["author"] = author[11:]  # 11 = len("A cache by ")
+
+        # parse cache detail list into a python list
+        details = cache_details.find("ul", "ul__hide-details").text.split("\n")
+
+        data["difficulty"] = float(details[2])
+
+        data["terrain"] = float(details[5])
+
+        data["size"] = Size.from_string(details[8]).value
+
+        data["favorites"] = int(details[11])
+    else:
+        # parse from <title> - get first word
+        try:
+            data["wp"] = root.title.string.split(" ")[0]
+        except (AttributeError, ValueError):
+            raise errors.LoadError()
+        data["name"] = cache_details.find(id="ctl00_ContentBody_CacheName").text
+
+        try:
+            data["author"] = cache_details("a")[1].text
+        except IndexError:
+            if "[DELETED_USER]" in cache_details.find("div", id="ctl00_ContentBody_mcd1").text:
+                data["author"] = None
+            else:
+                raise
+
+        D_and_T_img = root.find("div", "CacheStarLabels").find_all("img")
+        data["difficulty"], data["terrain"] = [float(img.get("alt").split()[0]) for img in D_and_T_img]
+
+        size = root.find("div", "CacheSize")
+        size = size.find("img").get("src")  # size img src
+        size = size.split("/")[-1].rsplit(".", 1)[0]  # filename w/o extension
+        data["size"] = Size.from_filename(size).value
+
+    # use shared functionality as both cases use the same method
+    type = cache_details.select_one("svg.cache-icon use").get("xlink:href")  # "cache-types.svg#icon-3-disabled"
+    type = type.split("#")[-1].replace("_", "-").split("-")[1]  # "3"
+    data["type"] = Type.from_filename(type).value
+
+    if restricted:
+        return data
+
+    # details not available for basic members for PM only caches
+    pm_only_warning = root.find("p", "Warning NoBottomSpacing")
+    data["pm_only"] = pm_only_warning and ("Premium Member Only" in pm_only_warning.text) or False
+
+    attributes_widget, inventory_widget, *_ = root.find_all("div")
+
+    hidden = cache_details.find("div", "minorCacheDetails").find_all("div")[1].text
+    data["hidden"] = parse_date(hidden.split(":")[-1]).isoformat()
+
+    data["location"] = _parse_location(root.find(id="uxLatLon").text)
+
+    data["status"] = Status.from_cache_details(root).value
+
+    log_image = root.find(id="ctl00_ContentBody_GeoNav_logTypeImage")
+    if log_image:
+        log_image_filename = log_image.get("src").split("/")[-1].rsplit(".", 1)[0]  # filename w/o extension
+        data["found"] = LogType.from_filename(log_image_filename) in (LogType.found_it, LogType.attended)
+    else:
+        data["found"] = False
+
+    attributes_raw = attributes_widget.find_all("img")
+    attributes_raw = [_.get("src").split("/")[-1].rsplit("-", 1) for _ in attributes_raw]
+
+    data["attributes"] = {
+        attribute_name: appendix.startswith("yes")
+        for attribute_name, appendix in attributes_raw
+        if not appendix.startswith("blank")
+    }
+
+    data["summary"] = root.find(id="ctl00_ContentBody_ShortDescription").text
+    raw_description = root.find(id="ctl00_ContentBody_LongDescription")
+    data["description"] = raw_description.text
+    data["description_html"] = str(raw_description)
+
+    data["hint"] = rot13(root.find(id="div_hint").get_text(separator="\n"))
+
+    favorites = root.find("span", "favorite-value")
+    data["favorites"] = int(favorites.text) if favorites else 0
+
+    js_content = "\n".join(root.find_all(string=lambda i: isinstance(i, Script)))
+    data["_logbook_token"] = re.findall("userToken\\s*=\\s*'([^']+)'", js_content)[0]
+    # find original location if any
+    if 'oldLatLng":' in js_content:
+        old_lat_long = js_content.split('oldLatLng":')[1].split("]")[0].split("[")[1]
+        data["original_location"] = [float(coordinate) for coordinate in old_lat_long.split(",")]
+    else:
+        data["original_location"] = None
+
+    # if there are some trackables
+    if len(inventory_widget.find_all("a")) >= 3:
+        trackable_page_url = inventory_widget.find(id="ctl00_ContentBody_uxTravelBugList_uxViewAllTrackableItems")
+        data["_trackable_page_url"] = trackable_page_url.get("href")[3:]  # has "../" on start
+    else:
+        data["_trackable_page_url"] = None
+
+    # Additional Waypoints
+    data["waypoints"] = parse_waypoints(root, "ctl00_ContentBody_Waypoints")
+
+    # Log counts
+    data["log_counts"] = parse_log_counts(root)
+
+    return data
+
+
+def parse_print_page(document):
+    """Return cache fields from a cache print page, as used by :meth:`.Cache.load_by_guid`.
+
+    :param document: Cache print page.
+    :raise .PMOnlyException: If the PM only warning is shown on the page.
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    if root.find("p", "Warning") is not None:
+        raise errors.PMOnlyException()
+    content = root.find(id="Content")
+    data = {}
+
+    data["name"] = content.find("h2").text
+
+    data["location"] = _parse_location(content.find(class_="LatLong").text.strip())
+
+    type_img = os.path.basename(content.find("img").get("src"))
+    data["type"] = Type.from_filename(os.path.splitext(type_img)[0]).value
+
+    size_img = content.find("img", src=re.compile(r"\/icons\/container\/"))
+    data["size"] = Size.from_string(size_img.get("alt").split(": ")[1]).value
+
+    diff_terr = content.find(class_="DiffTerr").find_all("img")
+    assert len(diff_terr) == 2
+    data["difficulty"] = float(diff_terr[0]["alt"].split()[0])
+    data["terrain"] = float(diff_terr[1]["alt"].split()[0])
+
+    data["author"] = content.find(class_="Meta").text.partition(":")[2].strip()
+    hidden = content.find(class_="HalfRight AlignRight").p.text.strip().partition(":")[2].strip()
+    data["hidden"] = parse_date(hidden).isoformat()
+
+    attr_img = content.find(class_="sortables").find_all("img")
+    attributes_raw = [
+        os.path.basename(_.get("src")).rsplit("-", 1)
+        for _ in attr_img
+        if _.get("src") and _.get("src").startswith("/images/attributes/")
+    ]
+    data["attributes"] = {
+        name: appendix.startswith("yes") for name, appendix in attributes_raw if not appendix.startswith("blank")
+    }
+
+    data["summary"] = content.find("h2", string="Short Description").find_next("div").text
+
+    raw_description = content.find("h2", string="Long Description").find_next("div")
+    data["description"] = raw_description.text
+    data["description_html"] = str(raw_description)
+
+    hint = content.find(id="uxEncryptedHint")
+    data["hint"] = hint.get_text(separator="\n") if hint else None
+
+    fav_text = content.find(class_="Third AlignRight").p.contents[2]
+    try:
+        data["favorites"] = int(fav_text)
+    except ValueError:  # element not present when 0 favorites
+        data["favorites"] = 0
+
+    data["waypoints"] = parse_waypoints(content, "Waypoints")
+
+    data["log_counts"] = _parse_print_page_log_counts(root)
+    data["wp"] = root.find(class_="HalfRight").find("h1").text.strip()
+
+    return data
+
+
+def parse_trackable(document):
+    """Return trackable fields from a trackable details page, as used by :meth:`.Trackable.load`.
+
+    :param document: Trackable details page.
+    :return: Dictionary of trackable properties, including private :code:`_kml_url` and
+        :code:`_log_page_url`. The location is either a cache URL or a location description.
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    data = {
+        "tid": root.find("span", "CoordInfoCode").text,
+        "name": root.find(id="ctl00_ContentBody_lbHeading").text,
+        "type": root.find(id="ctl00_ContentBody_BugTypeImage").get("alt"),
+        "owner": root.find(id="ctl00_ContentBody_BugDetails_BugOwner").text,
+        "goal": root.find(id="TrackableGoal").text,
+        "description": root.find(id="TrackableDetails").text,
+        "_kml_url": root.find(id="ctl00_ContentBody_lnkGoogleKML").get("href"),
+        # another Groundspeak trick... inconsistent relative / absolute URL on one page
+        "_log_page_url": "/track/" + root.find(id="ctl00_ContentBody_LogLink")["href"],
+    }
+
+    location_raw = root.find(id="ctl00_ContentBody_BugDetails_BugLocation")
+    location_url = location_raw.get("href", "")
+    data["location"] = location_url if "cache_details" in location_url else location_raw.text
+    return data
+
+
+def parse_log_page(document):
+    """Return data needed to post a log from a cache log page, as used by :meth:`.Cache.post_log`.
+
+    :param document: Cache log page.
+    :return: Dictionary with :code:`valid_types` (list of log type values accepted by the cache) and
+        :code:`hidden_inputs` (static form fields).
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    return {
+        # find all valid log types for the cache
+        "valid_types": [o["value"] for o in root.find("select", attrs={"name": "LogTypeId"}).find_all("option")],
+        # find all static data fields needed for log
+        "hidden_inputs": {i["name"]: i.get("value", "") for i in root.find_all("input", type=["hidden", "submit"])},
+    }
+
+
+def parse_trackable_log_page(document):
+    """Return data needed to post a log from a trackable log page, as used by :meth:`.Trackable.post_log`.
+
+    :param document: Trackable log page.
+    :return: Dictionary with :code:`valid_types` (list of log type values), :code:`hidden_inputs`
+        (static form fields) and :code:`date_format` (date format of the user).
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    return {
+        # find all valid log types for the trackable (-1 removes "- select type of log -")
+        "valid_types": [o["value"] for o in root.find_all("option") if o["value"] != "-1"],
+        # find all static data fields needed for log
+        "hidden_inputs": {i["name"]: i.get("value", "") for i in root.find_all("input", type=["hidden"])},
+        # get user date format
+        "date_format": root.find(id="ctl00_ContentBody_LogBookPanel1_uxDateFormatHint").text.strip("()"),
+    }
+
+
+def _parse_my_log_row(row):
+    """Return a log record parsed from one row of the logs table."""
+    link = row.find(class_="ImageLink")["href"]
+
+    # This line extracts a GC code from the cache URL
+    # Example: https://www.geocaching.com/geocache/GC12345 -> GC12345
+    wp = link.split("/")[4].split("_")[0]
+
+    log_image = row.find("img", src=re.compile("logtypes"))
+    if log_image:
+        log_image_filename = log_image["src"].split("/")[-1].rsplit(".", 1)[0]  # filename w/o extension
+        type = LogType.from_filename(log_image_filename).value
+    else:
+        type = None
+
+    # the cache name is a text of the link next to the cache type icon
+    name_link = row.find(
+        lambda tag: tag.name == "a" and tag.get("href") == link and "ImageLink" not in tag.get("class", [])
+    )
+    name = name_link.text.strip() if name_link else None
+
+    visited = parse_date(row.find_all("td")[2].text).isoformat()
+
+    return {"wp": wp, "type": type, "visited": visited, "name": name}
+
+
+def _find_next_page_postback(root, page_number):
+    """Return a postback event target and argument leading to the next page, or :code:`None`."""
+    next_page_argument = re.compile(r"^Page\$(Next|{})$".format(page_number + 1))
+    for link in root.find_all("a", href=True):
+        m = re.match(r"javascript:__doPostBack\('([^']+)','([^']*)'\)", link["href"])
+        if m and next_page_argument.match(m.group(2)):
+            return [m.group(1), m.group(2)]
+    return None
+
+
+def parse_my_logs(document, page_number=1):
+    """Return log records from one page of the logs table of the logged in user.
+
+    As used by :meth:`.Geocaching.my_log_records`.
+
+    :param document: Page of the logs table.
+    :param int page_number: Number of the page, used to find the link to the next one.
+    :return: Dictionary with :code:`records` (list of dictionaries with :code:`wp`, :code:`type`,
+        :code:`visited` and :code:`name`), :code:`next_page` (ASP.NET postback event target and
+        argument leading to the next page or :code:`None`) and :code:`hidden_inputs` (form fields
+        to post back).
+    :rtype: :class:`dict`
+    """
+    root = _soup(document)
+    cache_table = root.find(class_="Table")
+    if cache_table is None:  # no logs on the account
+        return {"records": [], "next_page": None, "hidden_inputs": {}}
+
+    return {
+        "records": [_parse_my_log_row(row) for row in cache_table.tbody.find_all("tr")],
+        "next_page": _find_next_page_postback(root, page_number),
+        "hidden_inputs": {i["name"]: i.get("value", "") for i in root.find_all("input", type="hidden")},
+    }
+
+
+def parse_utfgrid(document):
+    """Return caches placed on a UTFGrid tile, as used by :meth:`.Tile.load`.
+
+    :param document: UTFGrid as JSON :class:`str` or :class:`bytes`, or already decoded.
+    :return: Dictionary with :code:`size` (grid resolution) and :code:`caches` (dictionary of
+        :code:`{ waypoint: (name, xs, ys) }`, where :code:`xs` and :code:`ys` are
+        :class:`array.array` of grid point coordinates).
+    :raise .Error: If the grid cannot be parsed.
+    :rtype: :class:`dict`
+    """
+    utfgrid = json.loads(document) if isinstance(document, (str, bytes)) else document
+
+    size = len(utfgrid["grid"])
+    if any(len(row) != size for row in utfgrid["grid"]):
+        raise errors.Error("UTFGrid is not square")
+    return {"size": size, "caches": _decode_utfgrid_data(utfgrid["data"])}
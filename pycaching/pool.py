@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import logging
+import math
+import subprocess
+import threading
+import time
+
+from pycaching import errors
+from pycaching.errors import LoginFailedException, NotLoggedInException, TooManyRequestsError
+from pycaching.geocaching import Geocaching
+from pycaching.util import synchronized
+
+
+class _Member(object):
+    """An account in :class:`.GeocachingPool` together with its rate limiting state."""
+
+    __slots__ = "geocaching", "benched_until", "rate_limited_at", "requests"
+
+    def __init__(self, geocaching):
+        self.geocaching = geocaching
+        self.benched_until = 0.0  # time.monotonic() value
+        self.rate_limited_at = float("-inf")
+        self.requests = 0
+
+
+class GeocachingPool(Geocaching):
+    """A pool of logged in accounts sharing the load of requests.
+
+    The pool can be used in the same way as a single :class:`.Geocaching` instance (eg. for
+    :meth:`search`, :meth:`get_cache` or :meth:`load_caches`), but each request is sent by one of
+    the member accounts. When an account gets rate limited, it is taken out of rotation until the
+    limit is reset and the request is repeated by another account. Only when all accounts are rate
+    limited, :class:`.TooManyRequestsError` is raised.
+
+    Usage::
+
+        pool = GeocachingPool(pool_maxsize=16)
+        pool.login()  # all accounts from the credentials file
+        pool.login_with_cookie("another-gspkauth-cookie")
+        for result in pool.load_caches(pool.search(Point(50, 14), 1000), workers=16):
+            print(result.cache.name)
+
+    .. note::
+       Methods working with data of the logged in user (eg. :meth:`my_finds`) use an arbitrary account
+       for each request. Use a specific instance from :attr:`members` for them.
+    """
+
+    round_robin = "round_robin"
+    least_recently_rate_limited = "least_recently_rate_limited"
+
+    def __init__(self, *, strategy=round_robin, min_bench_time=5, member_factory=None, **kwargs):
+        """Create an empty pool. Use :meth:`login` or :meth:`login_with_cookie` to add accounts.
+
+        :param str strategy: How to pick an account for a request. Either :attr:`round_robin` or
+            :attr:`least_recently_rate_limited`, which prefers accounts which weren't rate limited for
+            the longest time (and the least used ones among them).
+        :param float min_bench_time: Minimum number of seconds a rate limited account is out of
+            rotation, used if the site asks to wait for a shorter time. Must be positive.
+        :param callable member_factory: Callable returning a new :class:`.Geocaching` instance for each
+            account logged in by the pool. Defaults to creating it with the same :code:`kwargs`.
+        :param kwargs: Passed to :class:`.Geocaching`. Apart from :code:`session`, they are used also
+            for the member instances created by the pool.
+        """
+        if strategy not in (self.round_robin, self.least_recently_rate_limited):
+            raise errors.ValueError("Unknown account selection strategy '{}'.".format(strategy))
+        if not min_bench_time > 0:
+            raise errors.ValueError("Minimum bench time must be positive, got {}.".format(min_bench_time))
+
+        super().__init__(**kwargs)
+        self._member_options = {key: value for key, value in kwargs.items() if key != "session"}
+        self._member_factory = member_factory
+        self._strategy = strategy
+        self._min_bench_time = min_bench_time
+        self._members = []
+        self._members_lock = threading.Lock()
+        self._next_member = 0
+
+    @property
+    def members(self):
+        """Member instances of :class:`.Geocaching`, one per account.
+
+        :type: :class:`list`
+        """
+        with self._members_lock:
+            return [member.geocaching for member in self._members]
+
+    def add_member(self, geocaching):
+        """Add an already logged in :class:`.Geocaching` instance to the pool.
+
+        An instance logged in to an account which is already in the pool is not added.
+
+        :param .Geocaching geocaching: Instance to add.
+        :return: Whether the instance was added.
+        :rtype: :class:`bool`
+        :raise .NotLoggedInException: If the instance is not logged in.
+        """
+        if not geocaching._logged_in:
+            raise NotLoggedInException("Only logged in instances can be added to the pool.")
+
+        username = geocaching._logged_username
+        with self._members_lock:
+            if username and any(member.geocaching._logged_username == username for member in self._members):
+                logging.info("Account {} is already in the pool.".format(username))
+                return False
+            self._members.append(_Member(geocaching))
+            self._logged_in = True
+            return True
+
+    def _create_member(self):
+        """Return a new instance for a member account, sharing instrumentation with the pool."""
+        if self._member_factory:
+            geocaching = self._member_factory()
+        else:
+            geocaching = Geocaching(**self._member_options)
+        geocaching._instrumentation = self._instrumentation
+        return geocaching
+
+    def _get_usernames(self):
+        with self._members_lock:
+            return {member.geocaching._logged_username for member in self._members}
+
+    @synchronized("_login_lock")
+    def login(self, username=None, password=None):
+        """Log in an account and add it to the pool.
+
+        If neither username nor password is set, log in all accounts from the credentials file (see
+        :meth:`.Geocaching.login`) which are not in the pool yet. Concurrent calls are serialized, so
+        an account is never logged in twice.
+
+        :param str username: User's username or :code:`None` to use data from credentials file.
+        :param str password: User's password or :code:`None` to use data from credentials file.
+        :raise .LoginFailedException: If login of some account fails.
+        """
+        if username or password:
+            credentials = [(username, password)]
+        else:
+            try:
+                credentials = self._load_all_credentials()
+            except (OSError, ValueError, KeyError, subprocess.CalledProcessError) as e:
+                raise LoginFailedException("Cannot load credentials from credentials file.") from e
+
+        for username, password in credentials:
+            if username and username in self._get_usernames():
+                logging.info("Account {} is already in the pool.".format(username))
+                continue
+
+            member = self._create_member()
+            member.login(username, password)
+            self.add_member(member)
+
+    def login_with_cookie(self, cookie, username=None, cookie_name="gspkauth"):
+        """Log in an account by importing its session cookie and add it to the pool.
+
+        See :meth:`.Geocaching.login_with_cookie` for the parameters.
+        """
+        member = self._create_member()
+        member.login_with_cookie(cookie, username=username, cookie_name=cookie_name)
+        self.add_member(member)
+
+    def logout(self):
+        """Log out all accounts and remove them from the pool."""
+        with self._members_lock:
+            members, self._members = self._members, []
+            self._logged_in = False
+
+        for member in members:
+            member.geocaching.logout()
+
+    def _pick_member(self, url):
+        """Return an account which is not rate limited according to the selection strategy.
+
+        :raise .TooManyRequestsError: If all accounts are rate limited.
+        """
+        with self._members_lock:
+            now = time.monotonic()
+            available = [member for member in self._members if member.benched_until <= now]
+            if not available:
+                rate_limit_reset = math.ceil(min(member.benched_until for member in self._members) - now)
+                raise TooManyRequestsError(url, rate_limit_reset=rate_limit_reset)
+
+            if self._strategy == self.round_robin:
+                member = available[self._next_member % len(available)]
+                self._next_member += 1
+            else:
+                member = min(available, key=lambda m: (m.rate_limited_at, m.requests))
+            member.requests += 1
+            return member
+
+    def _bench(self, member, rate_limit_reset):
+        """Take a rate limited account out of rotation."""
+        bench_time = max(rate_limit_reset, self._min_bench_time)
+        logging.info("Account {} is rate limited for {} s.".format(member.geocaching._logged_username, bench_time))
+        with self._members_lock:
+            member.rate_limited_at = time.monotonic()
+            member.benched_until = member.rate_limited_at + bench_time
+
+    def _request(self, url, *, login_check=True, **kwargs):
+        """Do a HTTP request using one of the member accounts.
+
+        See :meth:`.Geocaching._request` for the parameters. Requests which don't need login are sent
+        using the pool itself if it has no members.
+
+        :raise .TooManyRequestsError: If all accounts are rate limited.
+        """
+        if not self._members:
+            if login_check:
+                raise NotLoggedInException("Login is needed.")
+            return super()._request(url, login_check=False, **kwargs)
+
+        while True:
+            member = self._pick_member(url)
+            try:
+                return member.geocaching._request(url, login_check=login_check, **kwargs)
+            except TooManyRequestsError as e:
+                self._bench(member, e.rate_limit_reset)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import email.utils
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import requests
+
+
+class RetryPolicy(object):
+    """Policy deciding whether and when a failed HTTP request should be retried.
+
+    Transient failures (connection errors, timeouts and selected HTTP status codes) are retried with
+    an exponential backoff and a random jitter. Only idempotent methods are retried, unless the
+    connection couldn't be established at all (so the request was never sent).
+
+    Usage::
+
+        policy = RetryPolicy(total=5, per_endpoint_total={"seek/geocache.logbook": 10})
+        geocaching = Geocaching(retry_policy=policy)
+    """
+
+    idempotent_methods = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+    def __init__(
+        self,
+        total=2,
+        *,
+        backoff_factor=0.5,
+        backoff_max=60,
+        jitter=True,
+        status_forcelist=(502, 503, 504),
+        methods=idempotent_methods,
+        respect_retry_after=True,
+        per_endpoint_total=None,
+        on_retry=None,
+    ):
+        """Create a retry policy.
+
+        :param int total: Maximum number of retries of one request. Use :code:`0` to disable retrying.
+        :param float backoff_factor: Base delay in seconds. Delay before Nth retry is computed as
+            :code:`backoff_factor * 2 ** (N - 1)`.
+        :param float backoff_max: Maximum delay in seconds. Requests asking (using :code:`Retry-After`
+            header) to wait longer than this are not retried.
+        :param bool jitter: Whether to randomize the delay (using "full jitter", a random delay between
+            zero and the computed one) to avoid synchronized retries of many workers.
+        :param status_forcelist: HTTP status codes which should be retried. Status 500 is not retried
+            by default, because geocaching.com returns it also for non-existing caches.
+        :param methods: HTTP methods which are safe to retry.
+        :param bool respect_retry_after: Whether to respect :code:`Retry-After` response header.
+        :param dict per_endpoint_total: Maximum number of retries of one request per endpoint,
+            overriding :code:`total`. Keys are URL path prefixes (eg. :code:`"api/proxy/web/search"`).
+        :param callable on_retry: Callback called before each retry as
+            :code:`on_retry(url, attempt, delay, cause)`, where :code:`cause` is either an exception
+            or a :class:`requests.Response`. Useful for collecting metrics.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.respect_retry_after = respect_retry_after
+        self.per_endpoint_total = per_endpoint_total or {}
+        self.on_retry = on_retry
+
+    def get_total(self, url):
+        """Return maximum number of retries of one request to given URL.
+
+        :param str url: Request target.
+        """
+        path = urlparse(url).path.lstrip("/")
+        # the longest matching prefix wins
+        for prefix in sorted(self.per_endpoint_total, key=len, reverse=True):
+            if path.startswith(prefix.lstrip("/")):
+                return self.per_endpoint_total[prefix]
+        return self.total
+
+    def is_retryable(self, method, *, error=None, response=None):
+        """Return whether a request failed transiently and can be safely retried.
+
+        :param str method: HTTP method of the request.
+        :param Exception error: Exception raised while sending the request.
+        :param requests.Response response: Received response.
+        """
+        if error is not None:
+            if isinstance(error, requests.exceptions.ConnectTimeout):
+                return True  # the request was not sent, so it is safe to retry any method
+            if not isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                return False
+        elif response is None or response.status_code not in self.status_forcelist:
+            return False
+
+        return method.upper() in self.methods
+
+    def get_backoff(self, attempt):
+        """Return a delay in seconds before given retry attempt.
+
+        :param int attempt: Number of retry, starting with 1.
+        """
+        delay = min(self.backoff_max, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def parse_retry_after(response):
+        """Return a delay in seconds requested by :code:`Retry-After` header, or :code:`None`.
+
+        :param requests.Response response: Received response.
+        """
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            logging.debug("Invalid Retry-After header: {}".format(value))
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get_delay(self, method, url, attempt, *, error=None, response=None):
+        """Return a delay in seconds before next retry, or :code:`None` if the request shouldn't be retried.
+
+        :param str method: HTTP method of the request.
+        :param str url: Request target.
+        :param int attempt: Number of the upcoming retry, starting with 1.
+        :param Exception error: Exception raised while sending the request.
+        :param requests.Response response: Received response.
+        """
+        if attempt > self.get_total(url) or not self.is_retryable(method, error=error, response=response):
+            return None
+
+        delay = self.get_backoff(attempt)
+
+        retry_after = self.parse_retry_after(response) if self.respect_retry_after else None
+        if retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def notify(self, url, attempt, delay, cause):
+        """Log an upcoming retry and call :code:`on_retry` callback if set."""
+        logging.info("Retrying {} (attempt {}) in {:.2f} s because of: {!r}".format(url, attempt, delay, cause))
+        if self.on_retry:
+            self.on_retry(url, attempt, delay, cause)
+
+    def sleep(self, delay):
+        """Wait before next retry."""
+        time.sleep(delay)
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+
+"""A local stand-in for geocaching.com, useful for load testing and benchmarking.
+
+The server speaks the endpoints used by :class:`.Geocaching`, :class:`.Cache` and :class:`.Tile`
+(login, search API, cache details, logbook, tile server and geocoding) and serves deterministic
+synthetic data for them. It is built on the standard library only.
+
+Usage::
+
+    with MockGeocachingServer(latency=0.05, rate_limit=(100, 60)) as server:
+        geocaching = server.geocaching()
+        geocaching.login("user", "password")
+        caches = list(geocaching.load_caches(geocaching.search(Point(50, 14), 100)))
+        print(server.stats())
+"""
+
+import base64
+import hashlib
+import html
+import http.server
+import json
+import logging
+import math
+import random
+import socketserver
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+from pycaching.geo import Point
+from pycaching.util import rot13
+
+# 1x1 transparent PNG
+_png = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+# format: (number, human readable name)
+_types = [
+    (2, "Traditional Cache"),
+    (3, "Multi-cache"),
+    (8, "Unknown Cache"),
+    (5, "Letterbox Hybrid"),
+    (137, "EarthCache"),
+]
+# format: (number, image filename, human readable name)
+_sizes = [(2, "micro", "Micro"), (8, "small", "Small"), (3, "regular", "Regular"), (4, "large", "Large")]
+_ratings = [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0]
+# format: (image filename, human readable name)
+_log_types = [("2", "Found it"), ("3", "Didn't find it"), ("4", "Write note")]
+
+_cache_details_template = """<!DOCTYPE html>
+<html>
+<head>
+<title>{wp} {name} ({type_name}) in Mock Region created by {owner}</title>
+</head>
+<body>
+<form>
+<div class="aspNetHidden">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+</div>
+<div class="aspNetHidden">
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="00000000" />
+</div>
+<div id="cacheDetails" class="span-17 last BottomSpacing">
+<div class="cacheDetailsTitle">
+<a href="/about/cache_types.aspx" class="cacheImage" title="{type_name}">
+<svg class="icon cache-icon" role="presentation">
+<use xlink:href="/app/ui-icons/sprites/cache-types.svg#icon-{type}"></use>
+</svg>
+</a>
+<span class="NoBottomSpacing h2"><span id="ctl00_ContentBody_CacheName">{name}</span></span>
+</div>
+<div class="minorCacheDetails Clear">
+<div id="ctl00_ContentBody_mcd1">A cache by <a href="/p/?guid={owner_guid}">{owner}</a></div>
+<div id="ctl00_ContentBody_mcd2">Hidden : {hidden}</div>
+</div>
+</div>
+<div id="ctl00_ContentBody_diffTerr" class="CacheStarLabels span-6 BottomSpacing">
+<dl><dt>Difficulty:</dt><dd><img src="/images/stars/stars.gif" alt="{difficulty} out of 5" /></dd></dl>
+<dl><dt>Terrain:</dt><dd><img src="/images/stars/stars.gif" alt="{terrain} out of 5" /></dd></dl>
+</div>
+<div id="ctl00_ContentBody_size" class="CacheSize span-5">
+<p>Size: <img src="/images/icons/container/{size}.gif" alt="Size: {size}" /></p>
+</div>
+<span id="uxLatLon">{location}</span>
+<span id="ctl00_ContentBody_ShortDescription">{summary}</span>
+<span id="ctl00_ContentBody_LongDescription"><p>{description}</p></span>
+<div id="div_hint" class="span-8 WrapFix">{hint}</div>
+<span class="favorite-value">{favorites}</span>
+<span id="ctl00_ContentBody_lblFindCounts"><ul class="LogTotals">{log_counts}</ul></span>
+</form>
+<script type="text/javascript">
+var userToken = '{logbook_token}';
+</script>
+</body>
+</html>
+"""
+
+_login_template = """<!DOCTYPE html>
+<html>
+<head><title>Sign in</title></head>
+<body>
+<form method="post">
+<input name="__RequestVerificationToken" type="hidden" value="{token}" />
+<input name="UsernameOrEmail" type="text" />
+<input name="Password" type="password" />
+</form>
+<script type="text/javascript">
+var serverParameters = {{"user:info": {{"username": "{username}"}}}};
+</script>
+</body>
+</html>
+"""
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    # keep-alive connections, so the client connection pools are used like with the real site
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.mock.handle(self, "POST")
+
+    def log_message(self, format, *args):
+        logging.debug("Mock server: " + format % args)
+
+
+class _RedirectingAdapter(HTTPAdapter):
+    """Transport adapter sending requests for geocaching.com hosts to a local server.
+
+    The request seen by the rest of :mod:`requests` keeps its original URL, so cookies and
+    redirects work as with the real site.
+    """
+
+    def __init__(self, target, **kwargs):
+        self._target = urlsplit(target)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        redirected = request.copy()
+        redirected.url = urlunsplit((self._target.scheme, self._target.netloc, parts.path, parts.query, ""))
+        redirected.headers["X-Forwarded-Host"] = parts.netloc
+        response = super().send(redirected, **kwargs)
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class MockGeocachingServer(object):
+    """Local HTTP server imitating geocaching.com.
+
+    Caches have waypoints :code:`GCM00000`, :code:`GCM00001`, ... up to :code:`total_caches` and
+    their details are generated from the waypoint, so all endpoints return consistent data for one
+    cache. Tiles contain randomly chosen existing caches (their positions in the tile don't match the
+    cache locations).
+
+    The server runs in a background thread and handles each request in its own thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        host="127.0.0.1",
+        port=0,
+        latency=0,
+        rate_limit=None,
+        rate_limit_probability=0,
+        rate_limit_reset=60,
+        total_caches=1000,
+        logs_per_cache=50,
+        caches_per_tile=20,
+        require_png=False,
+        etags=False,
+        accounts=None,
+        center=(50.08, 14.42),
+        seed=0,
+    ):
+        """Configure the server.
+
+        :param str host: Address to listen on.
+        :param int port: Port to listen on, the default :code:`0` picks a free one.
+        :param latency: Delay of each response in seconds, either a number or a :code:`(min, max)`
+            tuple to pick a random delay for each request.
+        :param tuple rate_limit: Maximum number of requests per account (or per client address for
+            anonymous requests) in a time window as :code:`(requests, seconds)`. Requests over the
+            limit get HTTP 429 like from the real site.
+        :param float rate_limit_probability: Probability of answering any request with HTTP 429
+            regardless of :code:`rate_limit`.
+        :param int rate_limit_reset: Seconds reported in :code:`x-rate-limit-reset` header of injected
+            HTTP 429 responses.
+        :param int total_caches: Number of existing caches, also the total count of search results.
+        :param int logs_per_cache: Number of logs in each cache logbook.
+        :param int caches_per_tile: Number of caches in each UTFGrid tile.
+        :param bool require_png: Whether UTFGrid is served (instead of HTTP 204) only after the
+            client downloaded the same map tile image.
+        :param bool etags: Whether cache details pages have an :code:`ETag` header and are answered
+            by HTTP 304 to conditional requests if unchanged.
+        :param dict accounts: Mapping of usernames to passwords accepted by login. If :code:`None`,
+            any credentials are accepted.
+        :param tuple center: Latitude and longitude around which the caches are placed.
+        :param int seed: Seed for the generated data.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_probability = rate_limit_probability
+        self.rate_limit_reset = rate_limit_reset
+        self.total_caches = total_caches
+        self.logs_per_cache = logs_per_cache
+        self.caches_per_tile = caches_per_tile
+        self.require_png = require_png
+        self.etags = etags
+        self.accounts = accounts
+        self.center = center
+        self.seed = seed
+
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._sessions = {}  # format: { cookie: username }
+        self._windows = {}  # format: { client: [window start, request count] }
+        self._primed_tiles = set()  # format: { (client, x, y, z) }
+        self._stats = Counter()
+        self._routes = {
+            ("GET", "/account/signin"): self._login_page,
+            ("POST", "/account/signin"): self._login,
+            ("GET", "/api/proxy/web/search/v2"): self._search,
+            ("GET", "/api/geocode"): self._geocode,
+            ("GET", "/seek/cache_details.aspx"): self._cache_details,
+            ("GET", "/seek/geocache.logbook"): self._logbook,
+            ("GET", "/map.details"): self._tile_details,
+            ("GET", "/map.png"): self._tile_image,
+            ("GET", "/map.info"): self._tile_grid,
+        }
+
+    # server lifecycle ------------------------------------------------------------------------
+
+    @property
+    def url(self):
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._server = _Server((self.host, self.port), _RequestHandler)
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-geocaching", daemon=True)
+        self._thread.start()
+        logging.info("Mock geocaching.com server running at {}".format(self.url))
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # client setup ----------------------------------------------------------------------------
+
+    def mount(self, session, **adapter_options):
+        """Route all geocaching.com requests of a :class:`requests.Session` to this server.
+
+        :param requests.Session session: Session to modify.
+        :param adapter_options: Passed to :class:`requests.adapters.HTTPAdapter`.
+        """
+        from pycaching.geocaching import Geocaching
+
+        for prefix in Geocaching._pooled_hosts + ("http://www.geocaching.com",):
+            session.mount(prefix, _RedirectingAdapter(self.url, **adapter_options))
+
+    def geocaching(self, **kwargs):
+        """Return a :class:`.Geocaching` instance talking to this server.
+
+        :param kwargs: Passed to :class:`.Geocaching`. Its connection pool options are used for the
+            connections to the server.
+        """
+        from pycaching.geocaching import Geocaching
+
+        geocaching = Geocaching(**kwargs)
+        self.mount(geocaching._session, **geocaching._pool_options)
+        return geocaching
+
+    def stats(self):
+        """Return number of served responses by endpoint and status code.
+
+        :return: Mapping of :code:`(path, status)` tuples to counts.
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        """Forget collected statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    # synthetic data --------------------------------------------------------------------------
+
+    def get_wp(self, index):
+        """Return the waypoint of N-th cache."""
+        return "GCM{:05d}".format(index)
+
+    def get_cache_data(self, wp):
+        """Return generated details of a cache, or :code:`None` if it doesn't exist.
+
+        :param str wp: Cache waypoint.
+        :rtype: :class:`dict`
+        """
+        wp = wp.upper()
+        prefix, index = wp[:3], wp[3:]
+        if prefix != "GCM" or not index.isdigit() or int(index) >= self.total_caches:
+            return None
+
+        index = int(index)
+        rnd = random.Random("{}:{}".format(self.seed, wp))
+        type, type_name = rnd.choice(_types)
+        size_number, size, size_name = rnd.choice(_sizes)
+        owner = "mock-owner-{}".format(index % 97)
+        return {
+            "index": index,
+            "wp": wp,
+            "guid": str(uuid.uuid5(uuid.NAMESPACE_URL, "{}/{}".format(self.seed, wp))),
+            "name": "Mock cache {}".format(index),
+            "type": type,
+            "type_name": type_name,
+            "size_number": size_number,
+            "size": size,
+            "size_name": size_name,
+            "difficulty": rnd.choice(_ratings),
+            "terrain": rnd.choice(_ratings),
+            "owner": owner,
+            "owner_guid": str(uuid.uuid5(uuid.NAMESPACE_URL, owner)),
+            "hidden": date(2001, 1, 1) + timedelta(days=rnd.randrange(8000)),
+            "favorites": rnd.randrange(500),
+            "latitude": round(self.center[0] + rnd.uniform(-0.5, 0.5), 5),
+            "longitude": round(self.center[1] + rnd.uniform(-0.5, 0.5), 5),
+            "logbook_token": "MOCKTOKEN{}".format(wp),
+        }
+
+    def _get_log_data(self, cache, index):
+        rnd = random.Random("{}:{}:{}".format(self.seed, cache["wp"], index))
+        log_type, log_type_name = rnd.choice(_log_types)
+        return {
+            "LogGuid": str(uuid.uuid5(uuid.NAMESPACE_URL, "{}/log/{}".format(cache["wp"], index))),
+            "LogTypeID": int(log_type),
+            "LogType": log_type_name,
+            "LogTypeImage": "{}.png".format(log_type),
+            "LogText": "<p>Mock log {} of {}.</p>".format(index, cache["wp"]),
+            "Visited": (cache["hidden"] + timedelta(days=index)).strftime("%m/%d/%Y"),
+            "UserName": "mock-user-{}".format(rnd.randrange(1000)),
+        }
+
+    # request handling ------------------------------------------------------------------------
+
+    def handle(self, handler, method):
+        """Dispatch a request to the endpoint implementation and send the response."""
+        url = urlsplit(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        route = self._routes.get((method, url.path))
+
+        delay = self.latency if not isinstance(self.latency, tuple) else self._random.uniform(*self.latency)
+        if delay:
+            time.sleep(delay)
+
+        client = self._get_username(handler) or handler.client_address[0]
+        if route is None:
+            status, headers, body = 404, {}, b"Not found"
+        elif url.path != "/account/signin" and self._is_rate_limited(client):
+            status, headers, body = self._too_many_requests(client)
+        else:
+            status, headers, body = route(handler, params, client)
+
+        if isinstance(body, str):
+            headers.setdefault("Content-Type", "text/html; charset=utf-8")
+            body = body.encode("utf-8")
+        elif not isinstance(body, bytes):
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
+            body = json.dumps(body).encode("utf-8")
+
+        with self._lock:
+            self._stats[url.path, status] += 1
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _get_username(self, handler):
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        if "gspkauth" not in cookie:
+            return None
+        with self._lock:
+            return self._sessions.get(cookie["gspkauth"].value)
+
+    def _is_rate_limited(self, client):
+        if self.rate_limit_probability and self._random.random() < self.rate_limit_probability:
+            return True
+        if not self.rate_limit:
+            return False
+
+        limit, period = self.rate_limit
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(client)
+            if window is None or now - window[0] >= period:
+                window = self._windows[client] = [now, 0]
+            window[1] += 1
+            return window[1] > limit
+
+    def _too_many_requests(self, client):
+        reset = self.rate_limit_reset
+        if self.rate_limit:
+            with self._lock:
+                window = self._windows.get(client)
+                if window:
+                    reset = max(0, math.ceil(window[0] + self.rate_limit[1] - time.monotonic()))
+        return 429, {"x-rate-limit-reset": str(reset)}, {"statusCode": 429, "statusMessage": "Too Many Requests"}
+
+    # endpoints -------------------------------------------------------------------------------
+
+    def _login_page(self, handler, params, client):
+        username = self._get_username(handler) or ""
+        return 200, {}, _login_template.format(token=uuid.uuid4().hex, username=html.escape(username))
+
+    def _login(self, handler, params, client):
+        length = int(handler.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(handler.rfile.read(length).decode("utf-8")).items()}
+        username, password = form.get("UsernameOrEmail"), form.get("Password")
+
+        if not username or (self.accounts is not None and self.accounts.get(username) != password):
+            return 200, {}, _login_template.format(token=uuid.uuid4().hex, username="")
+
+        cookie = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[cookie] = username
+        headers = {"Set-Cookie": "gspkauth={}; domain=.geocaching.com; path=/; httponly".format(cookie)}
+        return 200, headers, _login_template.format(token=uuid.uuid4().hex, username=html.escape(username))
+
+    def _search(self, handler, params, client):
+        take, skip = int(params.get("take", 50)), int(params.get("skip", 0))
+        results = []
+        for index in range(skip, min(skip + take, self.total_caches)):
+            cache = self.get_cache_data(self.get_wp(index))
+            results.append(
+                {
+                    "id": index,
+                    "name": cache["name"],
+                    "code": cache["wp"],
+                    "premiumOnly": False,
+                    "favoritePoints": cache["favorites"],
+                    "geocacheType": cache["type"],
+                    "containerType": cache["size_number"],
+                    "difficulty": cache["difficulty"],
+                    "terrain": cache["terrain"],
+                    "cacheStatus": 0,
+                    "postedCoordinates": {"latitude": cache["latitude"], "longitude": cache["longitude"]},
+                    "detailsUrl": "/geocache/{}".format(cache["wp"]),
+                    "placedDate": cache["hidden"].isoformat() + "T00:00:00",
+                    "owner": {"code": "PR0", "username": cache["owner"]},
+                }
+            )
+        return 200, {}, {"results": results, "total": self.total_caches}
+
+    def _geocode(self, handler, params, client):
+        query = params.get("q", "").strip()
+        if not query:
+            return 200, {}, {"status": "failed", "msg": "Query was empty", "errMessage": ""}
+        rnd = random.Random("{}:{}".format(self.seed, query.lower()))
+        return (
+            200,
+            {},
+            {"status": "success", "data": {"q": query, "lat": rnd.uniform(-60, 60), "lng": rnd.uniform(-180, 180)}},
+        )
+
+    def _cache_details(self, handler, params, client):
+        cache = self.get_cache_data(params.get("wp", ""))
+        if cache is None:
+            return 404, {}, "Not found"
+
+        log_counts = Counter(self._get_log_data(cache, i)["LogTypeImage"] for i in range(self.logs_per_cache))
+        page = _cache_details_template.format(
+            wp=cache["wp"],
+            name=html.escape(cache["name"]),
+            type=cache["type"],
+            type_name=cache["type_name"],
+            owner=html.escape(cache["owner"]),
+            owner_guid=cache["owner_guid"],
+            hidden=cache["hidden"].strftime("%m/%d/%Y"),
+            difficulty="{:g}".format(cache["difficulty"]),
+            terrain="{:g}".format(cache["terrain"]),
+            size=cache["size"],
+            location=Point(cache["latitude"], cache["longitude"]).format_gc(),
+            summary="Summary of {}.".format(cache["wp"]),
+            description="Description of {}. ".format(cache["wp"]) * 20,
+            hint=rot13("Hint for {}".format(cache["wp"])),
+            favorites=cache["favorites"],
+            log_counts="".join(
+                '<li><img src="/images/logtypes/{}" /> {}</li>'.format(image, count)
+                for image, count in sorted(log_counts.items())
+            ),
+            logbook_token=cache["logbook_token"],
+        )
+        if not self.etags:
+            return 200, {}, page
+
+        etag = '"{}"'.format(hashlib.sha1(page.encode("utf-8")).hexdigest())
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, page
+
+    def _logbook(self, handler, params, client):
+        token = params.get("tkn", "")
+        prefix, wp = token[:9], token[9:]
+        cache = self.get_cache_data(wp) if prefix == "MOCKTOKEN" else None
+        if cache is None:
+            return 200, {}, {"status": "error", "msg": "Invalid token"}
+
+        page, per_page = int(params.get("idx", 1)), int(params.get("num", 10))
+        start = (page - 1) * per_page
+        logs = [self._get_log_data(cache, i) for i in range(start, min(start + per_page, self.logs_per_cache))]
+        page_info = {
+            "idx": page,
+            "size": per_page,
+            "totalRows": self.logs_per_cache,
+            "totalPages": math.ceil(self.logs_per_cache / per_page),
+            "rows": len(logs),
+        }
+        return 200, {}, {"status": "success", "data": logs, "pageInfo": page_info}
+
+    def _tile_details(self, handler, params, client):
+        cache = self.get_cache_data(params.get("i", ""))
+        if cache is None:
+            return 200, {}, {"status": "failed", "msg": "Cache not found"}
+
+        data = {
+            "name": cache["name"],
+            "gc": cache["wp"],
+            "g": cache["guid"],
+            "available": True,
+            "archived": False,
+            "subrOnly": False,
+            "li": False,
+            "fp": str(cache["favorites"]),
+            "difficulty": {"text": cache["difficulty"], "value": str(cache["difficulty"])},
+            "terrain": {"text": cache["terrain"], "value": str(cache["terrain"])},
+            "hidden": cache["hidden"].strftime("%m/%d/%Y"),
+            "container": {"text": cache["size_name"], "value": cache["size"] + ".gif"},
+            "type": {"text": cache["type_name"], "value": cache["type"]},
+            "owner": {"text": cache["owner"], "value": cache["owner_guid"]},
+        }
+        return 200, {}, {"status": "success", "data": [data]}
+
+    def _tile_image(self, handler, params, client):
+        with self._lock:
+            self._primed_tiles.add((client, params.get("x"), params.get("y"), params.get("z")))
+        return 200, {"Content-Type": "image/png"}, _png
+
+    def _tile_grid(self, handler, params, client):
+        tile = params.get("x"), params.get("y"), params.get("z")
+        if self.require_png:
+            with self._lock:
+                if (client,) + tile not in self._primed_tiles:
+                    return 204, {}, b""
+
+        rnd = random.Random("{}:{}:{}:{}".format(self.seed, *tile))
+        size, block = 64, 3
+        keys, data = [""], {}
+        grid = [[0] * size for _ in range(size)]
+
+        # place caches as non-overlapping 3x3 blocks on a 21x21 lattice
+        count = min(self.caches_per_tile, (size // block) ** 2, self.total_caches)
+        positions = rnd.sample(range((size // block) ** 2), count)
+        for position, index in zip(positions, rnd.sample(range(self.total_caches), count)):
+            cache = self.get_cache_data(self.get_wp(index))
+            x0, y0 = position % (size // block) * block, position // (size // block) * block
+            for y in range(y0, y0 + block):
+                for x in range(x0, x0 + block):
+                    key = "({}, {})".format(x, y)
+                    keys.append(key)
+                    data[key] = [{"i": cache["wp"], "n": cache["name"]}]
+                    grid[y][x] = len(keys) - 1
+
+        # UTFGrid encoding of key indexes, see https://github.com/mapbox/utfgrid-spec
+        def encode(index):
+            code = index + 32
+            code += code >= 34
+            code += code >= 92
+            return chr(code)
+
+        grid = ["".join(encode(i) for i in row) for row in grid]
+        return 200, {}, {"grid": grid, "keys": keys, "data": data}
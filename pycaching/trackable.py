@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+from array import array
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
 from pycaching import errors
 from pycaching.util import format_date, lazy_loaded
 
@@ -166,6 +169,59 @@ class Trackable(object):
             self.load()  # fills self._kml_url
         return self.geocaching._request(self._kml_url, expect="raw").text
 
+    def route(self, *, chunk_size=64 * 1024):
+        """Return the route of the trackable parsed from its KML.
+
+        The KML is parsed incrementally while it is being downloaded, so neither the whole document
+        nor its DOM are held in memory. Use :func:`.geo.route_length` to compute the travel distance.
+
+        :param int chunk_size: Size of downloaded chunks in bytes.
+        :return: Flat array of route coordinates in form :code:`[lat1, lon1, lat2, lon2, ...]`.
+        :rtype: :class:`array.array` of :code:`"d"`
+        :raise .LoadError: If the KML cannot be parsed (eg. it is malformed or truncated).
+        """
+        if not self._kml_url:
+            self.load()  # fills self._kml_url
+        res = self.geocaching._request(self._kml_url, expect="raw", stream=True)
+
+        route = array("d")
+        parser = XMLPullParser(events=("start", "end"))
+        in_route = False
+        try:
+            with res:  # release the connection even if the parsing fails
+                for chunk in res.iter_content(chunk_size):
+                    parser.feed(chunk)
+                    in_route = self._parse_route_events(parser, route, in_route)
+            parser.close()
+            self._parse_route_events(parser, route, in_route)
+        except (ParseError, ValueError) as e:
+            raise errors.LoadError("Cannot parse trackable route") from e
+
+        return route
+
+    @staticmethod
+    def _parse_route_events(parser, route, in_route):
+        """Consume pending KML parser events and append route coordinates to the array.
+
+        Only coordinates of a :code:`LineString` element are taken, placemarks of individual stops
+        are skipped. Finished elements are cleared to keep the memory usage constant.
+
+        :return: Whether the parser is currently inside of a :code:`LineString` element.
+        """
+        for event, element in parser.read_events():
+            tag = element.tag.rsplit("}", 1)[-1]  # strip namespace
+            if tag == "LineString":
+                in_route = event == "start"
+            elif event == "end":
+                if in_route and tag == "coordinates":
+                    # KML coordinates are "lon,lat[,alt]" tuples separated by whitespace
+                    for coords in (element.text or "").split():
+                        lon, lat = coords.split(",")[:2]
+                        route.append(float(lat))
+                        route.append(float(lon))
+                element.clear()
+        return in_route
+
     def load(self):
         """Load all possible details about the trackable.
 
@@ -183,27 +239,12 @@ class Trackable(object):
         else:
             raise errors.LoadError("Trackable lacks info for loading")
 
-        # make request
-        root = self.geocaching._request(url)
-
-        # parse data
-        self.tid = root.find("span", "CoordInfoCode").text
-        self.name = root.find(id="ctl00_ContentBody_lbHeading").text
-        self.type = root.find(id="ctl00_ContentBody_BugTypeImage").get("alt")
-        self.owner = root.find(id="ctl00_ContentBody_BugDetails_BugOwner").text
-        self.goal = root.find(id="TrackableGoal").text
-        self.description = root.find(id="TrackableDetails").text
-        self._kml_url = root.find(id="ctl00_ContentBody_lnkGoogleKML").get("href")
-
-        # another Groundspeak trick... inconsistent relative / absolute URL on one page
-        self._log_page_url = "/track/" + root.find(id="ctl00_ContentBody_LogLink")["href"]
-
-        location_raw = root.find(id="ctl00_ContentBody_BugDetails_BugLocation")
-        location_url = location_raw.get("href", "")
-        if "cache_details" in location_url:
-            self.location = location_url
-        else:
-            self.location = location_raw.text
+        # imports are here to not slow down importing of this module
+        from pycaching.parsers import parse_trackable
+
+        # make request and parse data
+        for name, value in parse_trackable(self.geocaching._request(url)).items():
+            setattr(self, name, value)
 
     def _load_log_page(self):
         """Load a logging page for this trackable.
@@ -213,19 +254,10 @@ class Trackable(object):
         """
         if not self._log_page_url:
             self.load()  # fills self._log_page_url
-        log_page = self.geocaching._request(self._log_page_url)
-
-        # find all valid log types for the trackable (-1 removes "- select type of log -")
-        valid_types = {o["value"] for o in log_page.find_all("option") if o["value"] != "-1"}
-
-        # find all static data fields needed for log
-        hidden_inputs = log_page.find_all("input", type=["hidden"])
-        hidden_inputs = {i["name"]: i.get("value", "") for i in hidden_inputs}
-
-        # get user date format
-        date_format = log_page.find(id="ctl00_ContentBody_LogBookPanel1_uxDateFormatHint").text.strip("()")
+        from pycaching.parsers import parse_trackable_log_page
 
-        return valid_types, hidden_inputs, date_format
+        data = parse_trackable_log_page(self.geocaching._request(self._log_page_url))
+        return set(data["valid_types"]), data["hidden_inputs"], data["date_format"]
 
     def post_log(self, log, tracking_code):
         """Post a log for this trackable.
@@ -57,6 +57,36 @@ def deprecated(func):
     return new_func
 
 
+def synchronized(lock_name):
+    """Decorator running a method while holding a lock stored in given attribute of the instance."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with getattr(self, lock_name):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def process_pool(max_workers=None):
+    """Return a :class:`concurrent.futures.ProcessPoolExecutor` for CPU heavy work, eg. parsing.
+
+    Workers are started by a fork server where available, so a process with running threads is
+    never forked.
+
+    :param int max_workers: Number of processes, defaults to the number of CPUs.
+    """
+    # imports are here to not slow down importing of this module
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
+
+
 def rot13(text):
     """Return a text encoded by rot13 cipher."""
     # Translate only the text outside of the square brackets
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from benchmarks.runner import compare, get_benchmarks, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run(self):
+        """Run each benchmark once to make sure the replayed cassettes still match the code."""
+        results = run_benchmarks(get_benchmarks(), repeat=1, warmup=0)
+        self.assertIn("cache.load", results["benchmarks"])
+        self.assertEqual(200, results["benchmarks"]["cache.load_logbook"]["items"])
+        self.assertEqual(100, results["benchmarks"]["geocaching.advanced_search.paging"]["items"])
+
+    def test_filter(self):
+        self.assertEqual(
+            ["cache.load", "cache.load_by_guid"], [b.name for b in get_benchmarks(["cache.load*y*", "cache.load"])]
+        )
+
+    def test_compare(self):
+        def results(**medians):
+            return {"benchmarks": {name.replace("_", "."): {"median": value} for name, value in medians.items()}}
+
+        comparisons = compare(results(a=1.5, b=1.0, c=0.5, d=1.0), results(a=1.0, b=1.05, c=1.0, e=1.0), threshold=0.1)
+        self.assertEqual(
+            [("a", "regression"), ("b", "unchanged"), ("c", "improvement"), ("d", "new"), ("e", "missing")],
+            [(c.name, c.status) for c in comparisons],
+        )
+        self.assertAlmostEqual(1.5, comparisons[0].ratio)
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import io
+import json
 import unittest
 from datetime import date
 from unittest import mock
@@ -6,7 +8,7 @@ from unittest import mock
 from pycaching.cache import Cache, Size, Status, Type, Waypoint
 from pycaching.errors import LoadError, PMOnlyException
 from pycaching.errors import ValueError as PycachingValueError
-from pycaching.geo import Point
+from pycaching.geo import Coordinates, Point
 from pycaching.geocaching import Geocaching
 from pycaching.log import Log
 from pycaching.log import Type as LogType
@@ -14,6 +16,11 @@ from pycaching.util import parse_date
 
 from . import LoggedInTest
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 class TestProperties(unittest.TestCase):
     def setUp(self):
@@ -84,6 +91,11 @@ class TestProperties(unittest.TestCase):
             self.c.location = "S 36 51.918 E 174 46.725"
             self.assertEqual(self.c.location, Point.from_string("S 36 51.918 E 174 46.725"))
 
+        with self.subTest("lazy conversion of coordinates"):
+            self.c.location = Coordinates(49.75205, 13.36872)
+            self.assertIsInstance(self.c.location, Point)
+            self.assertEqual(self.c.location, Point(49.75205, 13.36872))
+
         with self.subTest("filter invalid string"):
             with self.assertRaises(PycachingValueError):
                 self.c.location = "somewhere"
@@ -203,6 +215,155 @@ class TestProperties(unittest.TestCase):
         self.assertEqual(self.c.pm_only, False)
 
 
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+        self.c = Cache(
+            self.gc,
+            "GC12345",
+            name="Testing",
+            type=Type.mystery,
+            location=Coordinates(50.1, 14.2),
+            original_location=Point(50.0, 14.0),
+            status=Status.disabled,
+            found=True,
+            size=Size.micro,
+            difficulty=1.5,
+            terrain=5,
+            author="human",
+            hidden=date(2000, 1, 1),
+            attributes={"onehour": True, "kids": False},
+            summary="text",
+            description="Luftballon",
+            description_html="<b>Luftballon</b>",
+            hint="rot13",
+            favorites=3,
+            pm_only=False,
+            waypoints={"PK": Waypoint("PK", "Parking", Coordinates(50.1, 14.1), "Note"), "S1": Waypoint("S1")},
+            log_counts={LogType.found_it: 5, LogType.note: 1},
+            _logbook_token="token",
+            _trackable_page_url="track.aspx",
+            guid="53d34c4d-12b5-4771-86d3-89318f71efb1",
+            visited=date(2020, 2, 2),
+        )
+
+    def test_to_dict(self):
+        with mock.patch.object(Cache, "load") as load:
+            data = self.c.to_dict()
+            self.assertEqual({"wp": "GC12345", "name": "Testing"}, Cache(self.gc, "GC12345", name="Testing").to_dict())
+        load.assert_not_called()
+
+        self.assertEqual(data, json.loads(json.dumps(data)))
+        self.assertEqual([50.1, 14.2], data["location"])
+        self.assertEqual("8", data["type"])
+        self.assertEqual("2000-01-01", data["hidden"])
+        self.assertEqual({"2": 5, "4": 1}, data["log_counts"])
+        self.assertEqual(
+            {"id": "PK", "type": "Parking", "location": [50.1, 14.1], "note": "Note"}, data["waypoints"]["PK"]
+        )
+        self.assertEqual("token", data["_logbook_token"])
+
+        with self.subTest("not loaded only"):
+            cache = Cache(self.gc, "GC12345")
+
+            def load():
+                cache.name = "Loaded"
+
+            with mock.patch.object(cache, "load", side_effect=load):
+                self.assertEqual("Loaded", cache.to_dict(loaded_only=False)["name"])
+
+    def test_from_dict(self):
+        data = self.c.to_dict()
+        cache = Cache.from_dict(self.gc, data)
+        with mock.patch.object(Cache, "load") as load:
+            self.assertEqual(data, cache.to_dict())
+            self.assertEqual({}, self.c.diff(cache))
+            self.assertEqual(Point(50.1, 14.2), cache.location)
+            self.assertEqual(Point(50.0, 14.0), cache.original_location)
+            self.assertEqual(Type.mystery, cache.type)
+            self.assertEqual(5, cache.log_counts[LogType.found_it])
+            self.assertEqual("Note", cache.waypoints["PK"].note)
+            self.assertIsNone(cache.waypoints["S1"].location)
+            self.assertTrue(cache.found)
+            self.assertEqual(date(2020, 2, 2), cache.visited)
+        load.assert_not_called()
+
+    def test_dump_many(self):
+        caches = [self.c, Cache(self.gc, "GC1", name="Other")]
+        formats = ["jsonl"] + (["msgpack"] if msgpack else [])
+        for format in formats:
+            with self.subTest(format):
+                file = io.BytesIO()
+                self.assertEqual(2, Cache.dump_many(caches, file, format=format))
+                file.seek(0)
+                loaded = list(Cache.read_many(self.gc, file, format=format))
+                self.assertEqual([c.to_dict() for c in caches], [c.to_dict() for c in loaded])
+
+        with self.subTest("unknown format"):
+            with self.assertRaises(PycachingValueError):
+                Cache.dump_many(caches, io.BytesIO(), format="xml")
+            with self.assertRaises(PycachingValueError):
+                next(Cache.read_many(self.gc, io.BytesIO(), format="xml"))
+
+
+class TestChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+        self.old = Cache(
+            self.gc,
+            "GC12345",
+            name="Testing",
+            status=Status.enabled,
+            location=Coordinates(50.0, 14.0),
+            hidden=date(2000, 1, 1),
+            attributes={"kids": False},
+            waypoints={"PK": Waypoint("PK", "Parking", Coordinates(50.1, 14.1), "Note")},
+            log_counts={LogType.found_it: 5},
+        )
+        self.new = Cache(
+            self.gc,
+            "GC12345",
+            name="Testing",
+            status=Status.disabled,
+            location=Point(50.0, 14.0),
+            hidden=date(2000, 1, 1),
+            attributes={"kids": False},
+            waypoints={"PK": Waypoint("PK", "Parking", Point(50.1, 14.1), "Other note")},
+            log_counts={LogType.found_it: 5},
+            description="Loaded only in the new snapshot",
+        )
+
+    def test_fingerprint(self):
+        old, new = self.old.fingerprint(), self.new.fingerprint()
+        self.assertEqual({"status", "location", "details", "attributes", "waypoints", "logs"}, set(old))
+        self.assertEqual(set(old) | {"description"}, set(new))
+        self.assertEqual(old["location"], new["location"])
+        self.assertEqual(old["logs"], new["logs"])
+        self.assertNotEqual(old["status"], new["status"])
+        self.assertNotEqual(old["waypoints"], new["waypoints"])
+
+        with self.subTest("stable"):
+            self.assertEqual(old, self.old.fingerprint())
+
+    def test_diff(self):
+        with mock.patch.object(Cache, "load") as load:
+            changes = self.old.diff(self.new)
+        load.assert_not_called()
+        self.assertEqual({"status", "waypoints"}, set(changes))
+        self.assertEqual((Status.enabled, Status.disabled), changes["status"])
+        self.assertEqual({}, self.old.diff(self.old))
+
+    def test_diff_snapshots(self):
+        added, removed = Cache(self.gc, "GC1"), Cache(self.gc, "GC2")
+        unchanged = [Cache(self.gc, "GC3", name="Same"), Cache(self.gc, "GC3", name="Same")]
+        result = list(Cache.diff_snapshots([self.old, removed, unchanged[0]], [unchanged[1], self.new, added]))
+
+        self.assertEqual(["GC12345", "GC1", "GC2"], [change.wp for change in result])
+        self.assertEqual({"status", "waypoints"}, set(result[0].changes))
+        self.assertEqual((None, added), result[1][1:3])
+        self.assertEqual((removed, None), result[2][1:3])
+
+
 class TestMethods(LoggedInTest):
     @classmethod
     def setUpClass(cls):
@@ -476,6 +637,11 @@ class TestWaypointProperties(unittest.TestCase):
             self.w.location = "S 36 51.918 E 174 46.725"
             self.assertEqual(self.w.location, Point.from_string("S 36 51.918 E 174 46.725"))
 
+        with self.subTest("lazy conversion of coordinates"):
+            self.w.location = Coordinates(49.75205, 13.36872)
+            self.assertIsInstance(self.w.location, Point)
+            self.assertEqual(self.w.location, Point(49.75205, 13.36872))
+
         with self.subTest("filter invalid string"):
             with self.assertRaises(PycachingValueError):
                 self.w.location = "somewhere"
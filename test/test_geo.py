@@ -9,8 +9,25 @@ from unittest import mock
 from geopy.distance import great_circle
 
 from pycaching import Cache
-from pycaching.errors import BadBlockError, GeocodeError
-from pycaching.geo import Block, Point, Polygon, Rectangle, Tile, UTFGridPoint, to_decimal
+from pycaching.errors import BadBlockError, Error, GeocodeError
+from pycaching.errors import ValueError as PycachingValueError
+from pycaching.geo import (
+    Block,
+    Coordinates,
+    Point,
+    Polygon,
+    Rectangle,
+    Tile,
+    TileScheduler,
+    UTFGridPoint,
+    _decode_utfgrid_data,
+    parse_coordinates,
+    points_to_tiles,
+    route_length,
+    tiles_to_points,
+    to_decimal,
+)
+from pycaching.testing import MockGeocachingServer
 
 from . import LoggedInTest
 
@@ -137,6 +154,49 @@ class TestPoint(LoggedInTest):
         self.assertEqual(Point(-49.73012, -13.40102).format_gc(), "S 49° 43.807, W 13° 24.061")
 
 
+class TestCoordinates(unittest.TestCase):
+    def setUp(self):
+        self.c = Coordinates(49.75205, 13.36872)
+        self.p = Point(49.75205, 13.36872)
+
+    def test_equality(self):
+        self.assertEqual(self.c, self.p)
+        self.assertEqual(self.p, self.c)
+        self.assertNotEqual(self.c, Coordinates(49.75205, 13.0))
+        self.assertNotEqual(self.c, None)
+
+    def test_to_point(self):
+        point = Coordinates(49.75205, 13.36872, precision=10).to_point()
+        self.assertIsInstance(point, Point)
+        self.assertEqual(self.p, point)
+        self.assertEqual(10, point.precision)
+
+        with self.subTest("geopy parsing is skipped"):
+            with mock.patch.object(Point, "__new__") as new:
+                self.assertEqual(self.p, Coordinates(49.75205, 13.36872).to_point())
+            new.assert_not_called()
+
+    def test_from_string(self):
+        self.assertEqual(self.c, Coordinates.from_string("N 49 45.123 E 013 22.123"))
+        self.assertEqual(Point.from_string("49.3, 13.2"), Coordinates.from_string("49.3, 13.2"))
+        with self.assertRaises(PycachingValueError):
+            Coordinates.from_string("somewhere")
+
+    def test_format_gc(self):
+        self.assertEqual(self.p.format_gc(), self.c.format_gc())
+        self.assertEqual(self.p.format_gc(), str(self.c))
+
+    def test_geopy(self):
+        self.assertEqual(great_circle(self.p, Point(50, 14)).meters, great_circle(self.c, Point(50, 14)).meters)
+        self.assertEqual(self.p, Point(self.c))
+
+    def test_unchecked_point(self):
+        point = Point._unchecked(49.75205, 13.36872, 5)
+        self.assertEqual(self.p, point)
+        self.assertEqual(5, point.precision)
+        self.assertEqual(self.p.format_gc(), point.format_gc())
+
+
 class TestPolygon(unittest.TestCase):
     def setUp(self):
         self.p = Polygon(*[Point(*i) for i in [(10.0, 20.0), (30.0, -5.0), (-10.0, -170.0), (-70.0, 0.0), (0.0, 40)]])
@@ -160,6 +220,35 @@ class TestPolygon(unittest.TestCase):
         with self.subTest("longitude"):
             self.assertEqual(mp.longitude, -23.0)
 
+    def test_tile_cover(self):
+        triangle = Polygon(Point(50.0, 14.0), Point(50.0, 15.0), Point(49.0, 14.0))
+        cover = list(triangle.tile_cover(10))
+        bounding_box = {(t.x, t.y, t.z) for t in triangle.to_tiles(None, 10)}
+
+        self.assertEqual(len(cover), len(set(cover)))
+        self.assertLess(set(cover), bounding_box)
+        self.assertEqual(sorted(cover, key=lambda t: (t[2], t[1], t[0])), cover)
+        for p in triangle.points + (Point(49.5, 14.25),):
+            tile = p.to_tile(None, 10)
+            self.assertIn((tile.x, tile.y, 10), cover)
+        self.assertNotIn((Point(49.1, 14.9).to_tile(None, 10).x, Point(49.1, 14.9).to_tile(None, 10).y, 10), cover)
+
+        with self.subTest("multiple zoom levels"):
+            cover = list(triangle.tile_cover([5, 10]))
+            self.assertEqual([(17, 10, 5)], [t for t in cover if t[2] == 5])
+            self.assertEqual(list(triangle.tile_cover(10)), [t for t in cover if t[2] == 10])
+
+        with self.subTest("rectangle covers its bounding box"):
+            rect = Rectangle(Point(50.0, 14.0), Point(49.0, 15.0))
+            self.assertEqual(
+                {(t.x, t.y, t.z) for t in rect.to_tiles(None, 10)},
+                {(t.x, t.y, t.z) for t in rect.to_tiles(None, 10, exact=True)},
+            )
+
+        with self.subTest("area inside one tile"):
+            small = Polygon(Point(49.75, 13.36), Point(49.75, 13.361), Point(49.749, 13.36))
+            self.assertEqual([(8800, 5574, 14)], list(small.tile_cover(14)))
+
 
 class TestRectangle(unittest.TestCase):
     def setUp(self):
@@ -219,6 +308,20 @@ class TestTile(LoggedInTest):
             expected_caches.pop(c.wp)
         self.assertEqual(len(expected_caches), 0)
 
+    def test_decode_utfgrid_data(self):
+        data = {
+            "(1, 2)": [{"i": "GC1", "n": "One"}, {"i": "GC2", "n": "Two"}],
+            "(1,3)": [{"i": "GC1", "n": "One"}, {"i": "GC1", "n": "One"}],
+        }
+        caches = _decode_utfgrid_data(data)
+        self.assertEqual({"GC1", "GC2"}, set(caches))
+        name, xs, ys = caches["GC1"]
+        self.assertEqual(("One", [1, 1], [2, 3]), (name, list(xs), list(ys)))
+
+        with self.subTest("invalid key"):
+            with self.assertRaises(Error):
+                _decode_utfgrid_data({"(1, x)": []})
+
     def test_precision(self):
         with self.subTest("with point coorection"):
             t1 = make_tile(0, 0, 14)[0]
@@ -238,6 +341,106 @@ class TestTile(LoggedInTest):
             self.assertGreater(t1.precision(), t2.precision())
 
 
+class TestTileScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockGeocachingServer(require_png=True)
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        self.gc = self.server.geocaching()
+        self.gc.login("user", "password")
+        self.server.reset_stats()
+
+    def get_requests(self):
+        stats = self.server.stats()
+        return stats.get(("/map.png", 200), 0), stats.get(("/map.info", 204), 0), stats.get(("/map.info", 200), 0)
+
+    def test_lazy_instance(self):
+        self.assertIsInstance(self.gc.tile_scheduler, TileScheduler)
+        self.assertIs(self.gc.tile_scheduler, self.gc.tile_scheduler)
+
+    def test_fetch(self):
+        scheduler = TileScheduler(self.gc, primer_ttl=0)
+        tile = Tile(self.gc, 8800, 5574, 14)
+
+        with self.subTest("unknown tile"):
+            self.assertFalse(scheduler.needs_png(tile))
+            self.assertIn("data", scheduler.fetch(tile))
+            self.assertEqual((1, 1, 1), self.get_requests())
+
+        with self.subTest("tile known to need .png file"):
+            self.assertTrue(scheduler.needs_png(tile))
+            scheduler.fetch(tile)
+            self.assertEqual((2, 1, 2), self.get_requests())
+
+        with self.subTest("recently downloaded tile"):
+            scheduler.primer_ttl = 60
+            self.assertFalse(scheduler.needs_png(tile))
+            scheduler.fetch(tile)
+            self.assertEqual((2, 1, 3), self.get_requests())
+
+    def test_memory_bounded(self):
+        scheduler = TileScheduler(self.gc, primer_ttl=60, max_tiles=2)
+        tiles = [Tile(self.gc, x, 5574, 14) for x in range(3)]
+        with mock.patch("time.monotonic", return_value=1000):
+            scheduler._remember(tiles[0], needs_png=True)
+            scheduler._remember(tiles[1], needs_png=False)
+            self.assertFalse(scheduler.needs_png(tiles[0]))  # recently downloaded
+        with mock.patch("time.monotonic", return_value=1100):
+            self.assertTrue(scheduler.needs_png(tiles[0]))  # marks the tile as recently used
+            scheduler._remember(tiles[2], needs_png=True)
+
+        with self.subTest("expired download times are forgotten"):
+            self.assertEqual([(2, 5574, 14)], list(scheduler._last_fetch))
+
+        with self.subTest("least recently used tiles are forgotten"):
+            self.assertEqual({(0, 5574, 14): True, (2, 5574, 14): True}, dict(scheduler._needs_png))
+            self.assertEqual(2, scheduler._png_count)
+
+    def test_fetch_without_png(self):
+        self.server.require_png = False
+        self.addCleanup(setattr, self.server, "require_png", True)
+        scheduler = TileScheduler(self.gc, primer_ttl=0)
+        tile = Tile(self.gc, 8800, 5574, 14)
+
+        for _ in range(2):
+            scheduler.fetch(tile)
+        self.assertFalse(scheduler.needs_png(tile))
+        self.assertEqual((0, 0, 2), self.get_requests())
+
+    def test_fetch_empty(self):
+        scheduler = TileScheduler(self.gc)
+        tile = Tile(self.gc, 8800, 5574, 14)
+        with mock.patch.object(self.gc, "_request", return_value=mock.Mock(status_code=204)):
+            self.assertIsNone(scheduler.fetch(tile))
+
+        with self.subTest("invalid JSON"):
+            response = mock.Mock(status_code=200, json=mock.Mock(side_effect=ValueError))
+            with mock.patch.object(self.gc, "_request", return_value=response):
+                with self.assertRaises(Error):
+                    scheduler.fetch(tile, get_png=False)
+
+    def test_load_tiles(self):
+        area = Rectangle(Point(50.10, 14.30), Point(50.00, 14.50))
+        tiles = list(area.to_tiles(self.gc, 14))
+
+        results = list(area.load_tiles(self.gc, 14, workers=4))
+        self.assertEqual([(t.x, t.y) for t in tiles], [(r.tile.x, r.tile.y) for r in results])
+        self.assertEqual([None] * len(tiles), [r.error for r in results])
+        self.assertTrue(all(len(r.tile.blocks) for r in results))
+
+        # the unknown tiles are guessed to need .png file after the first ones needed it
+        png, no_content, _ = self.get_requests()
+        self.assertEqual(len(tiles), png)
+        self.assertLess(no_content, len(tiles))
+
+        with self.subTest("duplicate tiles"):
+            results = list(self.gc.tile_scheduler.load_tiles(tiles + tiles))
+            self.assertEqual(len(tiles), len(results))
+
+
 class TestBlock(unittest.TestCase):
     # fmt: off
     # {descriptor: [points, midpoint, x_lim, y_lim]}
@@ -289,7 +492,10 @@ class TestBlock(unittest.TestCase):
 
     def setUp(self):
         self.b = Block()
-        Block.instances = []
+        self.reset_block_size()
+
+    def reset_block_size(self):
+        Block._size_count, Block._size_total = 0, 0.0
 
     def _generate_blocks(self, case, num=100):
         """Generate some blocks for testing block sizes"""
@@ -300,42 +506,51 @@ class TestBlock(unittest.TestCase):
 
     def test_determine_block_size(self):
         """Test if correct size is determined based on passed points"""
+        self.addCleanup(self.reset_block_size)
 
         with self.subTest("initial value"):
             self.assertEqual(Block.size, 3)
 
         with self.subTest("all blocks has 9 points"):
-            blocks = self._generate_blocks(9, 100)
-            Block.determine_block_size()
+            Block.determine_block_size(self._generate_blocks(9, 100))
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("most blocks has 9 points, some has 6 points"):
-            blocks = self._generate_blocks(9, 100) + self._generate_blocks(6, 20)
-            Block.determine_block_size()
+            self.reset_block_size()
+            Block.determine_block_size(self._generate_blocks(9, 100) + self._generate_blocks(6, 20))
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("most blocks has 9 points, some has other num of points"):
+            self.reset_block_size()
             blocks = self._generate_blocks(9, 100) + self._generate_blocks(6, 20)
             blocks += self._generate_blocks(3, 10) + self._generate_blocks(1, 2)
-            Block.determine_block_size()
+            Block.determine_block_size(blocks)
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("small number of instances"):
-            blocks = self._generate_blocks(9, 10)
+            self.reset_block_size()
             with self.assertLogs(level=logging.WARNING):
-                Block.determine_block_size()
+                Block.determine_block_size(self._generate_blocks(9, 10))
+            self.assertEqual(Block.size, 3)
+
+        with self.subTest("running average over multiple calls"):
+            self.reset_block_size()
+            for _ in range(10):
+                Block.determine_block_size(self._generate_blocks(9, 10))
+            Block.determine_block_size(self._generate_blocks(4, 10))
             self.assertEqual(Block.size, 3)
-            del blocks
+            self.assertEqual(110, Block._size_count)
+
+        with self.subTest("no blocks"):
+            self.assertEqual(3, Block.determine_block_size([]))
+            self.assertEqual(3, Block.determine_block_size())
+            self.assertEqual(110, Block._size_count)
 
         with self.subTest("all blocks has 4 points"):
-            blocks = self._generate_blocks(4, 100)
+            self.reset_block_size()
             with self.assertLogs(level=logging.WARNING):
-                Block.determine_block_size()
+                Block.determine_block_size(self._generate_blocks(4, 100))
             self.assertEqual(Block.size, 2)
-            del blocks
 
         # set back to initial value
         Block.size = 3
@@ -371,6 +586,11 @@ class TestBlock(unittest.TestCase):
             ref_set.update({UTFGridPoint(*p) for p in points})
             self.assertEqual(self.b.points, ref_set)
 
+        with self.subTest("points are read-only"):
+            self.assertIsInstance(self.b.points, frozenset)
+            with self.assertRaises(AttributeError):
+                self.b.points.add(UTFGridPoint(7, 8))
+
     def test_middle_point(self):
         """Check that correct middle points are returned"""
         for i, case in self.good_cases.items():
@@ -385,6 +605,10 @@ class TestBlock(unittest.TestCase):
                     self.b.points = case
                     self.b.middle_point
 
+        with self.subTest("empty"):
+            with self.assertRaises(BadBlockError):
+                Block().middle_point
+
     def test_get_corrected_limits(self):
         """Check calculation of block limits when going out of the border"""
         for i, case in self.good_cases.items():
@@ -402,3 +626,44 @@ class TestModule(unittest.TestCase):
     def test_to_decimal(self):
         self.assertEqual(to_decimal(49, 43.850), 49.73083)
         self.assertEqual(to_decimal(13, 22.905), 13.38175)
+
+    def test_route_length(self):
+        with self.subTest("empty"):
+            self.assertEqual(route_length([]), 0)
+
+        with self.subTest("single point"):
+            self.assertEqual(route_length([49.73083, 13.38175]), 0)
+
+        with self.subTest("multiple points"):
+            points = [Point(49.73083, 13.38175), Point(50.08746, 14.42125), Point(48.20849, 16.37208)]
+            expected = great_circle(*points[:2]).meters + great_circle(*points[1:]).meters
+            route = [coord for p in points for coord in (p.latitude, p.longitude)]
+            self.assertAlmostEqual(route_length(route), expected, places=3)
+
+    def test_points_to_tiles(self):
+        points = [Point(49.75, 13.36), Point(-33.9, 151.2), Point(0, 0), Point(85.0, -179.9)]
+        xs, ys = points_to_tiles([p.latitude for p in points], [p.longitude for p in points], 14)
+        self.assertEqual([(t.x, t.y) for t in (p.to_tile(None, 14) for p in points)], list(zip(xs, ys)))
+
+        with self.subTest("clamped to valid tiles"):
+            self.assertEqual(([0, 3], [0, 3]), tuple(map(list, points_to_tiles([90, -90], [-180, 180], 2))))
+
+    def test_tiles_to_points(self):
+        lats, lons = tiles_to_points([8800, 8800.5], [5574, 5574.5], 14)
+        self.assertEqual(Point.from_tile(make_tile(8800, 5574, 14)[0]), Point(lats[0], lons[0]))
+        self.assertEqual(Point.from_tile(*make_tile(8800, 5574, 14, 1, 1, 2)), Point(lats[1], lons[1]))
+
+        with self.subTest("round trip"):
+            xs, ys = points_to_tiles(lats, lons, 14)
+            self.assertEqual(([8800, 8800], [5574, 5574]), (list(xs), list(ys)))
+
+    def test_parse_coordinates(self):
+        strings = ["N 49 45.123 E 013 22.123", "S 36 51.918 E 174 46.725", "N 6 52.861  w174   43.327", "0 0"]
+        lats, lons = parse_coordinates(strings)
+        self.assertEqual([Point.from_string(s) for s in strings], [Point(*p) for p in zip(lats, lons)])
+
+        with self.subTest("invalid"):
+            with self.assertRaises(PycachingValueError):
+                parse_coordinates(["N 49 45.123 E 013 22.123", "123"])
+            lats, lons = parse_coordinates(["123", "N 49 45.123 E 013 22.123"], invalid=-1)
+            self.assertEqual([-1, 49.75205], list(lats))
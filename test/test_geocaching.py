@@ -1,10 +1,19 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from unittest.mock import patch
 
+import bs4
+import requests
 from geopy.distance import great_circle
 
-from pycaching import Cache, Point, Rectangle
-from pycaching.errors import PMOnlyException, TooManyRequestsError
-from pycaching.geocaching import SortOrder
+from pycaching import Cache, Geocaching, Point, Rectangle, Trackable
+from pycaching.errors import Error, LoadError, PMOnlyException, TooManyRequestsError
+from pycaching.geo import Block, Tile
+from pycaching.geocaching import NOT_MODIFIED, MyLogRecord, SortOrder, Validators
+from pycaching.log import Type as LogType
+from pycaching.testing import MockGeocachingServer
 
 from . import LoggedInTest
 
@@ -247,3 +256,380 @@ class TestShortcuts(LoggedInTest):
     def test_post_log(self):
         # I refuse to write 30 lines of tests (mocking etc.) because of 4 simple lines of code.
         pass
+
+
+class TestBulkLoading(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+
+    def test_load_trackables(self):
+        def load(trackable):
+            if trackable.tid == "TB0BAD":
+                raise LoadError("Trackable not found")
+            trackable.name = "Trackable {}".format(trackable.tid)
+            trackable._kml_url = "kml_url"
+
+        with patch.object(Trackable, "load", autospec=True, side_effect=load):
+            with patch.object(Trackable, "get_KML", return_value="<kml/>") as get_kml:
+                with self.subTest("without KML"):
+                    results = list(self.gc.load_trackables(["TB1", "TB0BAD", "TB2"], workers=2))
+                    self.assertEqual(["TB1", "TB0BAD", "TB2"], [r.tid for r in results])
+                    self.assertEqual("Trackable TB1", results[0].trackable.name)
+                    self.assertIsNone(results[0].kml)
+                    self.assertIsNone(results[0].error)
+                    self.assertIsNone(results[1].trackable)
+                    self.assertIsInstance(results[1].error, LoadError)
+                    self.assertEqual(0, get_kml.call_count)
+
+                with self.subTest("with KML"):
+                    results = list(self.gc.load_trackables(["TB1", "TB2"], kml=True))
+                    self.assertEqual(["<kml/>", "<kml/>"], [r.kml for r in results])
+
+        with self.subTest("empty input"):
+            self.assertEqual([], list(self.gc.load_trackables([])))
+
+    def test_load_caches(self):
+        def load(cache):
+            if cache.wp == "GC0BAD":
+                raise LoadError("Cache not found")
+            cache.name = "Cache {}".format(cache.wp)
+
+        caches = [Cache(self.gc, wp) for wp in ("GC1", "GC0BAD", "GC2")]
+        with patch.object(Cache, "load", autospec=True, side_effect=load):
+            results = list(self.gc.load_caches(caches, workers=2))
+
+        self.assertEqual(caches, [r.cache for r in results])
+        self.assertEqual("Cache GC1", results[0].cache.name)
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, LoadError)
+
+
+class TestParsingProcesses(unittest.TestCase):
+    def setUp(self):
+        self.server = MockGeocachingServer(total_caches=5)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.gc = self.server.geocaching()
+        self.gc.login("user", "password")
+
+    def test_load_caches(self):
+        wps = [self.server.get_wp(i) for i in range(5)] + ["GCM99999"]
+        results = list(self.gc.load_caches([Cache(self.gc, wp) for wp in wps], workers=3, processes=2))
+
+        self.assertEqual(wps, [result.cache.wp for result in results])
+        self.assertEqual([None] * 5, [result.error for result in results[:5]])
+        self.assertIsInstance(results[5].error, LoadError)
+
+        expected = [result.cache for result in self.gc.load_caches([Cache(self.gc, wp) for wp in wps[:5]])]
+        self.assertEqual([cache.to_dict() for cache in expected], [result.cache.to_dict() for result in results[:5]])
+
+
+class TestRevalidation(unittest.TestCase):
+    def setUp(self):
+        self.server = MockGeocachingServer(total_caches=10)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.gc = self.server.geocaching()
+        self.gc.login("user", "password")
+
+    def count_loads(self):
+        return sum(count for (path, _), count in self.server.stats().items() if path == "/seek/cache_details.aspx")
+
+    def test_same_content(self):
+        cache = Cache(self.gc, self.server.get_wp(0))
+        cache.load()
+        with patch("pycaching.parsers.parse_cache_details") as parse:
+            cache.load()
+        parse.assert_not_called()
+        self.assertEqual(2, self.count_loads())
+
+        with self.subTest("changed content"):
+            self.server.seed = 1
+            cache.load()
+            self.assertEqual(self.server.get_cache_data(cache.wp)["hidden"], cache.hidden)
+
+    def test_first_loads_coalesced(self):
+        self.gc._inflight_requests = inflight = JoinCountingDict()
+        send = self.gc._send
+
+        def slow_send(*args, **kwargs):
+            inflight.wait_for(1)  # respond only after the other load joined this request
+            return send(*args, **kwargs)
+
+        caches = [Cache(self.gc, self.server.get_wp(0)) for _ in range(2)]
+        with patch.object(self.gc, "_send", side_effect=slow_send):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(Cache.load, caches))
+        self.assertEqual(1, self.count_loads())
+        self.assertEqual(caches[0].name, caches[1].name)
+
+    def test_not_modified(self):
+        self.server.etags = True
+        cache = Cache(self.gc, self.server.get_wp(0))
+        cache.load()
+        cache.load()
+        self.assertEqual(
+            {("/seek/cache_details.aspx", 200): 1, ("/seek/cache_details.aspx", 304): 1},
+            {key: count for key, count in self.server.stats().items() if key[0] == "/seek/cache_details.aspx"},
+        )
+
+
+class TestMyLogs(unittest.TestCase):
+    page_template = """
+        <form method="post" action="./logs.aspx?lt=2">
+        <input type="hidden" name="__VIEWSTATE" value="state{page}" />
+        <table class="Table"><tbody>{rows}</tbody></table>
+        {pager}
+        </form>
+    """
+    row_template = """
+        <tr>
+        <td><img src="/images/logtypes/2.png" alt="Found it" /></td>
+        <td>&nbsp;</td>
+        <td>{date}</td>
+        <td>
+            <a href="https://www.geocaching.com/geocache/{wp}_name" class="ImageLink"><img src="/images/2.gif" /></a>
+            <a href="https://www.geocaching.com/geocache/{wp}_name"><span>{name}</span></a>
+        </td>
+        </tr>
+    """
+    pager = """<a href="javascript:__doPostBack('ctl00$ContentBody$pager','Page$2')">2</a>"""
+
+    def setUp(self):
+        self.gc = Geocaching()
+        self.gc._logged_in = True
+        rows = [
+            self.row_template.format(wp="GC{}".format(i), name="Cache {}".format(i), date="2020-01-{:02d}".format(i))
+            for i in range(1, 6)
+        ]
+        self.pages = [
+            bs4.BeautifulSoup(
+                self.page_template.format(page=1, rows="".join(rows[:3]), pager=self.pager), "html.parser"
+            ),
+            bs4.BeautifulSoup(self.page_template.format(page=2, rows="".join(rows[3:]), pager=""), "html.parser"),
+        ]
+
+    def test_my_log_records(self):
+        with patch.object(Geocaching, "_request", side_effect=self.pages) as request:
+            with self.subTest("all pages"):
+                records = list(self.gc.my_log_records(LogType.found_it))
+                self.assertEqual(["GC1", "GC2", "GC3", "GC4", "GC5"], [r.wp for r in records])
+                self.assertEqual(MyLogRecord("GC1", LogType.found_it, date(2020, 1, 1), "Cache 1"), records[0])
+                self.assertEqual(2, request.call_count)
+                self.assertEqual(
+                    {"__VIEWSTATE": "state1", "__EVENTTARGET": "ctl00$ContentBody$pager", "__EVENTARGUMENT": "Page$2"},
+                    request.call_args[1]["data"],
+                )
+
+        with patch.object(Geocaching, "_request", side_effect=self.pages) as request:
+            with self.subTest("limit"):
+                self.assertEqual(2, len(list(self.gc.my_log_records(limit=2))))
+                self.assertEqual(1, request.call_count)
+
+    def test_my_logs(self):
+        with patch.object(Geocaching, "_request", side_effect=self.pages):
+            with patch.object(Cache, "load") as load:
+                caches = list(self.gc.my_logs())
+                self.assertEqual("Cache 4", caches[3].name)
+                self.assertEqual(date(2020, 1, 4), caches[3].visited)
+                self.assertEqual(0, load.call_count)
+
+    def test_my_logs__without_name(self):
+        row = self.row_template.format(wp="GC1", name="", date="2020-01-01")
+        page = bs4.BeautifulSoup(self.page_template.format(page=1, rows=row, pager=""), "html.parser")
+        page.find("a", class_=False).decompose()  # a row without the name link
+        with patch.object(Geocaching, "_request", return_value=page):
+            cache = next(self.gc.my_logs())
+        self.assertEqual("GC1", cache.wp)
+        self.assertFalse(hasattr(cache, "_name"))
+
+
+class JoinCountingDict(dict):
+    """Registry of requests in flight which signals each request joining another one in flight."""
+
+    def __init__(self):
+        super().__init__()
+        self.joined = threading.Semaphore(0)
+
+    def get(self, key, default=None):
+        future = super().get(key, default)
+        if future is not None:
+            self.joined.release()
+        return future
+
+    def wait_for(self, count, timeout=5):
+        """Wait until given number of requests joined a request in flight."""
+        for _ in range(count):
+            if not self.joined.acquire(timeout=timeout):
+                raise AssertionError("Requests didn't join the request in flight.")
+
+
+class TestRequest(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+        self.gc._logged_in = True
+
+    def test_coalesce_identical_requests(self):
+        self.gc._inflight_requests = inflight = JoinCountingDict()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"status": "success"}'
+
+        def slow_request(*args, **kwargs):
+            inflight.wait_for(4)  # respond only after all the other workers joined this request
+            return response
+
+        with patch.object(self.gc._session, "request", side_effect=slow_request) as request:
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [
+                    executor.submit(self.gc._request, "api/geocode", params={"q": "Prague"}, expect="json")
+                    for _ in range(5)
+                ]
+                results = [f.result() for f in futures]
+
+        self.assertEqual(1, request.call_count)
+        self.assertEqual([{"status": "success"}] * 5, results)
+        self.assertEqual({}, self.gc._inflight_requests)
+
+    def test_coalesce_errors(self):
+        response = requests.Response()
+        response.status_code = 500
+        error = requests.exceptions.HTTPError(response=response)
+        with patch.object(self.gc._session, "request", side_effect=error):
+            with self.assertRaises(Error):
+                self.gc._request("api/geocode", params={"q": "Prague"})
+        self.assertEqual({}, self.gc._inflight_requests)
+
+    def test_do_not_coalesce_posts(self):
+        with patch.object(self.gc._session, "request") as request:
+            self.gc._request("api/geocode", method="POST", data={"q": "Prague"}, expect="raw")
+        request.assert_called_once_with(
+            "POST", "https://www.geocaching.com/api/geocode", data={"q": "Prague"}, timeout=30
+        )
+
+    def test_timeout(self):
+        with patch.object(self.gc._session, "request") as request:
+            with self.subTest("default"):
+                self.gc._request("api/geocode", params={"q": "Prague"}, expect="raw")
+                self.assertEqual(30, request.call_args[1]["timeout"])
+
+            with self.subTest("explicit"):
+                self.gc._request("api/geocode", params={"q": "Prague"}, expect="raw", timeout=1)
+                self.assertEqual(1, request.call_args[1]["timeout"])
+
+    def test_conditional(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers.update({"ETag": '"abc"', "Last-Modified": "Mon, 19 Oct 2026 10:00:00 GMT"})
+        response._content = b'{"status": "success"}'
+
+        with patch.object(self.gc._session, "request", return_value=response) as request:
+            with self.subTest("first request"):
+                result, validators = self.gc._request("api/geocode", expect="json", validators=Validators())
+                self.assertEqual({"status": "success"}, result)
+                self.assertEqual('"abc"', validators.etag)
+                self.assertEqual("Mon, 19 Oct 2026 10:00:00 GMT", validators.last_modified)
+                self.assertNotIn("headers", request.call_args[1])
+
+            with self.subTest("same content"):
+                result, _ = self.gc._request("api/geocode", expect="json", validators=validators)
+                self.assertIs(NOT_MODIFIED, result)
+                headers = request.call_args[1]["headers"]
+                self.assertEqual('"abc"', headers["If-None-Match"])
+                self.assertEqual("Mon, 19 Oct 2026 10:00:00 GMT", headers["If-Modified-Since"])
+
+            with self.subTest("not modified"):
+                response.status_code = 304
+                self.assertEqual(
+                    (NOT_MODIFIED, validators), self.gc._request("api/geocode", expect="json", validators=validators)
+                )
+
+            with self.subTest("not modified with new validators"):
+                response.headers["ETag"] = '"def"'
+                self.assertEqual(
+                    (NOT_MODIFIED, validators._replace(etag='"def"')),
+                    self.gc._request("api/geocode", expect="json", validators=validators),
+                )
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_adapters(self):
+        gc = Geocaching(pool_maxsize=32, pool_block=True, timeout=(3, 10))
+        self.assertEqual((3, 10), gc._timeout)
+        for url in ("https://www.geocaching.com/play", "http://tiles01.geocaching.com/map.info"):
+            with self.subTest(url):
+                adapter = gc._session.get_adapter(url)
+                self.assertEqual(32, adapter._pool_maxsize)
+                self.assertTrue(adapter._pool_block)
+
+    def test_explicit_session(self):
+        session = requests.Session()
+        gc = Geocaching(session=session, pool_maxsize=32)
+        self.assertIs(session, gc._session)
+        self.assertNotEqual(32, session.get_adapter("https://www.geocaching.com/")._pool_maxsize)
+
+    def test_create_session(self):
+        gc = Geocaching(pool_maxsize=32)
+        gc._session.cookies.set("gspkauth", "secret", domain=".geocaching.com")
+        session = gc.create_session()
+        self.assertIsNot(session, gc._session)
+        self.assertEqual("secret", session.cookies.get("gspkauth"))
+        self.assertEqual(32, session.get_adapter("https://www.geocaching.com/")._pool_maxsize)
+
+
+class TestThreadSafety(unittest.TestCase):
+    workers = 16
+
+    def setUp(self):
+        self.server = MockGeocachingServer(latency=(0, 0.002), total_caches=300, logs_per_cache=10)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.gc = self.server.geocaching(pool_maxsize=self.workers)
+
+    def test_concurrent_login(self):
+        barrier = threading.Barrier(self.workers)
+
+        def login():
+            barrier.wait()
+            self.gc.login("user", "password")
+            return self.gc._logged_username
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            usernames = list(executor.map(lambda _: login(), range(self.workers)))
+
+        self.assertEqual(["user"] * self.workers, usernames)
+        # one login page and one form submission
+        self.assertEqual(2, self.server.stats()[("/account/signin", 200)])
+
+    def test_shared_instance(self):
+        self.gc.login("user", "password")
+        wps = [self.server.get_wp(i) for i in range(100)]
+
+        def load(wp):
+            cache = Cache(self.gc, wp)
+            cache.load()
+            return cache.name, len(list(cache.load_logbook()))
+
+        def search():
+            return [c.wp for c in self.gc.advanced_search({}, limit=60, per_query=20)]
+
+        def load_tile(x):
+            tile = Tile(self.gc, x, 5574, 14)
+            tile.load()
+            return [block.middle_point for block in tile.blocks]
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            loads = [executor.submit(load, wp) for wp in wps]
+            searches = [executor.submit(search) for _ in range(20)]
+            tiles = [executor.submit(load_tile, x) for x in range(8800, 8820)]
+
+            for wp, future in zip(wps, loads):
+                self.assertEqual((self.server.get_cache_data(wp)["name"], 10), future.result())
+            for future in searches:
+                self.assertEqual(wps[:60], future.result())
+            for future in tiles:
+                self.assertEqual(20, len(future.result()))
+
+        stats = self.server.stats()
+        self.assertEqual(100, stats[("/seek/cache_details.aspx", 200)])
+        self.assertEqual(3, Block.size)
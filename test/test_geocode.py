@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import os
+import shelve
+import tempfile
+import unittest
+from unittest import mock
+
+from pycaching.errors import GeocodeError
+from pycaching.geo import Point
+from pycaching.geocode import GeocodeCache
+from pycaching.testing import MockGeocachingServer
+
+
+class TestGeocodeCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = GeocodeCache(maxsize=2, ttl=100, negative_ttl=10)
+
+    def test_normalize(self):
+        self.assertEqual("new york", GeocodeCache.normalize("  New   York "))
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get("Prague"))
+        self.cache.set("Prague", 50.0, 14.0)
+        self.assertEqual((50.0, 14.0, None), self.cache.get(" prague"))
+
+        with self.subTest("error"):
+            self.cache.set("nowhere", error="Not found")
+            self.assertEqual((None, None, "Not found"), self.cache.get("Nowhere"))
+
+    def test_lru(self):
+        self.cache.set("a", 1, 1)
+        self.cache.set("b", 2, 2)
+        self.cache.get("a")
+        self.cache.set("c", 3, 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_ttl(self):
+        with mock.patch("time.time", return_value=1000):
+            self.cache.set("Prague", 50.0, 14.0)
+            self.cache.set("nowhere", error="Not found")
+
+        with mock.patch("time.time", return_value=1050):
+            self.assertIsNotNone(self.cache.get("Prague"))
+            self.assertIsNone(self.cache.get("nowhere"))
+
+        with mock.patch("time.time", return_value=1100):
+            self.assertIsNone(self.cache.get("Prague"))
+
+    def test_disabled(self):
+        cache = GeocodeCache(maxsize=0)
+        cache.set("Prague", 50.0, 14.0)
+        self.assertIsNone(cache.get("Prague"))
+
+    def test_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "geocode")
+            with shelve.open(path) as backend:
+                GeocodeCache(backend=backend).set("Prague", 50.0, 14.0)
+
+            with shelve.open(path) as backend:
+                cache = GeocodeCache(backend=backend)
+                self.assertEqual((50.0, 14.0, None), cache.get("prague"))
+
+                cache.clear()
+                self.assertEqual(0, len(backend))
+
+
+class TestGeocode(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockGeocachingServer()
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        self.gc = self.server.geocaching()
+        self.gc.login("user", "password")
+        self.server.reset_stats()
+
+    def test_geocode(self):
+        point = self.gc.geocode("Prague")
+        self.assertIsInstance(point, Point)
+        self.assertEqual(point, self.gc.geocode(" prague "))
+        self.assertIsNot(point, self.gc.geocode("Prague"))
+        self.assertEqual(1, self.server.stats()[("/api/geocode", 200)])
+
+        with self.subTest("from_location"):
+            self.assertEqual(point, Point.from_location(self.gc, "PRAGUE"))
+            self.assertEqual(1, self.server.stats()[("/api/geocode", 200)])
+
+    def test_geocode_error(self):
+        for _ in range(2):
+            with self.assertRaises(GeocodeError):
+                self.gc.geocode(" ")
+        self.assertEqual(1, self.server.stats()[("/api/geocode", 200)])
+
+    def test_geocode_many(self):
+        locations = ["Prague", "Brno", "prague", " ", "Brno "]
+        results = self.gc.geocode_many(locations, workers=4)
+
+        self.assertEqual(locations, [result.location for result in results])
+        self.assertEqual(self.gc.geocode("Prague"), results[0].point)
+        self.assertEqual(results[0].point, results[2].point)
+        self.assertIsNot(results[0].point, results[2].point)
+        self.assertEqual(results[1].point, results[4].point)
+        self.assertIsNone(results[3].point)
+        self.assertIsInstance(results[3].error, GeocodeError)
+        self.assertEqual(3, self.server.stats()[("/api/geocode", 200)])
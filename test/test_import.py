@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import subprocess
+import sys
+import unittest
+
+import pycaching
+
+# heavy dependencies which shouldn't be imported until really needed
+heavy_modules = ("bs4", "requests", "geopy")
+
+# maximum cumulative import time in microseconds (measured ~1 ms for the package, ~300 ms before lazy loading)
+import_budget = 100000
+
+
+def import_times(statement):
+    """Run import statement in a fresh interpreter and return cumulative import times by module name."""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    times = {}
+    for line in res.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImport(unittest.TestCase):
+    def test_package(self):
+        times = import_times("import pycaching")
+        self.assertLess(times["pycaching"], import_budget)
+        for module in heavy_modules:
+            with self.subTest(module):
+                self.assertNotIn(module, times)
+
+    def test_enums(self):
+        times = import_times("from pycaching.cache import Size, Status, Type; from pycaching.log import Type")
+        for module in heavy_modules:
+            with self.subTest(module):
+                self.assertNotIn(module, times)
+
+    def test_lazy_attributes(self):
+        from pycaching.cache import Cache
+        from pycaching.geo import Point
+        from pycaching.geocaching import Geocaching
+
+        self.assertIs(Cache, pycaching.Cache)
+        self.assertIs(Point, pycaching.Point)
+        self.assertIs(Geocaching, pycaching.Geocaching)
+        self.assertIn("Trackable", dir(pycaching))
+
+        with self.assertRaises(AttributeError):
+            pycaching.NotExisting
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tarfile
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+from pycaching import Cache, Geocaching
+from pycaching.errors import ValueError as PycachingValueError
+from pycaching.ingest import _dechunk, ingest, iter_documents, main, parse_documents
+from pycaching.testing import MockGeocachingServer
+
+
+def warc_record(uri, body, *, type="response", headers=b"Content-Type: text/html; charset=utf-8\r\n"):
+    block = b"HTTP/1.1 200 OK\r\n" + headers + b"\r\n" + body
+    return (
+        "WARC/1.0\r\nWARC-Type: {}\r\nWARC-Target-URI: {}\r\nContent-Length: {}\r\n\r\n".format(
+            type, uri, len(block)
+        ).encode()
+        + block
+        + b"\r\n\r\n"
+    )
+
+
+class TestIngest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with MockGeocachingServer(total_caches=10) as server:
+            gc = server.geocaching()
+            gc.login("user", "password")
+            cls.pages = [
+                gc._request("seek/cache_details.aspx", params={"wp": server.get_wp(i)}, expect="raw").content
+                for i in range(5)
+            ]
+            cls.wps = [server.get_wp(i) for i in range(5)]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        # an archive with pages stored in all supported ways
+        archive = os.path.join(self.directory, "archive")
+        os.makedirs(os.path.join(archive, "nested"))
+        with open(os.path.join(archive, "a.html"), "wb") as f:
+            f.write(self.pages[0])
+        with gzip.open(os.path.join(archive, "nested", "b.html.gz"), "wb") as f:
+            f.write(self.pages[1])
+        with open(os.path.join(archive, "broken.html"), "wb") as f:
+            f.write(b"<html>not a cache</html>")
+        with open(os.path.join(archive, "notes.txt"), "wb") as f:
+            f.write(b"skipped")
+
+        with tarfile.open(os.path.join(archive, "c.tar.gz"), "w:gz") as tar:
+            for name, page in (("c.html", self.pages[2]), ("readme.txt", b"skipped")):
+                info = tarfile.TarInfo(name)
+                info.size = len(page)
+                tar.addfile(info, io.BytesIO(page))
+
+        chunked = b"%x\r\n%s\r\n0\r\n\r\n" % (len(self.pages[4]), self.pages[4])
+        with gzip.open(os.path.join(archive, "d.warc.gz"), "wb") as f:
+            f.write(warc_record("https://example.com/d", self.pages[3]))
+            f.write(warc_record("https://example.com/request", b"GET /", type="request"))
+            f.write(warc_record("https://example.com/image", b"PNG", headers=b"Content-Type: image/png\r\n"))
+            f.write(warc_record("https://example.com/e", chunked, headers=b"Transfer-Encoding: chunked\r\n"))
+        self.archive = archive
+
+    def test_iter_documents(self):
+        documents = list(iter_documents([self.archive]))
+        self.assertEqual(6, len(documents))
+        self.assertIn(("https://example.com/e", self.pages[4], None), documents)
+        self.assertTrue(all(error is None for _, _, error in documents))
+
+        with self.subTest("unsupported file"):
+            with self.assertRaises(PycachingValueError):
+                list(iter_documents([os.path.join(self.archive, "notes.txt")]))
+
+        with self.subTest("missing file"):
+            with self.assertRaises(PycachingValueError):
+                list(iter_documents([os.path.join(self.archive, "missing.html")]))
+
+    def test_parse_documents(self):
+        documents = [
+            ("a", self.pages[0], None),
+            ("broken", b"<html></html>", None),
+            ("unreadable", None, "BadGzipFile: Not a gzipped file"),
+            ("b", self.pages[1], None),
+        ]
+        for processes in (0, 2):
+            with self.subTest(processes=processes):
+                results = list(parse_documents(documents, processes=processes, window=1))
+                self.assertEqual(["a", "broken", "unreadable", "b"], [name for name, _, _ in results])
+                self.assertEqual(self.wps[0], results[0][1]["wp"])
+                self.assertIsNone(results[0][2])
+                self.assertIsNone(results[1][1])
+                self.assertIsNotNone(results[1][2])
+                self.assertEqual(("unreadable", None, "BadGzipFile: Not a gzipped file"), results[2])
+
+    def test_jsonl(self):
+        output = os.path.join(self.directory, "caches.jsonl")
+        with self.assertLogs(level="WARNING"):
+            stats = ingest([self.archive], output, processes=2)
+        self.assertEqual((5, 1), stats)
+
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(sorted(self.wps), sorted(record["wp"] for record in records))
+
+        cache = Cache.from_dict(Geocaching(), records[0])
+        self.assertEqual(records[0]["name"], cache.name)
+
+    def test_corrupt(self):
+        with open(os.path.join(self.archive, "bad.html.gz"), "wb") as f:
+            f.write(b"<html>not gzipped</html>")
+        with open(os.path.join(self.archive, "f.warc"), "wb") as f:
+            f.write(warc_record("https://example.com/f", b"zz\r\nbroken", headers=b"Transfer-Encoding: chunked\r\n"))
+            f.write(warc_record("https://example.com/g", b"not gzipped", headers=b"Content-Encoding: gzip\r\n"))
+            f.write(warc_record("https://example.com/h", self.pages[0]))
+        with open(os.path.join(self.archive, "c.tar.gz"), "rb") as f:
+            tarball = f.read()
+        with open(os.path.join(self.archive, "truncated.tar.gz"), "wb") as f:
+            f.write(tarball[: len(tarball) // 2])
+
+        documents = list(iter_documents([self.archive]))
+        errors = {name: error for name, _, error in documents if error is not None}
+        truncated = os.path.join(self.archive, "truncated.tar.gz")
+        # depending on where the tarball is cut, its member and/or the tarball itself is reported
+        self.assertTrue(any(name.startswith(truncated) for name in errors))
+        self.assertEqual(
+            {os.path.join(self.archive, "bad.html.gz"), "https://example.com/f", "https://example.com/g"},
+            {name for name in errors if not name.startswith(truncated)},
+        )
+        self.assertIn("BadGzipFile", errors[os.path.join(self.archive, "bad.html.gz")])
+        self.assertIn("ValueError", errors["https://example.com/f"])
+        self.assertIn(("https://example.com/h", self.pages[0], None), documents)
+
+        output = os.path.join(self.directory, "caches.jsonl")
+        with self.assertLogs(level="WARNING"):
+            stats = ingest([self.archive], output, processes=0)
+        self.assertEqual(6, stats.parsed)
+        self.assertEqual(len(errors) + 1, stats.failed)  # including broken.html
+
+    def test_sqlite(self):
+        output = os.path.join(self.directory, "caches.sqlite")
+        with self.assertLogs(level="WARNING"):
+            with redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(1, main([self.archive, "-o", output, "-p", "0"]))
+        self.assertIn("Parsed 5 documents, 1 failed.", stderr.getvalue())
+
+        with sqlite3.connect(output) as connection:
+            rows = connection.execute("SELECT wp, source, data FROM caches ORDER BY wp").fetchall()
+        connection.close()
+        self.assertEqual(self.wps, [row[0] for row in rows])
+        self.assertEqual(self.wps[0], json.loads(rows[0][2])["wp"])
+
+        with self.subTest("unknown format"):
+            with self.assertRaises(PycachingValueError):
+                ingest([self.archive], output, format="xml")
+
+    def test_main(self):
+        output = os.path.join(self.directory, "caches.jsonl")
+        with redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(0, main([os.path.join(self.archive, "a.html"), "-o", output, "-p", "0"]))
+        self.assertIn("Parsed 1 documents, 0 failed.", stderr.getvalue())
+
+        with self.subTest("invalid path"):
+            with redirect_stderr(io.StringIO()) as stderr:
+                with self.assertRaises(SystemExit) as cm:
+                    main([self.archive, "notes.txt", "-o", output])
+            self.assertEqual(2, cm.exception.code)
+            self.assertIn("No such file or directory: notes.txt", stderr.getvalue())
+
+    def test_paths_checked_first(self):
+        output = os.path.join(self.directory, "caches.jsonl")
+        with mock.patch("pycaching.ingest.parse_documents") as parse_documents:
+            with self.assertRaises(PycachingValueError):
+                ingest([self.archive, os.path.join(self.archive, "notes.txt")], output)
+        parse_documents.assert_not_called()
+        self.assertFalse(os.path.exists(output))
+
+    def test_interrupted(self):
+        def interrupted(*args, **kwargs):
+            yield "a.html", {"wp": self.wps[0]}, None
+            raise KeyboardInterrupt
+
+        for format in ("jsonl", "sqlite"):
+            with self.subTest(format):
+                output = os.path.join(self.directory, "caches." + format)
+                with mock.patch("pycaching.ingest.parse_documents", interrupted):
+                    with self.assertRaises(KeyboardInterrupt):
+                        ingest([self.archive], output)
+
+                if format == "jsonl":
+                    with open(output, encoding="utf-8") as f:
+                        records = [json.loads(line) for line in f]
+                else:
+                    with sqlite3.connect(output) as connection:
+                        records = [json.loads(row[0]) for row in connection.execute("SELECT data FROM caches")]
+                    connection.close()
+                self.assertEqual([{"wp": self.wps[0], "source": "a.html"}], records)
+
+    def test_dechunk(self):
+        self.assertEqual(b"hello world", _dechunk(b"5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\n\r\n"))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import datetime
+import json
+import unittest
+from os import path
+from unittest import mock
+
+import requests
+
+from pycaching import Cache, Geocaching
+from pycaching.errors import Error, TooManyRequestsError
+from pycaching.geo import Tile
+from pycaching.instrumentation import Instrumentation, MetricsCollector, PrometheusInstrumentation, StageEvent, measure
+from pycaching.retry import RetryPolicy
+
+from . import LoggedInTest
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+_sample_utfgrid_file = path.join(path.dirname(__file__), "sample_utfgrid.json")
+
+
+def make_response(status_code, headers=None, content=b"{}"):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content
+    response.url = "https://www.geocaching.com/api/geocode"
+    response.elapsed = datetime.timedelta(seconds=0.001)
+    return response
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsCollector()
+        self.gc = Geocaching(retry_policy=RetryPolicy(total=1, jitter=False, backoff_factor=0))
+        self.gc.add_instrumentation(self.metrics)
+        self.gc._logged_in = True
+
+    def test_request(self):
+        responses = [make_response(503), make_response(200, content=b'{"status": "success"}')]
+        with mock.patch.object(self.gc._session, "request", side_effect=responses):
+            self.gc._request("api/geocode", expect="json")
+
+        metrics = self.metrics.snapshot()
+        self.assertEqual(1, metrics["counters"][("requests", "www.geocaching.com", 503)])
+        self.assertEqual(1, metrics["counters"][("requests", "www.geocaching.com", 200)])
+        self.assertEqual(1, metrics["counters"][("retries", "www.geocaching.com")])
+        self.assertEqual(23, metrics["counters"][("response_bytes", "www.geocaching.com")])
+        self.assertEqual(2, metrics["timings"][("request_total_time", "www.geocaching.com")][0])
+        self.assertEqual(1, metrics["timings"][("stage", "parse.json")][0])
+
+    def test_connection_error(self):
+        listener = mock.Mock(spec=Instrumentation)
+        self.gc.add_instrumentation(listener)
+        error = requests.exceptions.ConnectionError()
+        with mock.patch.object(self.gc._session, "request", side_effect=error):
+            with self.assertRaises(Error):
+                self.gc._request("api/geocode")
+
+        events = [c[0][0] for c in listener.on_request.call_args_list]
+        self.assertEqual([1, 2], [e.attempt for e in events])
+        self.assertEqual([None, None], [e.status_code for e in events])
+        self.assertIs(error, events[0].error)
+
+    def test_rate_limit(self):
+        response = make_response(429, {"x-rate-limit-reset": "10"})
+        with mock.patch.object(self.gc._session, "request", return_value=response):
+            with self.assertRaises(TooManyRequestsError):
+                self.gc._request("api/proxy/web/search/v2", expect="json")
+        self.assertEqual(1, self.metrics.snapshot()["counters"][("rate_limited", "www.geocaching.com")])
+
+    def test_tile_load(self):
+        with open(_sample_utfgrid_file, encoding="utf8") as f:
+            utfgrid = json.load(f)
+        with mock.patch.object(Tile, "_download_utfgrid", return_value=utfgrid):
+            Tile(self.gc, 8800, 5574, 14).load()
+
+        timings = self.metrics.snapshot()["timings"]
+        self.assertEqual(1, timings[("stage", "tile.load")][0])
+        self.assertEqual(1, timings[("stage", "tile.load.fetch")][0])
+        self.assertGreaterEqual(timings[("stage", "tile.load")][1], timings[("stage", "tile.load.fetch")][1])
+
+    def test_failing_listener(self):
+        listener = mock.Mock(spec=Instrumentation)
+        listener.on_stage.side_effect = RuntimeError("broken listener")
+        self.gc.add_instrumentation(listener)
+        with measure(self.gc, "stage", "target"):
+            pass
+        self.assertEqual(1, listener.on_stage.call_count)
+        self.assertEqual(1, self.metrics.snapshot()["timings"][("stage", "stage")][0])
+
+    def test_measure_without_instrumentation(self):
+        with measure(Geocaching(), "stage"):
+            pass
+        with measure(None, "stage"):
+            pass
+
+    @unittest.skipIf(prometheus_client is None, "prometheus_client is not installed")
+    def test_prometheus(self):
+        registry = prometheus_client.CollectorRegistry()
+        self.gc.add_instrumentation(PrometheusInstrumentation(registry))
+        with mock.patch.object(self.gc._session, "request", return_value=make_response(200)):
+            self.gc._request("api/geocode", expect="json")
+        self.gc._emit("on_stage", StageEvent("cache.load", 0.5, None))
+        self.gc._emit("on_retry", "https://www.geocaching.com/", 1, 0.1, None)
+        self.gc._emit("on_rate_limit", "https://www.geocaching.com/", 10)
+
+        labels = {"host": "www.geocaching.com", "method": "GET", "status": "200"}
+        self.assertEqual(1, registry.get_sample_value("pycaching_requests_total", labels))
+        self.assertEqual(0.5, registry.get_sample_value("pycaching_stage_seconds_sum", {"stage": "cache.load"}))
+        self.assertEqual(1, registry.get_sample_value("pycaching_retries_total", {"host": "www.geocaching.com"}))
+        self.assertEqual(1, registry.get_sample_value("pycaching_rate_limited_total", {"host": "www.geocaching.com"}))
+
+
+class TestCacheStages(LoggedInTest):
+    def test_load_quick(self):
+        metrics = MetricsCollector()
+        self.gc.add_instrumentation(metrics)
+        self.addCleanup(self.gc._instrumentation.remove, metrics)
+
+        with self.recorder.use_cassette("cache_quick_normal"):
+            Cache(self.gc, "GC4808G").load_quick()
+
+        timings = metrics.snapshot()["timings"]
+        for stage in ("cache.load_quick", "cache.load_quick.fetch", "parse.json"):
+            with self.subTest(stage):
+                self.assertEqual(1, timings[("stage", stage)][0])
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import json
+import unittest
+from os import path
+
+from pycaching.cache import Size, Type
+from pycaching.errors import Error, LoadError, PMOnlyException
+from pycaching.parsers import (
+    parse_cache_details,
+    parse_log_page,
+    parse_my_logs,
+    parse_print_page,
+    parse_trackable,
+    parse_trackable_log_page,
+    parse_utfgrid,
+)
+from pycaching.testing import MockGeocachingServer
+
+_sample_my_logs_file = path.join(path.dirname(__file__), "sample_my_logs.html")
+_cassettes_dir = path.join(path.dirname(__file__), "cassettes")
+
+
+def recorded_page(cassette, url_part):
+    """Return a body of a successful response recorded in a cassette for a matching URL."""
+    with open(path.join(_cassettes_dir, cassette + ".json"), encoding="utf-8") as f:
+        interactions = json.load(f)["http_interactions"]
+    for interaction in interactions:
+        if url_part in interaction["request"]["uri"] and interaction["response"]["status"]["code"] == 200:
+            return interaction["response"]["body"]["string"]
+    raise LookupError("No recorded page for {} in {}.".format(url_part, cassette))
+
+
+class TestParseCacheDetails(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockGeocachingServer(total_caches=10)
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+
+        gc = cls.server.geocaching()
+        gc.login("user", "password")
+        cls.wp = cls.server.get_wp(3)
+        cls.page = gc._request("seek/cache_details.aspx", params={"wp": cls.wp}, expect="raw").content
+
+    def test_fields(self):
+        data = parse_cache_details(self.page)
+        expected = self.server.get_cache_data(self.wp)
+
+        self.assertEqual(data, json.loads(json.dumps(data)))
+        self.assertEqual(self.wp, data["wp"])
+        self.assertEqual(expected["name"], data["name"])
+        self.assertEqual(Type.from_number(expected["type"]).value, data["type"])
+        self.assertEqual(Size.from_filename(expected["size"]).value, data["size"])
+        self.assertEqual(expected["hidden"].isoformat(), data["hidden"])
+        self.assertEqual([expected["latitude"], expected["longitude"]], data["location"])
+        self.assertEqual(self.server.logs_per_cache, sum(data["log_counts"].values()))
+        self.assertFalse(data["pm_only"])
+
+    def test_invalid(self):
+        with self.assertRaises(LoadError):
+            parse_cache_details("<html></html>")
+
+
+class TestRecordedPages(unittest.TestCase):
+    def test_parse_print_page(self):
+        data = parse_print_page(recorded_page("cache_guidload_normal", "cdpf.aspx"))
+        self.assertEqual(data, json.loads(json.dumps(data)))
+        self.assertEqual("GC2WXPN", data["wp"])
+        self.assertEqual("Der Schatz vom Luftschloss", data["name"].strip())
+        self.assertEqual([49.96492, 8.21647], data["location"])
+        self.assertEqual(Type.mystery.value, data["type"])
+        self.assertEqual(Size.large.value, data["size"])
+        self.assertEqual((2.5, 1.5), (data["difficulty"], data["terrain"]))
+        self.assertEqual("engelmz & Punxsutawney Phil", data["author"])
+        self.assertEqual("2011-06-23", data["hidden"])
+        self.assertTrue(data["attributes"]["kids"])
+        self.assertEqual("Das ist nicht nötig", data["hint"].strip())
+        self.assertEqual(356, data["favorites"])
+        self.assertIn("FINAL", data["waypoints"])
+        self.assertEqual(806, data["log_counts"]["2"])
+
+        with self.subTest("PM only"):
+            with self.assertRaises(PMOnlyException):
+                parse_print_page(recorded_page("cache_guidload_PMO", "cdpf.aspx"))
+
+    def test_parse_trackable(self):
+        self.assertEqual(
+            {
+                "tid": "TB1KEZ9",
+                "name": "Lilagul #2: SwedenHawk Geocoin",
+                "type": "SwedenHawk Geocoin",
+                "owner": "lilagul",
+                "goal": "\n\n    There is currently no goal for this item.\n\n",
+                "description": "\n\n\n\n        No additional details available.\n    \n",
+                "_kml_url": "/kml/tbkml.aspx?tbguid=cff00ac4-f562-486e-b303-32b2d01ed386",
+                "_log_page_url": "/track/log.aspx?wid=cff00ac4-f562-486e-b303-32b2d01ed386",
+                "location": "In the hands of Alvis02.",
+            },
+            parse_trackable(recorded_page("trackable_load_tid", "track/details.aspx")),
+        )
+
+
+class TestParsers(unittest.TestCase):
+    def test_parse_log_page(self):
+        page = """
+            <select name="LogTypeId"><option value="2">Found it</option><option value="4">Note</option></select>
+            <input type="hidden" name="token" value="abc" /><input type="submit" name="submit" />
+        """
+        self.assertEqual(
+            {"valid_types": ["2", "4"], "hidden_inputs": {"token": "abc", "submit": ""}}, parse_log_page(page)
+        )
+
+    def test_parse_trackable_log_page(self):
+        page = b"""
+            <select><option value="-1">- select -</option><option value="4">Note</option></select>
+            <input type="hidden" name="token" value="abc" />
+            <span id="ctl00_ContentBody_LogBookPanel1_uxDateFormatHint">(d.M.yyyy)</span>
+        """
+        self.assertEqual(
+            {"valid_types": ["4"], "hidden_inputs": {"token": "abc"}, "date_format": "d.M.yyyy"},
+            parse_trackable_log_page(page),
+        )
+
+    def test_parse_my_logs(self):
+        page = """
+            <input type="hidden" name="__VIEWSTATE" value="state" />
+            <table class="Table"><tbody><tr>
+              <td><img src="/images/logtypes/2.png" /></td><td></td><td>01/02/2020</td>
+              <td>
+                <a href="https://www.geocaching.com/geocache/GC12345_name" class="ImageLink"><img src="/2.gif" /></a>
+                <a href="https://www.geocaching.com/geocache/GC12345_name">Name</a>
+              </td>
+            </tr></tbody></table>
+            <a href="javascript:__doPostBack('pager','Page$2')">2</a>
+        """
+        data = parse_my_logs(page)
+        self.assertEqual([{"wp": "GC12345", "type": "2", "visited": "2020-01-02", "name": "Name"}], data["records"])
+        self.assertEqual(["pager", "Page$2"], data["next_page"])
+        self.assertEqual({"__VIEWSTATE": "state"}, data["hidden_inputs"])
+
+        with self.subTest("last page"):
+            self.assertIsNone(parse_my_logs(page, page_number=2)["next_page"])
+
+        with self.subTest("no logs"):
+            self.assertEqual({"records": [], "next_page": None, "hidden_inputs": {}}, parse_my_logs("<html></html>"))
+
+    def test_parse_my_logs__page(self):
+        with open(_sample_my_logs_file, "rb") as f:
+            data = parse_my_logs(f.read())
+        self.assertEqual(
+            [
+                {"wp": "GC1PAR2", "type": "2", "visited": "2020-10-24", "name": "Pycaching test"},
+                {"wp": "GC4808G", "type": "2", "visited": "2020-10-03", "name": "Název keše"},
+                {"wp": "GC8CKQQ", "type": "2", "visited": "2020-09-12", "name": None},
+            ],
+            data["records"],
+        )
+        self.assertEqual(["ctl00$ContentBody$pgrTop", "Page$2"], data["next_page"])
+        self.assertEqual("4A5BE1E3", data["hidden_inputs"]["__VIEWSTATEGENERATOR"])
+
+        with self.subTest("recorded page without logs"):
+            data = parse_my_logs(recorded_page("geocaching_my_finds", "my/logs.aspx"))
+            self.assertEqual([], data["records"])
+            self.assertIsNone(data["next_page"])
+
+    def test_parse_utfgrid(self):
+        utfgrid = {"grid": [" " * 4] * 4, "data": {"(1, 2)": [{"i": "GC1", "n": "One"}]}}
+        data = parse_utfgrid(json.dumps(utfgrid).encode())
+        self.assertEqual(4, data["size"])
+        name, xs, ys = data["caches"]["GC1"]
+        self.assertEqual(("One", [1], [2]), (name, list(xs), list(ys)))
+
+        with self.subTest("invalid"):
+            with self.assertRaises(Error):
+                parse_utfgrid({"grid": utfgrid["grid"], "data": {"(x, 2)": []}})
+
+        with self.subTest("not square"):
+            with self.assertRaises(Error):
+                parse_utfgrid({"grid": [" " * 4] * 3, "data": {}})
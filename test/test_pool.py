@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import NamedTemporaryFile
+from unittest import mock
+
+from pycaching import Cache, GeocachingPool
+from pycaching.errors import LoginFailedException, NotLoggedInException, TooManyRequestsError, ValueError
+from pycaching.geocode import GeocodeCache
+from pycaching.instrumentation import MetricsCollector
+from pycaching.testing import MockGeocachingServer
+
+
+class TestGeocachingPool(unittest.TestCase):
+    def setUp(self):
+        self.server = MockGeocachingServer(total_caches=50, rate_limit=(3, 60))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def make_pool(self, usernames=("alice", "bob"), **kwargs):
+        # geocoding is used to count requests, so don't cache it
+        pool = GeocachingPool(member_factory=self.server.geocaching, geocode_cache=GeocodeCache(maxsize=0), **kwargs)
+        for username in usernames:
+            pool.login(username, "password")
+        return pool
+
+    def get_requests(self):
+        return self.server.stats().get(("/api/geocode", 200), 0)
+
+    def test_init(self):
+        with self.assertRaises(ValueError):
+            GeocachingPool(strategy="random")
+
+        for min_bench_time in (0, -1):
+            with self.subTest(min_bench_time=min_bench_time):
+                with self.assertRaises(ValueError):
+                    GeocachingPool(min_bench_time=min_bench_time)
+
+    def test_login(self):
+        pool = self.make_pool()
+        self.assertEqual(["alice", "bob"], [member._logged_username for member in pool.members])
+        self.assertTrue(pool._logged_in)
+
+        with self.subTest("already present account is skipped"):
+            pool.login("alice", "password")
+            self.assertEqual(2, len(pool.members))
+
+        with self.subTest("cookie"):
+            carol = self.server.geocaching()
+            carol.login("carol", "password")
+            pool.login_with_cookie(carol._session.cookies["gspkauth"])
+            self.assertEqual(3, len(pool.members))
+
+        with self.subTest("cookie of already present account is skipped"):
+            pool.login_with_cookie(pool.members[0]._session.cookies["gspkauth"])
+            self.assertEqual(3, len(pool.members))
+
+        with self.subTest("logout"):
+            pool.logout()
+            self.assertEqual([], pool.members)
+            self.assertFalse(pool._logged_in)
+            with self.assertRaises(NotLoggedInException):
+                pool.geocode("Prague")
+
+    def test_login_credentials_file(self):
+        credentials = [{"username": "alice", "password": "1"}, {"username": "bob", "password": "2"}]
+        with NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(credentials, f)
+        self.addCleanup(os.remove, f.name)
+
+        pool = GeocachingPool(member_factory=self.server.geocaching)
+        pool._credentials_file = f.name
+        pool.login()
+        self.assertEqual(["alice", "bob"], [member._logged_username for member in pool.members])
+
+        with self.subTest("invalid file"):
+            pool._credentials_file = "this_file_doesnt_exist.json"
+            with self.assertRaises(LoginFailedException):
+                pool.login()
+
+    def test_add_member(self):
+        pool = GeocachingPool()
+        with self.assertRaises(NotLoggedInException):
+            pool.add_member(self.server.geocaching())
+
+        with self.subTest("already present account"):
+            alice, another_alice = self.server.geocaching(), self.server.geocaching()
+            alice.login("alice", "password")
+            another_alice.login("alice", "password")
+            self.assertTrue(pool.add_member(alice))
+            self.assertFalse(pool.add_member(another_alice))
+            self.assertEqual([alice], pool.members)
+
+    def test_concurrent_login(self):
+        pool = GeocachingPool(member_factory=self.server.geocaching)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: pool.login("alice", "password"), range(4)))
+        self.assertEqual(["alice"], [member._logged_username for member in pool.members])
+
+    def test_round_robin(self):
+        pool = self.make_pool()
+        alice, bob = pool.members
+        with mock.patch.object(alice, "_request", wraps=alice._request) as alice_request:
+            with mock.patch.object(bob, "_request", wraps=bob._request) as bob_request:
+                for _ in range(4):
+                    pool.geocode("Prague")
+        self.assertEqual(2, alice_request.call_count)
+        self.assertEqual(2, bob_request.call_count)
+
+    def test_rate_limited(self):
+        pool = self.make_pool(min_bench_time=1)
+
+        # each account can do 3 requests, then it is benched and the other one is used
+        for _ in range(6):
+            pool.geocode("Prague")
+        self.assertEqual(6, self.get_requests())
+
+        with self.assertRaises(TooManyRequestsError) as cm:
+            pool.geocode("Prague")
+        self.assertGreater(cm.exception.rate_limit_reset, 1)
+        self.assertEqual(2, self.server.stats()[("/api/geocode", 429)])
+
+        with self.subTest("benched accounts are not used"):
+            self.server.reset_stats()
+            with self.assertRaises(TooManyRequestsError):
+                pool.geocode("Prague")
+            self.assertEqual({}, self.server.stats())
+
+    def test_least_recently_rate_limited(self):
+        pool = self.make_pool(("alice", "bob", "carol"), strategy=GeocachingPool.least_recently_rate_limited)
+        alice, bob, carol = pool._members
+
+        for _ in range(3):
+            pool.geocode("Prague")
+        self.assertEqual([1, 1, 1], [member.requests for member in pool._members])
+
+        alice.rate_limited_at, bob.rate_limited_at = 20, 10
+        self.assertIs(carol, pool._pick_member("url"))
+        carol.rate_limited_at = 30
+        self.assertIs(bob, pool._pick_member("url"))
+
+    def test_load_caches(self):
+        collector = MetricsCollector()
+        pool = self.make_pool(("alice", "bob", "carol", "dave"), instrumentation=[collector])
+        caches = [Cache(pool, self.server.get_wp(i)) for i in range(10)]
+
+        results = list(pool.load_caches(caches, workers=4))
+        self.assertEqual([None] * 10, [result.error for result in results])
+        self.assertEqual(self.server.get_cache_data(caches[-1].wp)["name"], caches[-1].name)
+        self.assertTrue(collector.snapshot()["timings"])
+
+    def test_without_login(self):
+        pool = GeocachingPool()
+        with self.assertRaises(NotLoggedInException):
+            pool.geocode("Prague")
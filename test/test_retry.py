@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+import requests
+
+from pycaching import Geocaching
+from pycaching.errors import Error, TooManyRequestsError
+from pycaching.retry import RetryPolicy
+
+
+def make_response(status_code, headers=None, content=b"{}"):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(total=3, backoff_factor=1, backoff_max=10, jitter=False)
+
+    def test_is_retryable(self):
+        with self.subTest("connection error"):
+            self.assertTrue(self.policy.is_retryable("GET", error=requests.exceptions.ConnectionError()))
+            self.assertFalse(self.policy.is_retryable("POST", error=requests.exceptions.ConnectionError()))
+
+        with self.subTest("connect timeout"):
+            self.assertTrue(self.policy.is_retryable("POST", error=requests.exceptions.ConnectTimeout()))
+
+        with self.subTest("other error"):
+            self.assertFalse(self.policy.is_retryable("GET", error=requests.exceptions.InvalidURL()))
+
+        with self.subTest("status code"):
+            self.assertTrue(self.policy.is_retryable("GET", response=make_response(503)))
+            self.assertFalse(self.policy.is_retryable("GET", response=make_response(500)))
+            self.assertFalse(self.policy.is_retryable("GET", response=make_response(200)))
+            self.assertFalse(self.policy.is_retryable("POST", response=make_response(503)))
+
+    def test_get_backoff(self):
+        with self.subTest("exponential"):
+            self.assertEqual([1, 2, 4, 8, 10], [self.policy.get_backoff(i) for i in range(1, 6)])
+
+        with self.subTest("jitter"):
+            self.policy.jitter = True
+            for attempt in range(1, 6):
+                self.assertTrue(0 <= self.policy.get_backoff(attempt) <= min(10, 2 ** (attempt - 1)))
+
+    def test_parse_retry_after(self):
+        with self.subTest("seconds"):
+            self.assertEqual(5, self.policy.parse_retry_after(make_response(503, {"Retry-After": "5"})))
+
+        with self.subTest("date in past"):
+            response = make_response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+            self.assertEqual(0, self.policy.parse_retry_after(response))
+
+        with self.subTest("invalid"):
+            self.assertIsNone(self.policy.parse_retry_after(make_response(503, {"Retry-After": "soon"})))
+
+        with self.subTest("missing"):
+            self.assertIsNone(self.policy.parse_retry_after(make_response(503)))
+
+    def test_get_delay(self):
+        url = "https://www.geocaching.com/seek/geocache.logbook"
+        error = requests.exceptions.ConnectionError()
+
+        with self.subTest("within total"):
+            self.assertEqual(2, self.policy.get_delay("GET", url, 2, error=error))
+
+        with self.subTest("total exhausted"):
+            self.assertIsNone(self.policy.get_delay("GET", url, 4, error=error))
+
+        with self.subTest("per endpoint total"):
+            self.policy.per_endpoint_total = {"seek/geocache.logbook": 5, "seek": 1}
+            self.assertEqual(8, self.policy.get_delay("GET", url, 4, error=error))
+            self.assertIsNone(self.policy.get_delay("GET", "https://www.geocaching.com/seek/cdpf.aspx", 2, error=error))
+
+        with self.subTest("retry after"):
+            response = make_response(503, {"Retry-After": "7"})
+            self.assertEqual(7, self.policy.get_delay("GET", url, 1, response=response))
+
+        with self.subTest("retry after too long"):
+            response = make_response(503, {"Retry-After": "3600"})
+            self.assertIsNone(self.policy.get_delay("GET", url, 1, response=response))
+
+
+class TestRequestRetrying(unittest.TestCase):
+    def setUp(self):
+        self.on_retry = mock.Mock()
+        self.gc = Geocaching(retry_policy=RetryPolicy(total=2, on_retry=self.on_retry))
+        self.gc._logged_in = True
+        self.sleep = mock.patch.object(RetryPolicy, "sleep").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_recover(self):
+        error = requests.exceptions.ConnectionError("Connection reset by peer")
+        failed = make_response(503)
+        failed.close = mock.Mock()
+        responses = [error, failed, make_response(200, content=b'{"status": "success"}')]
+        with mock.patch.object(self.gc._session, "request", side_effect=responses) as request:
+            self.assertEqual({"status": "success"}, self.gc._request("api/geocode", expect="json"))
+        self.assertEqual(3, request.call_count)
+        failed.close.assert_called_once_with()
+        self.assertEqual(2, self.sleep.call_count)
+        self.assertEqual([1, 2], [c[0][1] for c in self.on_retry.call_args_list])
+        self.assertIs(error, self.on_retry.call_args_list[0][0][3])
+
+    def test_give_up(self):
+        with self.subTest("connection error"):
+            error = requests.exceptions.ConnectionError("Connection reset by peer")
+            with mock.patch.object(self.gc._session, "request", side_effect=error) as request:
+                with self.assertRaises(Error) as cm:
+                    self.gc._request("api/geocode")
+            self.assertIs(error, cm.exception.__cause__)
+            self.assertEqual(3, request.call_count)
+
+        with self.subTest("server error"):
+            with mock.patch.object(self.gc._session, "request", return_value=make_response(503)) as request:
+                with self.assertRaises(Error):
+                    self.gc._request("api/geocode")
+            self.assertEqual(3, request.call_count)
+
+    def test_rate_limit_not_retried(self):
+        response = make_response(429, {"x-rate-limit-reset": "10"})
+        with mock.patch.object(self.gc._session, "request", return_value=response) as request:
+            with self.assertRaises(TooManyRequestsError) as cm:
+                self.gc._request("api/proxy/web/search/v2", expect="json")
+        self.assertEqual(10, cm.exception.rate_limit_reset)
+        self.assertEqual(1, request.call_count)
+
+    def test_post_not_retried(self):
+        with mock.patch.object(self.gc._session, "request", return_value=make_response(503)) as request:
+            with self.assertRaises(Error):
+                self.gc._request("play/geocache/gc1/log", method="POST", data={})
+        self.assertEqual(1, request.call_count)
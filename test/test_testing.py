@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from pycaching import Cache
+from pycaching.errors import LoadError, LoginFailedException, TooManyRequestsError
+from pycaching.geo import Point, Tile
+from pycaching.log import Type as LogType
+from pycaching.testing import MockGeocachingServer
+
+
+class TestMockGeocachingServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockGeocachingServer(total_caches=120, logs_per_cache=30, accounts={"user": "secret"})
+        cls.server.start()
+        cls.gc = cls.server.geocaching()
+        cls.gc.login("user", "secret")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset_stats()
+
+    def test_login(self):
+        self.assertEqual("user", self.gc.get_logged_user())
+
+        with self.subTest("wrong password"):
+            with self.assertRaises(LoginFailedException):
+                self.server.geocaching().login("user", "wrong")
+
+    def test_search(self):
+        caches = list(self.gc.advanced_search({"origin": "50.08,14.42"}, per_query=50))
+        self.assertEqual(120, len(caches))
+        self.assertEqual(self.server.get_wp(119), caches[-1].wp)
+        self.assertEqual(3, self.server.stats()[("/api/proxy/web/search/v2", 200)])
+
+    def test_cache_load(self):
+        wp = self.server.get_wp(7)
+        data = self.server.get_cache_data(wp)
+        cache = Cache(self.gc, wp)
+        cache.load()
+
+        self.assertEqual(data["name"], cache.name)
+        self.assertEqual(data["owner"], cache.author)
+        self.assertEqual(data["difficulty"], cache.difficulty)
+        self.assertEqual(data["hidden"], cache.hidden)
+        self.assertAlmostEqual(data["latitude"], cache.location.latitude, places=4)
+        self.assertEqual("Hint for {}".format(wp), cache.hint)
+        self.assertEqual(30, sum(cache.log_counts.values()))
+
+        logs = list(cache.load_logbook())
+        self.assertEqual(30, len(logs))
+        self.assertEqual(sum(1 for log in logs if log.type == LogType.found_it), cache.log_counts[LogType.found_it])
+
+        quick = Cache(self.gc, wp)
+        quick.load_quick()
+        self.assertEqual((cache.name, cache.size, cache.type), (quick.name, quick.size, quick.type))
+
+        with self.subTest("not existing"):
+            with self.assertRaises(LoadError):
+                Cache(self.gc, "GC12345").load()
+
+    def test_tile(self):
+        tile = Tile(self.gc, 8800, 5574, 14)
+        tile.load()
+        self.assertEqual(20, len(tile.blocks))
+        for block in tile.blocks:
+            self.assertEqual(9, len(block.points))
+
+        with self.subTest("png primer required"):
+            self.server.require_png = True
+            self.addCleanup(setattr, self.server, "require_png", False)
+            self.server.reset_stats()
+            Tile(self.gc, 8801, 5574, 14).load()
+            self.assertEqual(1, self.server.stats()[("/map.info", 204)])
+            self.assertEqual(1, self.server.stats()[("/map.png", 200)])
+
+    def test_geocode(self):
+        self.assertEqual(self.gc.geocode("Prague"), self.gc.geocode("prague"))
+        self.assertIsInstance(self.gc.geocode("Prague"), Point)
+
+
+class TestRateLimiting(unittest.TestCase):
+    def test_rate_limit(self):
+        with MockGeocachingServer(rate_limit=(2, 60)) as server:
+            gc = server.geocaching()
+            gc.login("user", "password")
+            gc.geocode("a")
+            gc.geocode("b")
+            with self.assertRaises(TooManyRequestsError) as cm:
+                gc.geocode("c")
+            self.assertLessEqual(cm.exception.rate_limit_reset, 60)
+
+            with self.subTest("accounts are limited separately"):
+                other = server.geocaching()
+                other.login("other", "password")
+                other.geocode("a")
+
+    def test_injected(self):
+        with MockGeocachingServer(rate_limit_probability=1, rate_limit_reset=7) as server:
+            gc = server.geocaching()
+            gc.login("user", "password")
+            with self.assertRaises(TooManyRequestsError) as cm:
+                gc.geocode("a")
+            self.assertEqual(7, cm.exception.rate_limit_reset)
@@ -147,6 +147,33 @@ class TestMethods(LoggedInTest):
         self.assertTrue("<visibility>1</visibility>" in kml)
         self.assertTrue("</Placemark></Document></kml>" in kml)
 
+    def test_route(self):
+        with self.recorder.use_cassette("trackable_kml"):
+            route = self.t.route(chunk_size=1024)
+        self.assertEqual(2 * 365, len(route))
+        self.assertEqual([51.2554, 8.5327, 51.2553, 8.5344], list(route[:4]))
+        self.assertEqual([63.0534, 16.5166], list(route[-2:]))
+
+    def test_route__invalid(self):
+        self.t._kml_url = "https://www.geocaching.com/kml/track.kml"
+        coordinates = "<kml><Document><Placemark><LineString><coordinates>{}</coordinates>"
+        cases = {
+            "truncated": [b"<kml><Document><Placemark><LineString><coordinates>8.5,51.2 8.6,", b"51.3"],
+            "malformed": [b"<kml><Document>", b"</kml>"],
+            "invalid coordinates": [
+                coordinates.format("8.5,north").encode(),
+                b"</LineString></Placemark></Document></kml>",
+            ],
+        }
+        for description, chunks in cases.items():
+            with self.subTest(description):
+                response = mock.MagicMock()
+                response.iter_content.return_value = chunks
+                with mock.patch.object(self.gc, "_request", return_value=response):
+                    with self.assertRaises(LoadError):
+                        self.t.route()
+                response.__exit__.assert_called_once()
+
 
 class TestIssues(LoggedInTest):
     def test_load__type(self):
@@ -187,3 +187,17 @@ class TestLoadCredentials:
         ):
             with pytest.raises(KeyError):
                 username, password = geocaching._load_credentials()
+
+    def test_all(self, geocaching):
+        with self.mock_credentials_file(geocaching, self.multiuser_credentials):
+            credentials = geocaching._load_all_credentials()
+            assert [(USERNAME + "1", PASSWORD + "1"), (USERNAME + "2", PASSWORD + "2")] == credentials
+
+    def test_all_single_user(self, geocaching):
+        with self.mock_credentials_file(geocaching, self.credentials):
+            assert [(USERNAME, PASSWORD)] == geocaching._load_all_credentials()
+
+    def test_all_invalid_item(self, geocaching):
+        with self.mock_credentials_file(geocaching, [self.credentials, {}]):
+            with pytest.raises(KeyError):
+                geocaching._load_all_credentials()